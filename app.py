@@ -1,13 +1,25 @@
 from flask import Flask, render_template, request, send_file, jsonify, session
+from flask.json.provider import DefaultJSONProvider
 import pandas as pd
 import os
 from werkzeug.utils import secure_filename
 from datetime import datetime
 import tempfile
 from excel_processor import ExcelProcessor
+from workbook_cache import WorkbookCache, compute_file_hash
+from layout_registry import LayoutRegistry
+from config import Config
+import json_encoder
 import uuid
 
+class AnalysisJSONProvider(DefaultJSONProvider):
+    """jsonify lewat json_encoder (numpy scalar, NaN/inf, timestamp; orjson jika terpasang)"""
+    
+    def dumps(self, obj, **kwargs):
+        return json_encoder.dumps(obj, sort_keys=kwargs.get('sort_keys', self.sort_keys))
+
 app = Flask(__name__)
+app.json = AnalysisJSONProvider(app)
 app.secret_key = 'excel_processing_secret_key_2024'
 
 # Konfigurasi upload
@@ -18,7 +30,20 @@ if not os.path.exists(UPLOAD_FOLDER):
     os.makedirs(UPLOAD_FOLDER)
 
 app.config['UPLOAD_FOLDER'] = UPLOAD_FOLDER
-app.config['MAX_CONTENT_LENGTH'] = 16 * 1024 * 1024  # 16MB max file size
+app.config['MAX_CONTENT_LENGTH'] = Config.MAX_CONTENT_LENGTH  # File besar diproses secara streaming
+
+# Cache workbook + analisis, dipakai bersama oleh /upload dan /process
+workbook_cache = WorkbookCache(
+    max_entries=Config.WORKBOOK_CACHE_MAX_ENTRIES,
+    ttl_seconds=Config.WORKBOOK_CACHE_TTL_SECONDS,
+    max_bytes=Config.WORKBOOK_CACHE_MAX_BYTES
+)
+
+# Layout template tagihan yang sudah dikenal (persist ke file, dipakai bersama semua request)
+layout_registry = LayoutRegistry(
+    Config.LAYOUT_REGISTRY_FILE,
+    max_entries=Config.LAYOUT_REGISTRY_MAX_ENTRIES
+) if Config.LAYOUT_REGISTRY_FILE else None
 
 def allowed_file(filename):
     return '.' in filename and filename.rsplit('.', 1)[1].lower() in ALLOWED_EXTENSIONS
@@ -55,7 +80,7 @@ def upload_file():
         
         try:
             # Process Excel file
-            processor = ExcelProcessor()
+            processor = ExcelProcessor(cache=workbook_cache, layout_registry=layout_registry)
             print(f"🔍 Starting Excel processing...")
             
             # Check if file is readable
@@ -68,15 +93,21 @@ def upload_file():
             
             print(f"📊 File size: {file_size} bytes")
             
-            # Try to open the file to check if it's a valid Excel file
-            try:
-                import pandas as pd
-                test_df = pd.read_excel(filepath, nrows=1)
-                print(f"✅ File is readable Excel file with {len(test_df.columns)} columns")
-            except Exception as excel_error:
-                raise Exception(f"File bukan file Excel yang valid: {str(excel_error)}")
+            # Hash isi file dihitung sekali di sini; /preview/rows dan /process memakai ulang dari session
+            content_hash = compute_file_hash(filepath)
             
-            preview_data = processor.preview_excel(filepath)
+            if processor.should_stream(filepath):
+                # File besar: jangan parse seluruh workbook, preview dari head tiap sheet
+                print(f"🌊 Large file, using streaming reader")
+                preview_data = processor.preview_excel(filepath, {'preview_mode': 'sampled'})
+            else:
+                # Sheet panjang hanya dibaca baris awalnya (file kecil di-parse penuh dan masuk cache);
+                # sekaligus validasi file Excel
+                workbook = processor.load_preview_workbook(filepath, content_hash)
+                print(f"✅ File is readable Excel file with {len(workbook.sheet_names)} sheets")
+
+                # Preview memakai head + sampel sehingga waktu respons tidak tergantung jumlah baris
+                preview_data = processor.preview_excel(workbook, {'preview_mode': 'sampled'})
             
             # Debug: Print preview data structure
             print(f"🔍 Preview data keys: {list(preview_data.keys()) if preview_data else 'None'}")
@@ -101,11 +132,13 @@ def upload_file():
             
             # Store filepath in session
             session['uploaded_file'] = filepath
+            session['uploaded_hash'] = content_hash
             
+            # Response hanya berisi ringkasan + sample; isi baris lewat /preview/rows
             return jsonify({
                 'success': True,
                 'message': 'File berhasil diupload dan diproses',
-                'preview': preview_data,
+                'preview': processor.summarize_preview(preview_data),
                 'filename': filename
             })
             
@@ -137,6 +170,40 @@ def upload_file():
     
     return jsonify({'error': 'Format file tidak didukung. Gunakan file Excel (.xlsx atau .xls)'}), 400
 
+@app.route('/preview/rows')
+def preview_rows():
+    """Isi baris sheet file yang diupload per halaman (?sheet=...&offset=...&limit=...)"""
+    if 'uploaded_file' not in session:
+        return jsonify({'error': 'Tidak ada file yang diupload'}), 400
+    
+    filepath = session['uploaded_file']
+    
+    if not os.path.exists(filepath):
+        return jsonify({'error': 'File tidak ditemukan'}), 400
+    
+    sheet_name = request.args.get('sheet')
+    if not sheet_name:
+        return jsonify({'error': 'Parameter sheet wajib diisi'}), 400
+    
+    try:
+        offset = int(request.args.get('offset', 0))
+        limit = int(request.args.get('limit', Config.PREVIEW_ROWS_PAGE_SIZE))
+    except ValueError:
+        return jsonify({'error': 'Parameter offset dan limit harus berupa angka'}), 400
+    if offset < 0 or limit < 1:
+        return jsonify({'error': 'Parameter offset harus >= 0 dan limit >= 1'}), 400
+    
+    try:
+        # Workbook dari /upload diambil dari cache, tidak di-parse ulang
+        processor = ExcelProcessor(cache=workbook_cache, layout_registry=layout_registry)
+        page = processor.preview_rows(filepath, sheet_name, offset, limit, content_hash=session.get('uploaded_hash'))
+        page['success'] = True
+        return jsonify(page)
+    except KeyError:
+        return jsonify({'error': f'Sheet {sheet_name} tidak ditemukan'}), 404
+    except Exception as e:
+        return jsonify({'error': f'Error membaca baris: {str(e)}'}), 500
+
 @app.route('/process', methods=['POST'])
 def process_excel():
     if 'uploaded_file' not in session:
@@ -152,9 +219,9 @@ def process_excel():
         data = request.get_json()
         options = data.get('options', {})
         
-        # Process Excel file
-        processor = ExcelProcessor()
-        output_filepath = processor.process_excel(filepath, options)
+        # Process Excel file (workbook dan analisis dari /upload diambil dari cache)
+        processor = ExcelProcessor(cache=workbook_cache, layout_registry=layout_registry)
+        output_filepath = processor.process_excel(filepath, options, content_hash=session.get('uploaded_hash'))
         
         # Store output filepath in session
         session['output_file'] = output_filepath
@@ -200,6 +267,7 @@ def cleanup_files():
             except PermissionError:
                 print(f"Warning: Could not delete uploaded file {session['uploaded_file']}")
                 del session['uploaded_file']
+        session.pop('uploaded_hash', None)
         
         # Clean up output file
         if 'output_file' in session and os.path.exists(session['output_file']):
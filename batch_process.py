@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Batch processing tanpa browser: proses banyak file Excel sekaligus dengan worker pool
+
+Contoh:
+    python batch_process.py tagihan/ "arsip/2025-*/*.xlsx" -o outputs/batch -w 4
+    python batch_process.py drop/ -o outputs/drop --incremental   # hanya file baru/berubah
+    python batch_process.py drop/ -o outputs/drop --watch 30      # pantau folder tiap 30 detik
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from config import Config
+from excel_processor import ExcelProcessor
+from layout_registry import LayoutRegistry
+from workbook_cache import compute_file_hash
+
+# Satu LayoutRegistry per worker process (dimuat sekali, bukan per file)
+_layout_registries = {}
+
+
+def _get_layout_registry(path):
+    if not path:
+        return None
+    if path not in _layout_registries:
+        _layout_registries[path] = LayoutRegistry(path, max_entries=Config.LAYOUT_REGISTRY_MAX_ENTRIES)
+    return _layout_registries[path]
+
+
+def _is_excel_file(filepath):
+    filename = os.path.basename(filepath)
+    extension = filename.rsplit('.', 1)[-1].lower() if '.' in filename else ''
+    # Lewati file lock sementara milik Excel (~$nama.xlsx)
+    return extension in Config.ALLOWED_EXTENSIONS and not filename.startswith('~$')
+
+
+def collect_input_files(inputs, exclude_dir=None):
+    """Kumpulkan file Excel dari daftar path file, direktori (rekursif) atau pola glob"""
+    # Direktori output dikecualikan supaya hasil proses tidak ikut diproses ulang
+    exclude_prefix = os.path.join(os.path.abspath(exclude_dir), '') if exclude_dir else None
+    files = []
+    for item in inputs:
+        if os.path.isdir(item):
+            for root, _, filenames in os.walk(item):
+                files.extend(os.path.join(root, filename) for filename in filenames)
+        elif os.path.isfile(item):
+            files.append(item)
+        else:
+            files.extend(glob.glob(item, recursive=True))
+
+    unique_files = []
+    seen = set()
+    for filepath in files:
+        normalized = os.path.abspath(filepath)
+        if exclude_prefix and normalized.startswith(exclude_prefix):
+            continue
+        if normalized not in seen and os.path.isfile(filepath) and _is_excel_file(filepath):
+            seen.add(normalized)
+            unique_files.append(filepath)
+    return sorted(unique_files)
+
+
+def build_output_names(files, reserved_names=None):
+    """Nama file output deterministik per input; nama yang bentrok diberi nomor urut"""
+    output_names = {}
+    used = {name.lower() for name in (reserved_names or [])}
+    for filepath in files:
+        name_without_ext = os.path.splitext(os.path.basename(filepath))[0]
+        candidate = f"processed_{name_without_ext}.xlsx"
+        counter = 2
+        while candidate.lower() in used:
+            candidate = f"processed_{name_without_ext}_{counter}.xlsx"
+            counter += 1
+        used.add(candidate.lower())
+        output_names[filepath] = candidate
+    return output_names
+
+
+def process_file(task):
+    """Worker: proses satu file dengan ExcelProcessor.process_excel"""
+    filepath, output_dir, output_filename, verbose, layout_registry_path = task
+    started = time.time()
+    result = {'input': filepath, 'output': None, 'rows': 0, 'seconds': 0.0, 'error': None}
+
+    # Log per baris dari ExcelProcessor sangat banyak; sembunyikan kecuali --verbose
+    log_target = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+    try:
+        with log_target:
+            processor = ExcelProcessor(layout_registry=_get_layout_registry(layout_registry_path))
+            result['output'] = processor.process_excel(
+                filepath, output_dir=output_dir, output_filename=output_filename
+            )
+            result['rows'] = processor.last_run_stats.get('rows', 0)
+    except Exception as e:
+        result['error'] = str(e).replace('\n', ' ')
+
+    result['seconds'] = time.time() - started
+    return result
+
+
+class ProcessingManifest:
+    """
+    Manifest JSON {path input: hash isi, path output} untuk mode incremental/watch.
+
+    File hanya diproses ulang jika hash isinya berubah atau file outputnya hilang.
+    Ukuran dan mtime ikut disimpan supaya file yang tidak disentuh tidak perlu
+    di-hash ulang di setiap run.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('files', {})
+        except Exception as e:
+            print(f"⚠️ Warning: Manifest {self.path} tidak bisa dibaca, semua file diproses ulang: {str(e)}")
+            self.entries = {}
+
+    def save(self):
+        """Tulis manifest secara atomik (file sementara lalu replace)"""
+        directory = os.path.dirname(os.path.abspath(self.path))
+        if not os.path.exists(directory):
+            os.makedirs(directory)
+        temp_path = f"{self.path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': 1, 'files': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(temp_path, self.path)
+
+    @staticmethod
+    def _key(filepath):
+        return os.path.abspath(filepath)
+
+    def output_names(self):
+        """Nama file output yang sudah dipakai input lain di manifest"""
+        return {os.path.basename(entry['output']) for entry in self.entries.values() if entry.get('output')}
+
+    def output_name_for(self, filepath):
+        entry = self.entries.get(self._key(filepath))
+        if entry and entry.get('output'):
+            return os.path.basename(entry['output'])
+        return None
+
+    def fingerprint(self, filepath):
+        """Hash isi file + ukuran/mtime; hash lama dipakai jika ukuran dan mtime tidak berubah"""
+        stat = os.stat(filepath)
+        fingerprint = {'size': stat.st_size, 'mtime': stat.st_mtime}
+        entry = self.entries.get(self._key(filepath))
+        if entry and entry.get('size') == stat.st_size and entry.get('mtime') == stat.st_mtime:
+            fingerprint['hash'] = entry['hash']
+        else:
+            fingerprint['hash'] = compute_file_hash(filepath)
+        return fingerprint
+
+    def is_up_to_date(self, filepath, fingerprint):
+        entry = self.entries.get(self._key(filepath))
+        return bool(
+            entry
+            and entry.get('hash') == fingerprint['hash']
+            and entry.get('output')
+            and os.path.exists(entry['output'])
+        )
+
+    def refresh(self, filepath, fingerprint):
+        """Perbarui ukuran/mtime file yang isinya tidak berubah (mis. hanya di-touch); True jika berubah"""
+        entry = self.entries[self._key(filepath)]
+        if entry.get('size') == fingerprint['size'] and entry.get('mtime') == fingerprint['mtime']:
+            return False
+        entry.update(fingerprint)
+        return True
+
+    def record(self, filepath, fingerprint, output_filepath):
+        self.entries[self._key(filepath)] = {
+            **fingerprint,
+            'output': os.path.abspath(output_filepath),
+            'processed_at': datetime.now().isoformat(timespec='seconds')
+        }
+
+
+def select_changed_files(files, manifest):
+    """Pisahkan file baru/berubah dari file yang outputnya masih valid; kembalikan (changed, fingerprints)"""
+    changed = []
+    fingerprints = {}
+    refreshed = False
+    for filepath in files:
+        try:
+            fingerprint = manifest.fingerprint(filepath)
+        except OSError as e:
+            # File bisa hilang/terkunci saat masih disalin ke drop folder
+            print(f"⚠️ Warning: Tidak bisa membaca {filepath}: {str(e)}")
+            continue
+        fingerprints[filepath] = fingerprint
+        if not manifest.is_up_to_date(filepath, fingerprint):
+            changed.append(filepath)
+        elif manifest.refresh(filepath, fingerprint):
+            refreshed = True
+    if refreshed:
+        manifest.save()
+    return changed, fingerprints
+
+
+def run_batch(files, output_dir, workers=1, verbose=False, output_names=None, layout_registry_path=None):
+    """Proses semua file (serial jika workers=1) dan kembalikan list hasil per file"""
+    if not os.path.exists(output_dir):
+        os.makedirs(output_dir)
+
+    output_names = output_names or build_output_names(files)
+    tasks = [
+        (filepath, output_dir, output_names[filepath], verbose, layout_registry_path)
+        for filepath in files
+    ]
+
+    results = []
+    if workers <= 1:
+        iterator = map(process_file, tasks)
+        executor = None
+    else:
+        executor = ProcessPoolExecutor(max_workers=workers)
+        iterator = executor.map(process_file, tasks)
+
+    try:
+        for index, result in enumerate(iterator, 1):
+            status = '✅' if result['error'] is None else '❌'
+            print(f"{status} [{index}/{len(tasks)}] {result['input']} "
+                  f"({result['rows']} baris, {result['seconds']:.2f}s)")
+            if result['error']:
+                print(f"    {result['error']}")
+            results.append(result)
+    finally:
+        if executor is not None:
+            executor.shutdown()
+
+    return results
+
+
+def print_summary(results, elapsed):
+    """Tampilkan ringkasan throughput batch"""
+    succeeded = [result for result in results if result['error'] is None]
+    failed = [result for result in results if result['error'] is not None]
+    total_rows = sum(result['rows'] for result in succeeded)
+    elapsed = max(elapsed, 1e-9)
+
+    print("=" * 50)
+    print("📊 RINGKASAN BATCH")
+    print("=" * 50)
+    print(f"  File diproses : {len(results)}")
+    print(f"  Berhasil      : {len(succeeded)}")
+    print(f"  Gagal         : {len(failed)}")
+    print(f"  Total baris   : {total_rows}")
+    print(f"  Waktu         : {elapsed:.2f}s")
+    print(f"  Throughput    : {len(results) / elapsed:.2f} files/s, {total_rows / elapsed:.0f} rows/s")
+    for result in failed:
+        print(f"  ❌ {result['input']}: {result['error']}")
+
+
+def run_incremental(inputs, output_dir, workers, verbose, manifest, report_unchanged=True,
+                    layout_registry_path=None):
+    """Satu putaran incremental: proses file baru/berubah lalu perbarui manifest"""
+    files = collect_input_files(inputs, exclude_dir=output_dir)
+    changed, fingerprints = select_changed_files(files, manifest)
+    if changed or report_unchanged:
+        print(f"🔍 {len(files)} file ditemukan, {len(changed)} baru/berubah, {len(files) - len(changed)} dilewati")
+    if not changed:
+        return []
+
+    # Input yang sudah dikenal tetap memakai nama output lamanya
+    known_names = {f: manifest.output_name_for(f) for f in changed if manifest.output_name_for(f)}
+    reserved = manifest.output_names()
+    output_names = build_output_names([f for f in changed if f not in known_names], reserved)
+    output_names.update(known_names)
+
+    results = []
+    try:
+        results = run_batch(changed, output_dir, min(workers, len(changed)), verbose, output_names,
+                            layout_registry_path)
+    finally:
+        for result in results:
+            if result['error'] is None:
+                manifest.record(result['input'], fingerprints[result['input']], result['output'])
+        manifest.save()
+    return results
+
+
+def watch(inputs, output_dir, workers, verbose, manifest, interval, layout_registry_path=None):
+    """Pantau input secara berkala dan proses file baru/berubah sampai dihentikan (Ctrl+C)"""
+    print(f"👀 Watch mode: cek setiap {interval}s (Ctrl+C untuk berhenti)")
+    try:
+        while True:
+            started = time.time()
+            results = run_incremental(inputs, output_dir, workers, verbose, manifest, report_unchanged=False,
+                                      layout_registry_path=layout_registry_path)
+            if results:
+                print_summary(results, time.time() - started)
+            time.sleep(interval)
+    except KeyboardInterrupt:
+        print("\n🛑 Watch mode dihentikan")
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Proses banyak file Excel tagihan sekaligus tanpa web interface'
+    )
+    parser.add_argument('inputs', nargs='+', help='File, direktori, atau pola glob file Excel input')
+    parser.add_argument('-o', '--output-dir', default=Config.OUTPUT_FOLDER,
+                        help=f'Direktori file output (default: {Config.OUTPUT_FOLDER})')
+    parser.add_argument('-w', '--workers', type=int, default=Config.BATCH_WORKERS or os.cpu_count() or 1,
+                        help='Jumlah worker process (default: jumlah CPU)')
+    parser.add_argument('-v', '--verbose', action='store_true', help='Tampilkan log lengkap ExcelProcessor')
+    parser.add_argument('--incremental', action='store_true',
+                        help='Hanya proses file baru/berubah berdasarkan manifest hash')
+    parser.add_argument('--watch', type=float, nargs='?', const=Config.BATCH_WATCH_INTERVAL, default=None,
+                        metavar='DETIK',
+                        help=f'Pantau input terus-menerus (default interval: {Config.BATCH_WATCH_INTERVAL}s); '
+                             'otomatis incremental')
+    parser.add_argument('--layout-registry', default=Config.LAYOUT_REGISTRY_FILE,
+                        help=f'File layout template yang sudah dikenal (default: {Config.LAYOUT_REGISTRY_FILE})')
+    parser.add_argument('--no-layout-registry', action='store_true',
+                        help='Selalu analisis ulang setiap sheet tanpa layout registry')
+    parser.add_argument('--manifest', default=None,
+                        help=f'Path manifest (default: <output-dir>/{Config.BATCH_MANIFEST_FILENAME})')
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    workers = max(1, args.workers)
+    layout_registry_path = None if args.no_layout_registry else args.layout_registry
+
+    if args.incremental or args.watch is not None:
+        manifest = ProcessingManifest(
+            args.manifest or os.path.join(args.output_dir, Config.BATCH_MANIFEST_FILENAME)
+        )
+        if args.watch is not None:
+            watch(args.inputs, args.output_dir, workers, args.verbose, manifest, args.watch, layout_registry_path)
+            return 0
+
+        started = time.time()
+        results = run_incremental(args.inputs, args.output_dir, workers, args.verbose, manifest,
+                                  layout_registry_path=layout_registry_path)
+        if results:
+            print_summary(results, time.time() - started)
+        return 0 if all(result['error'] is None for result in results) else 1
+
+    files = collect_input_files(args.inputs, exclude_dir=args.output_dir)
+    if not files:
+        print("❌ Tidak ada file Excel yang ditemukan")
+        return 1
+
+    workers = min(workers, len(files))
+    print(f"🚀 Memproses {len(files)} file dengan {workers} worker → {args.output_dir}")
+
+    started = time.time()
+    results = run_batch(files, args.output_dir, workers, args.verbose, layout_registry_path=layout_registry_path)
+    print_summary(results, time.time() - started)
+
+    return 0 if all(result['error'] is None for result in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
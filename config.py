@@ -15,12 +15,54 @@ class Config:
     # File Upload Configuration
     UPLOAD_FOLDER = 'uploads'
     OUTPUT_FOLDER = 'outputs'
+    # Batas upload tetap 16MB: streaming hanya membatasi sisi baca, record hasil ekstraksi,
+    # DataFrame output dan writer openpyxl masih dimuat penuh di memori
     MAX_CONTENT_LENGTH = 16 * 1024 * 1024  # 16MB
     ALLOWED_EXTENSIONS = {'xlsx', 'xls'}
     
+    # Workbook Cache Configuration (key: hash isi file upload)
+    WORKBOOK_CACHE_MAX_ENTRIES = 32
+    WORKBOOK_CACHE_TTL_SECONDS = 30 * 60
+    WORKBOOK_CACHE_MAX_BYTES = 512 * 1024 * 1024  # 512MB
+    
+    # Streaming Reader Configuration (openpyxl read_only, khusus .xlsx)
+    STREAMING_THRESHOLD_BYTES = 8 * 1024 * 1024  # File >= 8MB dibaca per chunk
+    STREAMING_CHUNK_ROWS = 5000
+    STREAMING_ANALYSIS_ROWS = 1000  # Baris awal tiap sheet yang dipakai untuk analisis
+    
+    # Key-Value Format Probe (deteksi format dari window di bagian atas sheet)
+    KEY_VALUE_PROBE_ROWS = 50  # Window awal; diperbesar 2x selama hasilnya ambigu
+    KEY_VALUE_PROBE_COLUMNS = 8
+    KEY_VALUE_PROBE_MIN_MATCH_ROWS = 1  # Baris berisi " : " untuk yakin format key-value (>1 = lebih ketat)
+    KEY_VALUE_PROBE_MIN_PLAIN_ROWS = 20  # Baris terisi tanpa " : " untuk yakin bukan key-value
+    
+    # Layout Registry Configuration (template tagihan yang sudah dikenal tidak dianalisis ulang)
+    LAYOUT_REGISTRY_FILE = 'layout_registry.json'  # None = registry tidak dipakai
+    LAYOUT_REGISTRY_MAX_ENTRIES = 500
+    LAYOUT_FINGERPRINT_ROWS = 10  # Baris awal tiap sheet yang membentuk fingerprint
+    
+    # Parallel Processing Configuration (1 = serial)
+    ANALYSIS_WORKERS = 1  # Worker process untuk analisis per sheet di preview_excel
+    EXTRACTION_WORKERS = 1  # Worker process untuk ekstraksi per sheet di process_excel
+    MAX_SHEET_WORKERS = 4  # Batas atas analysis_workers/extraction_workers (termasuk dari options request)
+    BATCH_WORKERS = None  # Worker process batch_process.py (None = jumlah CPU)
+    BATCH_MANIFEST_FILENAME = '.batch_manifest.json'  # Manifest hash untuk --incremental/--watch
+    BATCH_WATCH_INTERVAL = 10  # Detik antar pengecekan folder di --watch
+    
     # Excel Processing Configuration
     DEFAULT_SHEET_NAME = 'Sheet1'
-    MAX_ROWS_PREVIEW = 5
+    MAX_ROWS_PREVIEW = 5  # Jumlah sample value per kolom di preview
+    
+    # Sampled Preview Configuration (preview_mode='sampled' saat upload)
+    PREVIEW_HEAD_ROWS = 200  # Baris awal yang selalu dianalisis
+    PREVIEW_SAMPLE_ROWS = 300  # Sampel acak dari baris sisanya
+    PREVIEW_RANDOM_SEED = 42  # Seed tetap agar preview file yang sama konsisten
+    PREVIEW_ROWS_PAGE_SIZE = 50  # Default limit endpoint /preview/rows
+    PREVIEW_ROWS_MAX_PAGE_SIZE = 500  # Limit maksimal per halaman
+    
+    # Unique Count Configuration (unique_values di analisis kolom)
+    UNIQUE_COUNT_EXACT_THRESHOLD = 100000  # Kolom lebih panjang memakai HyperLogLog (None = selalu exact)
+    UNIQUE_COUNT_HLL_PRECISION = 14  # 2**14 register, standard error ~0.8%
     AUTO_COLUMN_WIDTH = True
     MAX_COLUMN_WIDTH = 50
     
@@ -77,6 +119,38 @@ class Config:
         'TOTAL BILLED': ['total', 'billed', 'total_billed', 'total_tagihan']
     }
     
+    # Service Code Rules (klasifikasi SERVICECODE dari jenis_biaya + keterangan)
+    # File JSON {label: [keyword, ...]} atau CSV label,keyword, mis. formularium obat/alkes lengkap
+    # dengan kategori tambahan. Default: service_rules.json yang ikut di repo (di samping config.py);
+    # jika file tidak ada/tidak valid atau None, dipakai fallback minimal bawaan ExcelProcessor
+    SERVICE_RULES_FILE = os.environ.get('SERVICE_RULES_FILE') or os.path.join(
+        os.path.dirname(os.path.abspath(__file__)), 'service_rules.json'
+    )
+    
+    # Layout Profiles (posisi kolom 0-based per format tagihan rumah sakit)
+    # Dipakai untuk sheet key-value dan sheet tanpa header; format baru cukup ditambahkan di sini
+    # lalu dipilih lewat DEFAULT_LAYOUT_PROFILE atau option 'layout_profile' saat process.
+    LAYOUT_PROFILES = {
+        'default': {
+            # Pasangan (kolom key, kolom value), mis. "Nomor Tagihan | : IP-00030178"
+            'key_value_columns': [(0, 1), (2, 3)],
+            # Baris transaksi: semua kolom transaction_required terisi angka
+            'transaction_columns': {
+                'jenis_biaya': 0, 'keterangan': 1, 'jumlah': 4, 'nilai': 5, 'sub_total': 7
+            },
+            'transaction_required': ['jumlah', 'nilai'],
+            # Baris total/subtotal: kolom label berisi 'total'
+            'total_label_column': 0,
+            'total_columns': {'jenis_biaya': 0, 'sub_total': 7},
+            # Sheet tanpa header (minimal raw_min_columns kolom)
+            'raw_columns': {
+                'jenis_biaya': 0, 'keterangan': 1, 'jumlah': 4, 'nilai': 5, 'sub_total': 7
+            },
+            'raw_min_columns': 2
+        }
+    }
+    DEFAULT_LAYOUT_PROFILE = 'default'
+    
     # Default Values
     DEFAULT_VALUES = {
         'GIVEN DATE (month, day, year)': lambda: datetime.now().strftime('%m/%d/%Y'),
@@ -4,9 +4,93 @@ from datetime import datetime, date
 import os
 import tempfile
 import re
+import json
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
+from parsed_workbook import ParsedWorkbook
+from workbook_cache import compute_file_hash
+from streaming_reader import StreamingWorkbookReader
+from keyword_matcher import KeywordMatcher
+from numeric_parser import amount_text, parse_numbers
+from service_rules import SERVICE_CODE_GROUP, load_service_matcher
+from cardinality import distinct_count
+from layout_profiles import compile_layout_profiles, ROW_KEY_VALUE, ROW_TRANSACTION, ROW_TOTAL, ROW_RECORD_FLAGS
+from config import Config
+
+def _analyze_sheet_task(task):
+    """Muat (jika belum di-parse) dan analisis satu sheet; dipakai serial maupun di worker process"""
+    processor, filepath, sheet_name, df, sampled, total_rows = task
+    try:
+        print(f"🔍 Menganalisis sheet: {sheet_name}")
+        if df is None:
+            df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+        
+        if df.empty:
+            print(f"⚠️ Warning: Sheet '{sheet_name}' kosong")
+            return None
+        
+        return processor._deep_analyze_sheet(df, sheet_name, sampled=sampled, total_rows=total_rows)
+        
+    except Exception as sheet_error:
+        print(f"⚠️ Warning: Error analyzing sheet '{sheet_name}': {sheet_error}")
+        # Continue with other sheets instead of failing completely
+        return None
+
+def _pack_records(records):
+    """Kemas list dict menjadi batch ringkas (nama field + tuple per baris) untuk dikirim antar process"""
+    fields = []
+    for record in records:
+        for field in record:
+            if field not in fields:
+                fields.append(field)
+    # None menandai field yang tidak ada di record (nilai hasil ekstraksi tidak pernah None)
+    rows = [tuple(record.get(field) for field in fields) for record in records]
+    return {'fields': fields, 'rows': rows}
+
+def _unpack_records(batch):
+    """Kebalikan dari _pack_records"""
+    fields = batch['fields']
+    return [
+        {field: value for field, value in zip(fields, row) if value is not None}
+        for row in batch['rows']
+    ]
+
+def _extract_sheet_task(task):
+    """Worker ProcessPoolExecutor: ekstrak satu sheet dan kembalikan batch ringkas"""
+    processor, filepath, sheet_name, df, sheet_analysis = task
+    workbook = ParsedWorkbook(filepath, sheets={sheet_name: df})
+    return _pack_records(processor._extract_sheet(workbook, sheet_name, sheet_analysis))
 
 class ExcelProcessor:
-    def __init__(self):
+    # Tipe nilai cell yang dihitung sebagai angka (termasuk scalar numpy dari baris DataFrame campuran)
+    NUMERIC_VALUE_TYPES = (int, float, np.integer, np.floating, np.bool_)
+    
+    # Kolom output → field hasil ekstraksi yang mengisinya (jika nilainya tidak kosong)
+    OUTPUT_FIELD_MAPPING = {
+        'CLIENT NAME': 'nama_pasien',
+        'CLIENTS INVOICE NUMBER': 'nomor_tagihan',
+        'CLIENTSREGISTER NUMBER': 'nomor_registrasi',
+        'admission': 'tanggal_registrasi',
+        'discharge': 'tanggal_keluar',
+        'KELAS': 'kelas_kamar',
+        'TARIFF': 'nilai',
+        'QUANTITY': 'jumlah',
+        'TOTAL BILLED': 'sub_total',
+        'SERVICECODE DESCRIPTION': 'keterangan',
+        'GIVEN DATE (month, day, year)': 'tanggal'
+    }
+    # Kolom output yang memakai nilai field apa adanya (termasuk kosong) selama field ada di record
+    OUTPUT_PRESENT_FIELD_COLUMNS = {
+        'CLIENT NAME', 'CLIENTS INVOICE NUMBER', 'CLIENTSREGISTER NUMBER', 'KELAS', 'TARIFF', 'QUANTITY'
+    }
+    
+    def __init__(self, cache=None, layout_registry=None):
+        # WorkbookCache opsional untuk memakai ulang hasil parse dan analisis
+        self.cache = cache
+        # LayoutRegistry opsional: sheet dengan template yang sudah dikenal tidak dianalisis ulang
+        self.layout_registry = layout_registry
+        self.last_run_stats = {}
+        
         # Definisi kolom output sesuai format yang diminta
         self.output_columns = [
             'PROVID',
@@ -42,6 +126,8 @@ class ExcelProcessor:
             'discharge',
             'LoS'
         ]
+        # Rencana transform per kolom output, dikompilasi sekali
+        self.output_plan = self._compile_output_plan()
         
         # Mapping untuk field yang ditemukan dalam data
         self.field_mapping = {
@@ -62,65 +148,431 @@ class ExcelProcessor:
             'nilai': ['nilai', 'harga', 'price', 'amount', 'tarif'],
             'sub_total': ['sub total', 'subtotal', 'total', 'sum']
         }
+        
+        
+        # Keyword umum untuk skor header (selain label field_mapping)
+        self.header_keywords = ['nomor', 'tanggal', 'nama', 'kelas', 'biaya', 'jumlah', 'total']
+        
+        # Mapping key format key-value ke field, urut prioritas (keyword pertama yang cocok menang)
+        # Berdasarkan contoh data dari sampledata.xlsx
+        self.key_field_rules = [
+            ('nomor tagihan', 'nomor_tagihan'),
+            ('nomor registrasi', 'nomor_registrasi'),
+            ('nama pasien', 'nama_pasien'),
+            ('pasien', 'nama_pasien'),
+            ('tanggal registrasi', 'tanggal_registrasi'),
+            ('kelas / kamar', 'kelas_kamar'),
+            ('penjamin bayar', 'penjamin_bayar'),
+            ('tanggal keluar', 'tanggal_keluar'),
+            ('kelas dijamin', 'kelas_dijamin'),
+            ('keterangan', 'keterangan'),
+            ('jumlah', 'jumlah'),
+            ('nilai', 'nilai'),
+            ('biaya kamar', 'jenis_biaya'),
+            ('room charge', 'jenis_biaya')
+        ]
+        
+        # Fallback minimal klasifikasi service code, hanya dipakai jika Config.SERVICE_RULES_FILE
+        # (default service_rules.json) tidak ada atau tidak valid; Alkes dicek lebih dulu dari Obat
+        self.service_code_keywords = {
+            'Alkes': ['peralatan', 'alkes', 'alat', 'equipment', 'device', 'instrumen', 'instrument'],
+            'Obat': ['obat', 'medicine', 'drug', 'medication', 'farmasi', 'pharmacy']
+        }
+        
+        self.keyword_matcher = self._build_keyword_matcher()
+        
+        # Posisi kolom per format tagihan (sheet key-value dan tanpa header)
+        self.layout_profiles = compile_layout_profiles(Config.LAYOUT_PROFILES)
+    
+    def _build_keyword_matcher(self):
+        """Satu automaton untuk semua pencarian keyword (field, header, key-value, kolom output, service code)"""
+        return KeywordMatcher({
+            'field': [(field_name, keyword) for field_name, keywords in self.field_mapping.items() for keyword in keywords],
+            'header': [(keyword, keyword) for keyword in self.header_keywords],
+            'key_field': [(field_name, keyword) for keyword, field_name in self.key_field_rules],
+            'output_column': [
+                (output_col, keyword.lower())
+                for output_col, keywords in Config.COLUMN_MAPPING_RULES.items() for keyword in keywords
+            ],
+            SERVICE_CODE_GROUP: [
+                (service_code, keyword)
+                for service_code, keywords in self.service_code_keywords.items() for keyword in keywords
+            ]
+        })
     
-    def preview_excel(self, filepath):
-        """Membaca dan menganalisis struktur data Excel secara mendalam"""
+    def __getstate__(self):
+        # Cache dan layout registry (berisi lock dan DataFrame besar) tidak ikut dikirim ke worker process
+        state = self.__dict__.copy()
+        state['cache'] = None
+        state['layout_registry'] = None
+        return state
+    
+    def _requested_workers(self, options, option_name, default):
+        """
+        Jumlah worker process yang diminta lewat options (bisa berasal dari JSON request).
+        
+        Nilai dikonversi ke int dan dibatasi Config.MAX_SHEET_WORKERS; nilai yang tidak valid
+        memakai default dari config.
+        """
+        workers = (options or {}).get(option_name, default)
         try:
-            # Baca file Excel dengan berbagai sheet
-            excel_file = pd.ExcelFile(filepath)
-            sheet_names = excel_file.sheet_names
+            workers = int(workers or 1)
+        except (TypeError, ValueError):
+            print(f"⚠️ Warning: Option {option_name}={workers!r} tidak valid, memakai {default}")
+            workers = default or 1
+        return max(1, min(workers, Config.MAX_SHEET_WORKERS))
+    
+    def _resolve_workers(self, options, option_name, default, task_count):
+        """Jumlah worker process yang dipakai; 1 berarti jalankan serial"""
+        return max(1, min(self._requested_workers(options, option_name, default), task_count))
+    
+    def _run_sheet_tasks(self, task_fn, tasks, workers):
+        """Jalankan task per sheet (serial atau ProcessPoolExecutor); hasil tetap urut sesuai tasks"""
+        if workers <= 1:
+            return [task_fn(task) for task in tasks]
+        
+        print(f"⚡ Menjalankan {len(tasks)} sheet dengan {workers} worker process")
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            return list(executor.map(task_fn, tasks))
+    
+    def should_stream(self, source, options=None):
+        """Tentukan apakah file dibaca dengan reader streaming (openpyxl read_only)"""
+        if not isinstance(source, str):
+            return False
+        engine = (options or {}).get('engine', 'auto')
+        if engine == 'streaming':
+            return True
+        if engine != 'auto':
+            return False
+        # Mode otomatis: hanya .xlsx (openpyxl) yang cukup besar
+        return (source.lower().endswith('.xlsx') and
+                os.path.getsize(source) >= Config.STREAMING_THRESHOLD_BYTES)
+    
+    def load_workbook(self, source, content_hash=None):
+        """Kembalikan ParsedWorkbook; file hanya di-parse jika source masih berupa path (content_hash opsional)"""
+        if isinstance(source, ParsedWorkbook):
+            return source
+        
+        if self.cache is None:
+            return ParsedWorkbook(source)
+        
+        content_hash = content_hash or compute_file_hash(source)
+        entry = self.cache.get(content_hash)
+        if entry is not None:
+            print(f"♻️ Workbook ditemukan di cache ({content_hash[:12]})")
+            return ParsedWorkbook(source, sheets=entry['sheets'], content_hash=content_hash)
+        
+        workbook = ParsedWorkbook(source, content_hash=content_hash)
+        self.cache.put_sheets(content_hash, workbook.sheets)
+        return workbook
+    
+    def load_preview_workbook(self, filepath, content_hash=None):
+        """
+        Workbook untuk preview sampled saat upload, tanpa parse seluruh sheet yang panjang.
+        
+        Workbook yang sudah ada di cache dipakai apa adanya (sampel acak dari seluruh sheet).
+        Sheet .xlsx yang lebih panjang dari PREVIEW_HEAD_ROWS + PREVIEW_SAMPLE_ROWS baris (menurut
+        dimensi sheet) hanya dibaca sampai batas itu lewat reader streaming: waktu respons tetap,
+        tetapi sampelnya hanya baris awal, bukan sampel acak, dan workbook ini tidak masuk cache.
+        File lainnya (termasuk .xls dan file tanpa dimensi sheet) di-parse penuh seperti load_workbook.
+        """
+        if self.cache is not None:
+            content_hash = content_hash or compute_file_hash(filepath)
+            if self.cache.get(content_hash) is not None:
+                return self.load_workbook(filepath, content_hash)
+        
+        if filepath.lower().endswith('.xlsx'):
+            reader = StreamingWorkbookReader(filepath, chunk_size=Config.STREAMING_CHUNK_ROWS)
+            window_rows = Config.PREVIEW_HEAD_ROWS + Config.PREVIEW_SAMPLE_ROWS
+            row_counts = reader.sheet_row_counts()
+            if None not in row_counts.values():
+                long_sheets = {sheet_name: count for sheet_name, count in row_counts.items() if count > window_rows}
+                if long_sheets:
+                    print(f"✂️ Preview dari {window_rows} baris awal sheet {list(long_sheets)}")
+                    return reader.read_head_workbook(window_rows, row_counts=long_sheets)
+        
+        return self.load_workbook(filepath, content_hash)
+    
+    def _read_streaming_head(self, reader):
+        """
+        Workbook berisi Config.STREAMING_ANALYSIS_ROWS baris awal tiap sheet untuk analisis streaming.
+        
+        Jumlah baris asli sheet yang lebih panjang diambil dari dimensi sheet, sehingga total_rows
+        analisis tetap jumlah baris sebenarnya, bukan hanya baris yang dibaca.
+        """
+        n_rows = Config.STREAMING_ANALYSIS_ROWS
+        row_counts = {
+            sheet_name: count for sheet_name, count in reader.sheet_row_counts().items()
+            if count is not None and count > n_rows
+        }
+        return reader.read_head_workbook(n_rows, row_counts=row_counts)
+    
+    def _get_cached_analysis(self, workbook, mode):
+        """Ambil analisis yang sudah pernah dihitung untuk workbook ini (jika ada)"""
+        if self.cache is None or workbook.content_hash is None:
+            return None
+        entry = self.cache.get(workbook.content_hash)
+        return entry['analyses'].get(mode) if entry is not None else None
+    
+    def preview_excel(self, source, options=None):
+        """
+        Membaca dan menganalisis struktur data Excel secara mendalam.
+        
+        options['preview_mode'] = 'sampled' hanya menganalisis head + sampel acak
+        baris tiap sheet; hasilnya ditandai sebagai estimasi.
+        """
+        try:
+            mode = (options or {}).get('preview_mode', 'full')
+            sampled = mode == 'sampled'
+            streaming = self.should_stream(source, options)
+            if streaming:
+                # File besar: cukup analisis head tiap sheet lewat reader streaming
+                reader = StreamingWorkbookReader(source, chunk_size=Config.STREAMING_CHUNK_ROWS)
+                workbook = self._read_streaming_head(reader)
+            elif (isinstance(source, str) and self.cache is None and
+                  self._requested_workers(options, 'analysis_workers', Config.ANALYSIS_WORKERS) > 1):
+                # Parse tiap sheet dilakukan paralel oleh worker process
+                workbook = ParsedWorkbook(source, lazy=True)
+            else:
+                # Semua sheet di-parse sekali, analisis mengambil data dari workbook ini
+                workbook = self.load_workbook(source)
+            sheet_names = workbook.sheet_names
+            
+            cached_analysis = self._get_cached_analysis(workbook, mode)
+            if cached_analysis is not None:
+                print(f"♻️ Memakai analisis dari cache untuk {len(sheet_names)} sheet")
+                return cached_analysis
             
             print(f"📊 Menganalisis {len(sheet_names)} sheet: {sheet_names}")
             
             if not sheet_names:
                 raise Exception("File Excel tidak memiliki sheet")
             
-            # Analisis mendalam untuk setiap sheet
+            # Sheet dengan template yang sudah dikenal langsung memakai layout dari registry
+            known_analysis = self._match_known_layouts(workbook, sheet_names)
+            analyze_sheet_names = [sheet_name for sheet_name in sheet_names if sheet_name not in known_analysis]
+            
+            # Analisis mendalam untuk setiap sheet lainnya (opsional paralel per sheet)
+            workers = self._resolve_workers(options, 'analysis_workers', Config.ANALYSIS_WORKERS, len(analyze_sheet_names))
+            tasks = [
+                (self, workbook.filepath, sheet_name,
+                 workbook.get_sheet(sheet_name) if workbook.is_loaded(sheet_name) else None,
+                 sampled, workbook.row_counts.get(sheet_name))
+                for sheet_name in analyze_sheet_names
+            ]
+            results = dict(zip(analyze_sheet_names, self._run_sheet_tasks(_analyze_sheet_task, tasks, workers)))
+            
+            # Gabungkan sesuai urutan sheet sehingga hasil sama dengan jalur serial
             all_analysis = {}
             for sheet_name in sheet_names:
-                try:
-                    print(f"🔍 Menganalisis sheet: {sheet_name}")
-                    df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
-                    
-                    if df.empty:
-                        print(f"⚠️ Warning: Sheet '{sheet_name}' kosong")
-                        continue
-                    
-                    analysis = self._deep_analyze_sheet(df, sheet_name)
+                analysis = known_analysis.get(sheet_name) or results.get(sheet_name)
+                if analysis is not None:
                     all_analysis[sheet_name] = analysis
-                    
-                except Exception as sheet_error:
-                    print(f"⚠️ Warning: Error analyzing sheet '{sheet_name}': {sheet_error}")
-                    # Continue with other sheets instead of failing completely
-                    continue
             
             if not all_analysis:
                 raise Exception("Tidak ada sheet yang dapat dianalisis")
             
+            self._learn_layouts(all_analysis)
+            
             # Gabungkan analisis dari semua sheet
             combined_analysis = self._combine_sheet_analysis(all_analysis)
+            if streaming:
+                combined_analysis['streaming'] = True
+                combined_analysis['analyzed_rows_per_sheet'] = Config.STREAMING_ANALYSIS_ROWS
+            
+            # sample_data sudah berupa string siap JSON; tipe lain ditangani json_encoder saat response
+            if sampled:
+                combined_analysis['estimated'] = any(
+                    sheet.get('estimated', False) for sheet in all_analysis.values()
+                )
             
-            # Bersihkan data untuk JSON serialization
-            cleaned_analysis = self._clean_analysis_for_json(combined_analysis)
+            if self.cache is not None and workbook.content_hash is not None:
+                self.cache.put_analysis(workbook.content_hash, combined_analysis, mode)
+                if sampled and not combined_analysis['estimated']:
+                    # Semua sheet cukup kecil sehingga sampel = seluruh data
+                    self.cache.put_analysis(workbook.content_hash, combined_analysis, 'full')
             
-            return cleaned_analysis
+            return combined_analysis
             
         except Exception as e:
             raise Exception(f"Error membaca file Excel: {str(e)}")
     
-    def _deep_analyze_sheet(self, df, sheet_name):
-        """Analisis mendalam untuk satu sheet"""
+    def _layout_fingerprint(self, df):
+        """
+        Fingerprint template sheet: jumlah kolom + token seluruh baris awal (maksimal N baris).
+        
+        Label (teks dengan keyword field/header dan key sebelum ' : ') disimpan apa adanya,
+        nilai yang berubah per tagihan (angka, tanggal, nama) hanya disimpan jenisnya, dan
+        baris data berurutan diringkas menjadi satu blok, sehingga tagihan lain dari template
+        yang sama (dengan jumlah item berbeda) menghasilkan fingerprint yang sama. Baris
+        template setelah blok data (header di bawah judul, subtotal) tetap ikut dihitung.
+        """
+        rows = []
+        in_data_block = False
+        for row_values in df.iloc[:Config.LAYOUT_FINGERPRINT_ROWS].itertuples(index=False):
+            tokens = [self._layout_token(cell_value) for cell_value in row_values]
+            label_count = sum(1 for token in tokens if token.startswith(('k:', 'l:')))
+            filled_count = sum(1 for token in tokens if token)
+            if label_count * 2 < filled_count:
+                if in_data_block:
+                    continue
+                in_data_block = True
+                if rows:
+                    # Blok data setelah bagian template: jumlah dan isi item berbeda per tagihan
+                    tokens = ['*']
+                else:
+                    # Sheet diawali baris data: cukup jenis nilai baris pertama blok
+                    tokens = ['a' if token.startswith('l:') else token for token in tokens]
+            else:
+                in_data_block = False
+            rows.append(tokens)
+        
+        payload = json.dumps([len(df.columns), rows], ensure_ascii=False)
+        return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:32]
+    
+    def _layout_token(self, cell_value):
+        """Token fingerprint untuk satu cell: '' kosong, '#' angka/tanggal, 'k:' key, 'l:' label, 'a' teks"""
+        if isinstance(cell_value, str):
+            text = ' '.join(cell_value.lower().split())
+            if not text:
+                return ''
+            if ' : ' in cell_value:
+                return 'k:' + ' '.join(cell_value.split(' : ', 1)[0].lower().split())
+            if re.search(r'\d', text):
+                return '#'
+            if self.keyword_matcher.first_label(text, 'field') or self.keyword_matcher.contains_any(text, 'header'):
+                return 'l:' + text
+            return 'a'
+        if cell_value is None or pd.isna(cell_value):
+            return ''
+        if isinstance(cell_value, (self.NUMERIC_VALUE_TYPES, datetime, date, pd.Timestamp)):
+            return '#'
+        return 'a'
+    
+    def _match_known_layouts(self, workbook, sheet_names):
+        """Analisis dari layout registry untuk sheet yang template-nya sudah dikenal: {sheet_name: analysis}"""
+        known_analysis = {}
+        if self.layout_registry is None:
+            return known_analysis
+        
+        for sheet_name in sheet_names:
+            if not workbook.is_loaded(sheet_name):
+                continue
+            df = workbook.get_sheet(sheet_name)
+            if df.empty:
+                continue
+            fingerprint = self._layout_fingerprint(df)
+            layout = self.layout_registry.get(fingerprint)
+            if layout is None:
+                continue
+            analysis = self._analysis_from_layout(
+                df, sheet_name, fingerprint, layout, workbook.row_counts.get(sheet_name, len(df))
+            )
+            if analysis is None:
+                print(f"⚠️ Warning: Layout tersimpan tidak cocok untuk sheet '{sheet_name}', dianalisis ulang")
+                self.layout_registry.forget(fingerprint)
+                continue
+            print(f"♻️ Template dikenal untuk sheet '{sheet_name}' ({layout['format']}), analisis dilewati")
+            known_analysis[sheet_name] = analysis
+        return known_analysis
+    
+    def _analysis_from_layout(self, df, sheet_name, fingerprint, layout, total_rows):
+        """Bangun analysis sheet dari layout tersimpan; None jika layout ternyata tidak berlaku"""
+        if layout.get('total_columns') != len(df.columns):
+            return None
+        
+        # Token 'k:' di fingerprint menjamin pola ' : ' ada; format lain dicek ulang agar tetap sama
+        if layout['format'] != 'key_value' and self._is_key_value_format(df):
+            return None
+        
+        if layout['format'] == 'key_value':
+            header_rows = []
+            for stored_row in layout.get('header_rows', []):
+                if stored_row['row_index'] not in df.index:
+                    return None
+                row_content = df.loc[stored_row['row_index']].copy().astype(str)
+                if self._calculate_header_score(row_content) <= 0.6:
+                    return None
+                header_rows.append({
+                    'row_index': stored_row['row_index'],
+                    'score': stored_row['score'],
+                    'content': row_content.tolist()
+                })
+        else:
+            # Raw dan table dibedakan oleh header rows: deteksi ulang di baris awal (murah) dan
+            # harus sama dengan header tersimpan, termasuk raw yang tidak punya header sama sekali
+            header_rows = self._detect_header_rows(df)
+            stored_header_indices = [stored_row['row_index'] for stored_row in layout.get('header_rows', [])]
+            if [header['row_index'] for header in header_rows[:1]] != stored_header_indices:
+                return None
+        if layout['format'] == 'table' and not header_rows:
+            return None
+        
+        return {
+            'sheet_name': sheet_name,
+            'total_rows': total_rows,
+            'total_columns': len(df.columns),
+            'detected_fields': dict(layout.get('detected_fields', {})),
+            'data_patterns': {},
+            'sample_data': {
+                f'col_{col_idx}': [
+                    self._clean_json_value(value)
+                    for value in df.iloc[:, col_idx].dropna().head(Config.MAX_ROWS_PREVIEW).tolist()
+                ]
+                for col_idx in range(len(df.columns))
+            },
+            'header_rows': header_rows,
+            'data_rows': [],
+            'format': layout['format'],
+            'layout_fingerprint': fingerprint,
+            'layout_match': True
+        }
+    
+    def _learn_layouts(self, all_analysis):
+        """Simpan layout dari analisis lengkap (bukan estimasi sampel) ke registry"""
+        if self.layout_registry is None:
+            return
+        for analysis in all_analysis.values():
+            if analysis.get('layout_match') or analysis.get('estimated') or 'format' not in analysis:
+                continue
+            self.layout_registry.learn(analysis['layout_fingerprint'], analysis)
+        self.layout_registry.save()
+    
+    def _sample_sheet_rows(self, df):
+        """Ambil head window + sampel acak baris sisanya (index asli dipertahankan)"""
+        head_rows = Config.PREVIEW_HEAD_ROWS
+        sample_rows = Config.PREVIEW_SAMPLE_ROWS
+        if len(df) <= head_rows + sample_rows:
+            return df
+        
+        rng = np.random.default_rng(Config.PREVIEW_RANDOM_SEED)
+        sampled_positions = rng.choice(np.arange(head_rows, len(df)), size=sample_rows, replace=False)
+        positions = np.concatenate([np.arange(head_rows), np.sort(sampled_positions)])
+        return df.iloc[positions]
+    
+    def _deep_analyze_sheet(self, df, sheet_name, sampled=False, total_rows=None):
+        """Analisis mendalam untuk satu sheet (total_rows: jumlah baris asli jika df hanya baris awal sheet)"""
         try:
+            total_rows = len(df) if total_rows is None else total_rows
+            layout_fingerprint = self._layout_fingerprint(df)
+            if sampled:
+                df = self._sample_sheet_rows(df)
+            
             analysis = {
                 'sheet_name': sheet_name,
-                'total_rows': len(df),
+                'total_rows': total_rows,
                 'total_columns': len(df.columns),
                 'detected_fields': {},
                 'data_patterns': {},
                 'sample_data': {},
                 'header_rows': [],
-                'data_rows': []
+                'data_rows': [],
+                'layout_fingerprint': layout_fingerprint
             }
+            if sampled:
+                # header_rows, data_patterns dan detected_fields adalah estimasi dari sampel
+                analysis['estimated'] = len(df) < total_rows
+                analysis['analyzed_rows'] = len(df)
             
             # Safety check for empty dataframe
             if df.empty or len(df.columns) == 0:
@@ -131,6 +583,14 @@ class ExcelProcessor:
             header_rows = self._detect_header_rows(df)
             analysis['header_rows'] = header_rows
             
+            # Format sheet untuk ekstraksi: key_value, table (ada header) atau raw
+            key_value_score = self._key_value_format_score(df)
+            if key_value_score > 0.5:
+                analysis['format'] = 'key_value'
+            else:
+                analysis['format'] = 'table' if header_rows else 'raw'
+            analysis['key_value_score'] = key_value_score
+            
             # Deteksi data rows (baris yang berisi nilai)
             data_rows = self._detect_data_rows(df, header_rows)
             analysis['data_rows'] = data_rows
@@ -140,16 +600,12 @@ class ExcelProcessor:
                 try:
                     col_data = df.iloc[:, col_idx].dropna()
                     if len(col_data) > 0:
-                        col_analysis = self._analyze_column_pattern(col_data, col_idx)
-                        analysis['data_patterns'][f'col_{col_idx}'] = col_analysis
-                        
-                        # Deteksi field berdasarkan konten
-                        detected_field = self._detect_field_from_content(col_data)
-                        if detected_field:
-                            analysis['detected_fields'][f'col_{col_idx}'] = detected_field
-                        
-                        # Sample data
-                        analysis['sample_data'][f'col_{col_idx}'] = col_data.head(5).tolist()
+                        # Pola data, deteksi field berdasarkan konten, dan sample dalam satu pass
+                        profile = self._profile_column(col_data, col_idx)
+                        analysis['data_patterns'][f'col_{col_idx}'] = profile['pattern']
+                        if profile['detected_field']:
+                            analysis['detected_fields'][f'col_{col_idx}'] = profile['detected_field']
+                        analysis['sample_data'][f'col_{col_idx}'] = profile['sample_data']
                 except Exception as col_error:
                     print(f"⚠️ Warning: Error analyzing column {col_idx}: {col_error}")
                     continue
@@ -174,142 +630,214 @@ class ExcelProcessor:
         """Deteksi baris yang berisi header/label field"""
         header_rows = []
         
-        for row_idx in range(min(10, len(df))):  # Cek 10 baris pertama
-            row_data = df.iloc[row_idx].astype(str)
-            header_score = self._calculate_header_score(row_data)
-            
+        # copy() dulu: pada pandas 2.0 astype(str) atas view baris bisa mengubah DataFrame asli
+        candidate_rows = [df.iloc[row_idx].copy().astype(str).tolist() for row_idx in range(min(10, len(df)))]  # Cek 10 baris pertama
+        header_scores = self._calculate_header_scores(candidate_rows)
+        
+        for row_idx, (row_content, header_score) in enumerate(zip(candidate_rows, header_scores)):
             if header_score > 0.6:  # Threshold untuk mendeteksi header
                 header_rows.append({
-                    'row_index': row_idx,
-                    'score': header_score,
-                    'content': row_data.tolist()
+                    'row_index': int(df.index[row_idx]),
+                    'score': float(header_score),
+                    'content': row_content
                 })
         
         return sorted(header_rows, key=lambda x: x['score'], reverse=True)
     
     def _calculate_header_score(self, row_data):
         """Hitung skor kemungkinan baris adalah header"""
-        score = 0
-        total_cells = len(row_data)
+        return float(self._calculate_header_scores([list(row_data)])[0])
+    
+    def _calculate_header_scores(self, rows):
+        """
+        Skor header untuk beberapa baris sekaligus (numpy array, satu skor per baris).
         
-        for cell_value in row_data:
-            cell_str = str(cell_value).lower().strip()
-            
-            # Cek apakah cell berisi label field yang umum
-            if any(field in cell_str for field_list in self.field_mapping.values() for field in field_list):
-                score += 1
-            elif any(keyword in cell_str for keyword in ['nomor', 'tanggal', 'nama', 'kelas', 'biaya', 'jumlah', 'total']):
-                score += 0.5
-            elif len(cell_str) > 3 and len(cell_str) < 50:  # Panjang yang masuk akal untuk header
-                score += 0.3
+        Semua cell di-lower-case sekali lalu dicocokkan dalam satu scan keyword_matcher:
+        label field = 1, keyword header umum = 0.5, teks dengan panjang wajar = 0.3.
+        """
+        row_lengths = [len(row) for row in rows]
+        cells = pd.Series([str(cell_value) for row in rows for cell_value in row], dtype=object)
+        if cells.empty:
+            return np.zeros(len(rows))
+        
+        cell_str = cells.str.lower().str.strip()
+        cell_length = cell_str.str.len().to_numpy()
+        keyword_hits = self.keyword_matcher.match_cells(cell_str.tolist(), ['field', 'header'])
+        cell_weights = np.select(
+            [
+                keyword_hits['field'],
+                keyword_hits['header'],
+                (cell_length > 3) & (cell_length < 50)  # Panjang yang masuk akal untuk header
+            ],
+            [1.0, 0.5, 0.3],
+            default=0.0
+        )
         
-        return score / total_cells if total_cells > 0 else 0
+        scores = np.zeros(len(rows))
+        start = 0
+        for row_idx, total_cells in enumerate(row_lengths):
+            if total_cells > 0:
+                # cumsum menjumlah berurutan seperti loop lama, jadi skornya identik sampai bit terakhir
+                scores[row_idx] = np.cumsum(cell_weights[start:start + total_cells])[-1] / total_cells
+            start += total_cells
+        return scores
     
     def _detect_data_rows(self, df, header_rows):
-        """Deteksi baris yang berisi data berdasarkan header rows"""
-        data_rows = []
-        
+        """Deteksi baris yang berisi data berdasarkan header rows (hanya label index baris)"""
+        # row_index memakai label index sehingga tetap benar untuk DataFrame hasil sampling;
+        # isi baris diambil per halaman lewat preview_rows()
         if not header_rows:
             # Jika tidak ada header yang jelas, asumsikan semua baris adalah data
-            return [{'row_index': i, 'type': 'data'} for i in range(len(df))]
+            return [int(i) for i in df.index]
         
         # Ambil header row pertama sebagai referensi
         header_row_idx = header_rows[0]['row_index']
         
-        for row_idx in range(len(df)):
-            if row_idx != header_row_idx:
-                row_data = df.iloc[row_idx]
-                if self._is_data_row(row_data):
-                    data_rows.append({
-                        'row_index': row_idx,
-                        'type': 'data',
-                        'content': row_data.tolist()
-                    })
-        
-        return data_rows
-    
-    def _is_data_row(self, row_data):
-        """Cek apakah baris berisi data (bukan header)"""
-        # Cek apakah ada nilai numerik atau tanggal
-        numeric_count = 0
-        date_count = 0
-        
-        for cell_value in row_data:
-            if pd.notna(cell_value):
-                if isinstance(cell_value, (int, float)):
-                    numeric_count += 1
-                elif isinstance(cell_value, str):
-                    # Cek apakah string berisi angka
-                    if re.search(r'\d', str(cell_value)):
-                        numeric_count += 1
-                    # Cek apakah string berisi format tanggal
-                    if re.search(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', str(cell_value)):
-                        date_count += 1
-        
-        # Baris dianggap data jika ada cukup nilai numerik atau tanggal
-        return numeric_count > 0 or date_count > 0
-    
-    def _analyze_column_pattern(self, col_data, col_idx):
-        """Analisis pola data dalam satu kolom"""
+        data_mask = self._data_row_mask(df) & (df.index != header_row_idx)
+        return [int(i) for i in df.index[data_mask]]
+    
+    def _data_row_mask(self, df):
+        """
+        Mask baris data untuk seluruh DataFrame (numpy bool array per baris).
+        
+        Baris adalah data jika ada cell bernilai int/float/bool (bukan NaN) atau string yang
+        mengandung angka; mask dibangun per kolom lalu direduksi per baris.
+        """
+        row_mask = np.zeros(len(df), dtype=bool)
+        for col_idx in range(len(df.columns)):
+            column = df.iloc[:, col_idx]
+            if pd.api.types.is_bool_dtype(column) or pd.api.types.is_numeric_dtype(column):
+                row_mask |= column.notna().to_numpy()
+            elif column.dtype == object:
+                row_mask |= self._object_data_mask(column)
+        return row_mask
+    
+    def _object_data_mask(self, column):
+        """Mask data untuk kolom object: cek tipe per nilai unik tipe, regex angka hanya untuk string"""
+        inferred_type = pd.api.types.infer_dtype(column, skipna=True)
+        if inferred_type == 'empty':
+            return np.zeros(len(column), dtype=bool)
+        if inferred_type in ('integer', 'floating', 'mixed-integer-float', 'boolean', 'decimal'):
+            return column.notna().to_numpy()
+        if inferred_type == 'string':
+            # Hanya string dan nilai kosong: cukup cek angka (pola tanggal selalu mengandung angka)
+            return column.str.contains(r'\d', regex=True, na=False).to_numpy(dtype=bool)
+        
+        cell_types = pd.Series(list(map(type, column.to_numpy())), index=column.index)
+        numeric_types = [t for t in set(cell_types) if issubclass(t, self.NUMERIC_VALUE_TYPES)]
+        mask = (cell_types.isin(numeric_types) & column.notna()).to_numpy()
+        
+        string_cells = cell_types.to_numpy() == str
+        if string_cells.any():
+            # Pola tanggal selalu mengandung angka, jadi cukup cek angka
+            mask[string_cells] |= column[string_cells].str.contains(r'\d', regex=True).to_numpy(dtype=bool)
+        return mask
+    
+    # Pola per kolom, urut prioritas: currency > date > numeric_string
+    COLUMN_PATTERNS = [
+        ('currency', re.compile(r'Rp\s*[\d,]+')),
+        ('date', re.compile(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}')),
+        ('numeric_string', re.compile(r'^\d+$'))
+    ]
+    PROFILE_TEXT_CHUNK_ROWS = 10000
+    
+    def _profile_column(self, col_data, col_idx):
+        """
+        Profil satu kolom (tanpa NaN): pola data, field terdeteksi, dan sample.
+        
+        unique_values exact untuk kolom kecil dan HyperLogLog untuk kolom besar. Pola dicek atas
+        nilai unik per chunk (berhenti begitu pola prioritas tertinggi, currency, ditemukan). Keyword field di-scan
+        dalam satu pass per cell dengan KeywordStream, berhenti begitu field prioritas tertinggi
+        ditemukan; teks kolom tidak pernah digabung menjadi satu string besar.
+        """
+        profile = {
+            'pattern': {
+                'data_type': 'unknown',
+                'non_null_count': 0,
+                'unique_values': 0,
+                'pattern_type': 'unknown'
+            },
+            'detected_field': None,
+            'sample_data': []
+        }
         try:
-            pattern = {
+            unique_count, approximate = self._count_unique_values(col_data)
+            profile['pattern'] = {
                 'data_type': str(col_data.dtype),
                 'non_null_count': len(col_data),
-                'unique_values': col_data.nunique(),
+                'unique_values': unique_count,
                 'pattern_type': 'unknown'
             }
+            if approximate:
+                profile['pattern']['unique_values_approximate'] = True
+            # Sample langsung dalam bentuk string siap JSON (NaN/inf → '', karakter kontrol dibuang)
+            profile['sample_data'] = [
+                self._clean_json_value(value) for value in col_data.head(Config.MAX_ROWS_PREVIEW).tolist()
+            ]
             
             # Safety check for empty column
             if col_data.empty:
-                return pattern
+                return profile
             
-            # Deteksi tipe pola
-            try:
-                if col_data.dtype in ['int64', 'float64']:
-                    pattern['pattern_type'] = 'numeric'
-                elif hasattr(col_data, 'str') and col_data.str.contains(r'Rp\s*[\d,]+', na=False).any():
-                    pattern['pattern_type'] = 'currency'
-                elif hasattr(col_data, 'str') and col_data.str.contains(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', na=False).any():
-                    pattern['pattern_type'] = 'date'
-                elif hasattr(col_data, 'str') and col_data.str.contains(r'^\d+$', na=False).any():
-                    pattern['pattern_type'] = 'numeric_string'
-                else:
-                    pattern['pattern_type'] = 'text'
-            except Exception as pattern_error:
-                print(f"⚠️ Warning: Error detecting pattern for column {col_idx}: {pattern_error}")
-                pattern['pattern_type'] = 'unknown'
+            profile['pattern']['pattern_type'] = self._detect_column_pattern(col_data)
             
-            return pattern
+            field_stream = self.keyword_matcher.stream('field')
+            for cell_text in self._iter_column_text(col_data):
+                field_stream.feed(cell_text, lower=True)
+                if field_stream.done:
+                    break
+            profile['detected_field'] = field_stream.label
+            return profile
             
         except Exception as e:
-            print(f"⚠️ Warning: Error analyzing column pattern for column {col_idx}: {e}")
-            return {
-                'data_type': 'unknown',
-                'non_null_count': 0,
-                'unique_values': 0,
-                'pattern_type': 'unknown'
-            }
+            print(f"⚠️ Warning: Error profiling column {col_idx}: {e}")
+            return profile
     
-    def _detect_field_from_content(self, col_data):
-        """Deteksi field berdasarkan konten kolom"""
-        try:
-            # Safety check for empty column
-            if col_data.empty:
-                return None
-            
-            # Gabungkan semua nilai dalam kolom
-            combined_text = ' '.join(col_data.astype(str)).lower()
-            
-            # Cek setiap field mapping
-            for field_name, keywords in self.field_mapping.items():
-                if any(keyword in combined_text for keyword in keywords):
-                    return field_name
-            
-            return None
-            
-        except Exception as e:
-            print(f"⚠️ Warning: Error detecting field from content: {e}")
-            return None
+    def _count_unique_values(self, col_data):
+        """Jumlah nilai unik kolom: (count, approximate) sesuai Config.UNIQUE_COUNT_*"""
+        return distinct_count(
+            col_data,
+            exact_threshold=Config.UNIQUE_COUNT_EXACT_THRESHOLD,
+            precision=Config.UNIQUE_COUNT_HLL_PRECISION
+        )
+    
+    def _detect_column_pattern(self, col_data):
+        """Tipe pola kolom dari nilai uniknya (numeric, currency, date, numeric_string, text)"""
+        if col_data.dtype in ['int64', 'float64']:
+            return 'numeric'
+        
+        # Pola hanya dicek untuk kolom yang bisa memakai accessor .str (berisi string)
+        if col_data.dtype != object or pd.api.types.infer_dtype(col_data, skipna=True) not in (
+            'string', 'empty', 'bytes', 'mixed', 'mixed-integer'
+        ):
+            return 'text'
+        
+        pattern_rank = len(self.COLUMN_PATTERNS)
+        # Nilai unik per chunk: hash set yang dibangun tetap kecil untuk kolom besar
+        for start in range(0, len(col_data), self.PROFILE_TEXT_CHUNK_ROWS):
+            for cell_value in col_data.iloc[start:start + self.PROFILE_TEXT_CHUNK_ROWS].unique():
+                if isinstance(cell_value, str):
+                    for rank in range(pattern_rank):
+                        if self.COLUMN_PATTERNS[rank][1].search(cell_value):
+                            pattern_rank = rank
+                            break
+                    if pattern_rank == 0:
+                        return self.COLUMN_PATTERNS[0][0]
+        
+        if pattern_rank < len(self.COLUMN_PATTERNS):
+            return self.COLUMN_PATTERNS[pattern_rank][0]
+        return 'text'
+    
+    def _iter_column_text(self, col_data):
+        """Generator teks per cell seperti astype(str); konversi kolom non-object dilakukan per chunk"""
+        if col_data.dtype == object:
+            return map(str, col_data)
+        
+        return (
+            cell_text
+            for start in range(0, len(col_data), self.PROFILE_TEXT_CHUNK_ROWS)
+            for cell_text in col_data.iloc[start:start + self.PROFILE_TEXT_CHUNK_ROWS].astype(str)
+        )
     
     def _combine_sheet_analysis(self, all_analysis):
         """Gabungkan analisis dari semua sheet"""
@@ -372,220 +900,392 @@ class ExcelProcessor:
                 }
             }
     
-    def _clean_analysis_for_json(self, analysis):
-        """Bersihkan analisis untuk JSON serialization"""
+    def _clean_json_value(self, value):
+        """Nilai cell sebagai string aman untuk JSON (NaN/inf menjadi '')"""
         try:
-            def clean_value(value):
-                try:
-                    if pd.isna(value):
-                        return ''
-                    elif isinstance(value, (int, float)):
-                        if np.isinf(value):
-                            return ''
-                        return str(value)
-                    else:
-                        return str(value).replace('\x00', '').replace('\n', ' ').replace('\r', '')
-                except Exception:
+            if pd.isna(value):
+                return ''
+            elif isinstance(value, (int, float)):
+                if np.isinf(value):
                     return ''
-            
-            # Bersihkan sample data
-            if 'sheets' in analysis:
-                for sheet_name, sheet_analysis in analysis['sheets'].items():
-                    try:
-                        if 'sample_data' in sheet_analysis:
-                            for col_name, sample_data in sheet_analysis['sample_data'].items():
-                                try:
-                                    sheet_analysis['sample_data'][col_name] = [clean_value(val) for val in sample_data]
-                                except Exception as col_error:
-                                    print(f"⚠️ Warning: Error cleaning column {col_name}: {col_error}")
-                                    sheet_analysis['sample_data'][col_name] = []
-                    except Exception as sheet_error:
-                        print(f"⚠️ Warning: Error cleaning sheet {sheet_name}: {sheet_error}")
-                        continue
-            
-            return analysis
-            
-        except Exception as e:
-            print(f"⚠️ Warning: Error in JSON cleaning: {e}")
-            return analysis
+                return str(value)
+            else:
+                return str(value).replace('\x00', '').replace('\n', ' ').replace('\r', '')
+        except Exception:
+            return ''
     
-    def process_excel(self, filepath, options=None):
-        """Memproses file Excel dengan analisis mendalam"""
+    def summarize_preview(self, analysis):
+        """
+        Ringkasan analisis untuk response upload: summary, field terdeteksi dan sample saja.
+        
+        Isi baris tidak ikut dikirim: header_rows hanya berisi posisi dan skor, data_rows
+        diganti jumlahnya. Isi baris diambil per halaman lewat preview_rows().
+        Analisis asli (yang juga disimpan di cache) tidak diubah.
+        """
+        summary = dict(analysis)
+        summary['sheets'] = {}
+        for sheet_name, sheet_analysis in analysis.get('sheets', {}).items():
+            sheet_summary = {key: value for key, value in sheet_analysis.items() if key != 'data_rows'}
+            sheet_summary['header_rows'] = [
+                {'row_index': header_row['row_index'], 'score': header_row['score']}
+                for header_row in sheet_analysis.get('header_rows', [])
+            ]
+            # Sheet dari layout registry tidak menghitung data_rows
+            if not sheet_analysis.get('layout_match'):
+                sheet_summary['data_row_count'] = len(sheet_analysis.get('data_rows', []))
+            summary['sheets'][sheet_name] = sheet_summary
+        return summary
+    
+    def preview_rows(self, source, sheet_name, offset=0, limit=None, content_hash=None):
+        """
+        Satu halaman isi baris sheet: {sheet_name, offset, limit, total_rows, has_more, rows}.
+        
+        Workbook diambil dari cache hasil upload jika ada (content_hash dari upload, jika diberikan,
+        dipakai sebagai key tanpa membaca ulang file); file besar (streaming) hanya dibaca sampai
+        baris offset + limit. total_rows None jika tidak diketahui (streaming).
+        """
+        limit = min(limit or Config.PREVIEW_ROWS_PAGE_SIZE, Config.PREVIEW_ROWS_MAX_PAGE_SIZE)
+        offset = max(int(offset), 0)
+        
+        if self.should_stream(source):
+            reader = StreamingWorkbookReader(source, chunk_size=Config.STREAMING_CHUNK_ROWS)
+            if sheet_name not in reader.sheet_names:
+                raise KeyError(sheet_name)
+            # Satu baris ekstra untuk mengetahui apakah masih ada halaman berikutnya
+            page_chunks = [
+                chunk[chunk.index >= offset]
+                for chunk in reader.iter_chunks(sheet_name, max_rows=offset + limit + 1)
+            ]
+            page_rows = [
+                (row_label, row_values)
+                for chunk in page_chunks
+                for row_label, row_values in zip(chunk.index, chunk.to_numpy(dtype=object).tolist())
+            ]
+            total_rows = None
+            has_more = len(page_rows) > limit
+            page_rows = page_rows[:limit]
+        else:
+            workbook = self.load_workbook(source, content_hash)
+            if sheet_name not in workbook.sheet_names:
+                raise KeyError(sheet_name)
+            df = workbook.get_sheet(sheet_name)
+            page = df.iloc[offset:offset + limit]
+            page_rows = list(zip(page.index, page.to_numpy(dtype=object).tolist()))
+            total_rows = len(df)
+            has_more = offset + limit < total_rows
+        
+        return {
+            'sheet_name': sheet_name,
+            'offset': offset,
+            'limit': limit,
+            'total_rows': total_rows,
+            'has_more': has_more,
+            'rows': [
+                {'row_index': int(row_label), 'values': [self._clean_json_value(value) for value in row_values]}
+                for row_label, row_values in page_rows
+            ]
+        }
+    
+    def process_excel(self, source, options=None, output_dir='outputs', output_filename=None, content_hash=None):
+        """Memproses file Excel dengan analisis mendalam (content_hash opsional, key cache dari upload)"""
         try:
-            # Analisis mendalam terlebih dahulu
-            analysis = self.preview_excel(filepath)
-            
-            # Baca data berdasarkan analisis
-            processed_data = self._extract_structured_data(filepath, analysis)
+            if self.should_stream(source, options):
+                # File besar: analisis dari head sheet, ekstraksi baris demi baris
+                reader = StreamingWorkbookReader(source, chunk_size=Config.STREAMING_CHUNK_ROWS)
+                workbook = self._read_streaming_head(reader)
+                analysis = self.preview_excel(workbook, options)
+                processed_data = self._extract_structured_data_streaming(reader, workbook, analysis, options)
+            else:
+                # Parse workbook sekali, dipakai untuk analisis dan ekstraksi
+                workbook = self.load_workbook(source, content_hash)
+                
+                # Analisis mendalam terlebih dahulu
+                analysis = self.preview_excel(workbook, options)
+                
+                # Baca data berdasarkan analisis
+                processed_data = self._extract_structured_data(workbook, analysis, options)
             
             # Transform ke format output
             output_df = self._transform_to_output_format(processed_data, analysis)
             
             # Buat file output
-            output_filepath = self._create_output_file(output_df, filepath)
+            output_filepath = self._create_output_file(output_df, workbook.filepath, output_dir, output_filename)
+            
+            # Statistik run terakhir (dipakai oleh batch processing)
+            self.last_run_stats = {
+                'sheets': len(analysis.get('sheets', {})),
+                'rows': len(output_df)
+            }
             
             return output_filepath
             
         except Exception as e:
             raise Exception(f"Error memproses file Excel: {str(e)}")
     
-    def _extract_structured_data(self, filepath, analysis):
+    def _extract_structured_data(self, source, analysis, options=None):
         """Ekstrak data terstruktur berdasarkan analisis"""
         extracted_data = []
+        workbook = self.load_workbook(source)
+        sheet_items = self._with_layout_profile(analysis['sheets'].items(), options)
+        
+        # File satu sheet (atau workers=1) selalu diproses serial
+        workers = self._resolve_workers(options, 'extraction_workers', Config.EXTRACTION_WORKERS, len(sheet_items))
+        if workers <= 1:
+            for sheet_name, sheet_analysis in sheet_items:
+                extracted_data.extend(self._extract_sheet(workbook, sheet_name, sheet_analysis))
+            return extracted_data
+        
+        tasks = [
+            (self, workbook.filepath, sheet_name, workbook.get_sheet(sheet_name), sheet_analysis)
+            for sheet_name, sheet_analysis in sheet_items
+        ]
+        # Batch digabung sesuai urutan sheet agar forward fill tetap benar
+        for batch in self._run_sheet_tasks(_extract_sheet_task, tasks, workers):
+            extracted_data.extend(_unpack_records(batch))
+        
+        return extracted_data
+    
+    def _with_layout_profile(self, sheet_items, options):
+        """List (sheet_name, sheet_analysis); option 'layout_profile' dipasang di salinan analisis tiap sheet"""
+        profile_name = (options or {}).get('layout_profile')
+        if not profile_name:
+            return list(sheet_items)
+        return [
+            (sheet_name, dict(sheet_analysis, layout_profile=profile_name))
+            for sheet_name, sheet_analysis in sheet_items
+        ]
+    
+    def _get_layout_profile(self, sheet_analysis):
+        """LayoutProfile untuk sheet (dari analisis atau Config.DEFAULT_LAYOUT_PROFILE)"""
+        profile_name = sheet_analysis.get('layout_profile') or Config.DEFAULT_LAYOUT_PROFILE
+        if profile_name not in self.layout_profiles:
+            raise Exception(f"Layout profile '{profile_name}' tidak ada di Config.LAYOUT_PROFILES")
+        return self.layout_profiles[profile_name]
+    
+    def _extract_sheet(self, workbook, sheet_name, sheet_analysis):
+        """Ekstrak data dari satu sheet workbook"""
+        print(f"📊 Memproses sheet: {sheet_name}")
+        
+        df = workbook.get_sheet(sheet_name)
+        profile = self._get_layout_profile(sheet_analysis)
+        
+        # Cek apakah ini format key-value pairs atau format tabel standar
+        sheet_format = self._get_sheet_format(df, sheet_analysis)
+        if sheet_format == 'key_value':
+            print(f"🔍 Detected key-value format in sheet: {sheet_name}")
+            return self._extract_key_value_data(df, sheet_name, profile)
+        
+        print(f"🔍 Detected standard table format in sheet: {sheet_name}")
+        # Gunakan header rows yang terdeteksi
+        if sheet_format == 'table':
+            header_row = sheet_analysis['header_rows'][0]
+            header_idx = header_row['row_index']
+            
+            # Ambil data dengan header yang benar dari workbook yang sudah di-parse
+            data_df = workbook.get_sheet_with_header(sheet_name, header_idx)
+            
+            # Bersihkan nama kolom
+            data_df.columns = [str(col).strip() for col in data_df.columns]
+            
+            # Ekstrak data berdasarkan field yang terdeteksi
+            return self._extract_sheet_data(data_df, sheet_analysis)
+        
+        print(f"⚠️ No header rows detected, using raw data")
+        return self._extract_raw_data(df, sheet_name, profile)
+    
+    def _extract_structured_data_streaming(self, reader, head_workbook, analysis, options=None):
+        """Ekstrak data terstruktur dengan membaca sheet per chunk (memori tetap datar)"""
+        extracted_data = []
         
-        for sheet_name, sheet_analysis in analysis['sheets'].items():
-            print(f"📊 Memproses sheet: {sheet_name}")
+        for sheet_name, sheet_analysis in self._with_layout_profile(analysis['sheets'].items(), options):
+            print(f"📊 Memproses sheet (streaming): {sheet_name}")
             
-            df = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+            # Format ditentukan dari head sheet yang sudah dibaca untuk analisis
+            head_df = head_workbook.get_sheet(sheet_name)
+            profile = self._get_layout_profile(sheet_analysis)
             
-            # Cek apakah ini format key-value pairs atau format tabel standar
-            if self._is_key_value_format(df):
+            sheet_format = self._get_sheet_format(head_df, sheet_analysis)
+            if sheet_format == 'key_value':
                 print(f"🔍 Detected key-value format in sheet: {sheet_name}")
-                sheet_data = self._extract_key_value_data(df, sheet_name)
-            else:
+                sheet_data = self._extract_key_value_chunks(reader.iter_chunks(sheet_name), sheet_name, profile)
+            elif sheet_format == 'table':
                 print(f"🔍 Detected standard table format in sheet: {sheet_name}")
-                # Gunakan header rows yang terdeteksi
-                if sheet_analysis['header_rows']:
-                    header_row = sheet_analysis['header_rows'][0]
-                    header_idx = header_row['row_index']
-                    
-                    # Baca data dengan header yang benar
-                    data_df = pd.read_excel(filepath, sheet_name=sheet_name, header=header_idx)
-                    
-                    # Bersihkan nama kolom
-                    data_df.columns = [str(col).strip() for col in data_df.columns]
-                    
-                    # Ekstrak data berdasarkan field yang terdeteksi
-                    sheet_data = self._extract_sheet_data(data_df, sheet_analysis)
-                else:
-                    print(f"⚠️ No header rows detected, using raw data")
-                    sheet_data = self._extract_raw_data(df, sheet_name)
+                header_idx = sheet_analysis['header_rows'][0]['row_index']
+                columns = [
+                    str(col).strip()
+                    for col in head_workbook.get_sheet_with_header(sheet_name, header_idx).columns
+                ]
+                
+                sheet_data = []
+                for chunk in reader.iter_chunks(sheet_name):
+                    data_chunk = chunk[chunk.index > header_idx]
+                    if data_chunk.empty:
+                        continue
+                    data_chunk = data_chunk.reindex(columns=range(len(columns))).infer_objects()
+                    data_chunk.columns = columns
+                    # Index mengikuti read_excel(header=header_idx): baris pertama setelah header = 0
+                    data_chunk.index = data_chunk.index - header_idx - 1
+                    sheet_data.extend(self._extract_sheet_data(data_chunk, sheet_analysis))
+            else:
+                print(f"⚠️ No header rows detected, using raw data")
+                sheet_data = self._extract_raw_chunks(reader.iter_chunks(sheet_name), sheet_name, profile)
             
             extracted_data.extend(sheet_data)
         
         return extracted_data
     
     def _extract_sheet_data(self, df, sheet_analysis):
-        """Ekstrak data dari satu sheet"""
-        extracted_rows = []
-        
+        """Ekstrak data dari satu sheet (kolom field dipilih sekali, dibersihkan per kolom)"""
         # Mapping kolom berdasarkan field yang terdeteksi
         field_columns = {}
         for col_name, field in sheet_analysis.get('detected_fields', {}).items():
             col_idx = int(col_name.split('_')[1])
             if col_idx < len(df.columns):
-                field_columns[field] = df.columns[col_idx]
+                field_columns[field] = col_idx
         
-        # Proses setiap baris data
-        for idx, row in df.iterrows():
-            if idx == 0:  # Skip header row
-                continue
-                
-            extracted_row = {}
-            
-            # Ekstrak data berdasarkan field mapping
-            for field, col_name in field_columns.items():
-                if col_name in df.columns:
-                    extracted_row[field] = self._clean_value(row[col_name])
-            
-            if extracted_row:  # Hanya tambahkan jika ada data
-                extracted_rows.append(extracted_row)
+        if not field_columns:
+            return []
         
-        return extracted_rows
+        # Skip header row (baris berlabel 0)
+        data_df = df[df.index != 0]
+        fields = list(field_columns)
+        cleaned_columns = [self._clean_column(data_df.iloc[:, col_idx]) for col_idx in field_columns.values()]
+        return [dict(zip(fields, row_values)) for row_values in zip(*cleaned_columns)]
+    
+    def _get_sheet_format(self, df, sheet_analysis):
+        """Format sheet (key_value/table/raw) dari analisis; dihitung ulang jika analisis hanya estimasi sampel"""
+        sheet_format = sheet_analysis.get('format')
+        if sheet_format is None or sheet_analysis.get('estimated'):
+            if self._is_key_value_format(df):
+                return 'key_value'
+            return 'table' if sheet_analysis['header_rows'] else 'raw'
+        return sheet_format
     
     def _is_key_value_format(self, df):
         """Deteksi apakah data dalam format key-value pairs"""
+        return self._key_value_format_score(df) > 0.5
+    
+    def _key_value_format_score(self, df):
+        """
+        Skor keyakinan format key-value (0..1) dari probe window di bagian atas sheet.
+        
+        Baris key-value berisi cell dengan separator " : " (mis. "Nomor Tagihan : IP-00030178").
+        Skor 1 jika window berisi minimal KEY_VALUE_PROBE_MIN_MATCH_ROWS baris key-value,
+        0 jika window berisi KEY_VALUE_PROBE_MIN_PLAIN_ROWS baris terisi tanpa key-value,
+        di antaranya ambigu: window (baris dan kolom) diperbesar dua kali lipat sampai
+        seluruh sheet tercakup, lalu satu baris key-value pun sudah cukup (> 0.5).
+        """
         try:
-            # Cek apakah ada pola key-value seperti "Nomor Tagihan : IP-00030178"
-            key_value_pattern = False
-            for col in df.columns:
-                col_data = df.iloc[:, col].dropna()
-                if len(col_data) > 0:
-                    # Cek apakah ada string yang mengandung " : " (key-value separator)
-                    if any(' : ' in str(val) for val in col_data if pd.notna(val)):
-                        key_value_pattern = True
-                        break
-            
-            return key_value_pattern
+            probe_rows = Config.KEY_VALUE_PROBE_ROWS
+            probe_columns = Config.KEY_VALUE_PROBE_COLUMNS
+            while True:
+                window = df.iloc[:probe_rows, :probe_columns].to_numpy(dtype=object)
+                key_value_rows, plain_rows = self._count_key_value_rows(window)
+                
+                key_value_evidence = min(key_value_rows / Config.KEY_VALUE_PROBE_MIN_MATCH_ROWS, 1.0)
+                plain_evidence = 0.0 if key_value_rows else min(plain_rows / Config.KEY_VALUE_PROBE_MIN_PLAIN_ROWS, 1.0)
+                score = 0.5 + 0.5 * key_value_evidence - 0.5 * plain_evidence
+                
+                whole_sheet = probe_rows >= len(df) and probe_columns >= len(df.columns)
+                if score in (0.0, 1.0) or whole_sheet:
+                    return score
+                probe_rows *= 2
+                probe_columns *= 2
         except Exception as e:
             print(f"⚠️ Warning: Error detecting key-value format: {e}")
-            return False
+            return 0.0
+    
+    def _count_key_value_rows(self, values):
+        """(jumlah baris dengan cell berisi " : ", jumlah baris terisi lainnya) dari ndarray object"""
+        if values.size == 0:
+            return 0, 0
+        present = np.asarray(pd.notna(values), dtype=bool)
+        key_value_cells = np.zeros(values.shape, dtype=bool)
+        for col_idx in range(values.shape[1]):
+            cells = values[present[:, col_idx], col_idx]
+            if len(cells):
+                key_value_cells[present[:, col_idx], col_idx] = (
+                    pd.Series(cells, dtype=object).map(str).str.contains(' : ', regex=False).to_numpy(dtype=bool)
+                )
+        key_value_rows = key_value_cells.any(axis=1)
+        plain_rows = present.any(axis=1) & ~key_value_rows
+        return int(key_value_rows.sum()), int(plain_rows.sum())
     
-    def _extract_key_value_data(self, df, sheet_name):
+    def _extract_key_value_data(self, df, sheet_name, profile):
         """Ekstrak data dari format key-value pairs"""
+        print(f"🔍 Processing {len(df)} rows for key-value extraction...")
+        return self._extract_key_value_chunks([df], sheet_name, profile)
+    
+    def _extract_key_value_chunks(self, chunks, sheet_name, profile):
+        """
+        Ekstrak data key-value dari DataFrame per chunk (seluruh sheet = satu chunk, streaming = banyak chunk).
+        
+        Setiap baris chunk diberi label (kosong, key-value, header, transaksi, total) dalam satu
+        pre-pass vektor; state record hanya melewati baris berlabel key-value/transaksi/total.
+        """
         try:
             extracted_rows = []
             current_record = {}
             
-            print(f"🔍 Processing {len(df)} rows for key-value extraction...")
-            
-            for row_idx in range(len(df)):
-                row_data = df.iloc[row_idx]
+            for chunk in chunks:
+                values = chunk.to_numpy(dtype=object)
+                key_values = self._key_value_cells(values, profile)
+                row_labels = profile.row_labels(values, list(key_values))
                 
-                # Cari key-value pairs dalam baris ini
-                # Format: key di kolom 0, value di kolom 1, atau key di kolom 2, value di kolom 3
-                for col_idx in range(0, min(len(row_data), 4), 2):
-                    if col_idx + 1 < len(row_data):
-                        key_cell = row_data.iloc[col_idx]
-                        value_cell = row_data.iloc[col_idx + 1]
-                        
-                        if pd.notna(key_cell) and pd.notna(value_cell):
-                            key = str(key_cell).strip()
-                            value = str(value_cell).strip()
-                            
-                            # Skip jika value kosong atau hanya ":"
-                            if value and value != ':':
-                                # Bersihkan value dari ":" di depan
-                                if value.startswith(': '):
-                                    value = value[2:].strip()
-                                elif value.startswith(':'):
-                                    value = value[1:].strip()
-                                
-                                # Map key ke field yang dikenal
-                                mapped_field = self._map_key_to_field(key)
-                                if mapped_field:
-                                    current_record[mapped_field] = value
-                                    print(f"  📝 Found {mapped_field}: {value}")
+                # Data transaksi dan total diekstrak per kolom untuk semua baris berlabel sekaligus
+                transaction_positions = np.flatnonzero(row_labels & ROW_TRANSACTION)
+                total_positions = np.flatnonzero(row_labels & ROW_TOTAL)
+                transactions = dict(zip(
+                    transaction_positions.tolist(),
+                    profile.extract(values, 'transaction', transaction_positions, self._clean_column)
+                ))
+                totals = dict(zip(
+                    total_positions.tolist(),
+                    profile.extract(values, 'total', total_positions, self._clean_column)
+                ))
                 
-                # Jika baris ini berisi data transaksi (ada jumlah dan nilai)
-                if self._is_transaction_row(row_data):
-                    print(f"  💰 Transaction row detected at row {row_idx}")
-                    # Tambahkan record yang sudah dikumpulkan
-                    if current_record:
-                        # Tambahkan data transaksi dari baris ini
-                        transaction_data = self._extract_transaction_data(row_data)
-                        current_record.update(transaction_data)
-                        
-                        extracted_rows.append(current_record.copy())
-                        print(f"  ✅ Added record: {current_record}")
-                        current_record = {}  # Reset untuk record berikutnya
-                    else:
-                        # Jika tidak ada current_record, buat record baru dengan data transaksi saja
-                        print(f"  ⚠️ No current record, creating new one from transaction data")
-                        transaction_data = self._extract_transaction_data(row_data)
-                        if transaction_data:
-                            # Buat record minimal dengan data yang tersedia
+                for position in np.flatnonzero(row_labels & ROW_RECORD_FLAGS).tolist():
+                    row_label = row_labels[position]
+                    row_idx = chunk.index[position]
+                    
+                    if row_label & ROW_KEY_VALUE:
+                        for mapped_field, value in key_values[position]:
+                            current_record[mapped_field] = value
+                            print(f"  📝 Found {mapped_field}: {value}")
+                    
+                    # Baris berisi data transaksi (ada jumlah dan nilai)
+                    if row_label & ROW_TRANSACTION:
+                        print(f"  💰 Transaction row detected at row {row_idx}")
+                        transaction_data = transactions[position]
+                        # Tambahkan record yang sudah dikumpulkan
+                        if current_record:
+                            print(f"    💳 Transaction data: {transaction_data}")
+                            current_record.update(transaction_data)
+                            
+                            extracted_rows.append(current_record.copy())
+                            print(f"  ✅ Added record: {current_record}")
+                            current_record = {}  # Reset untuk record berikutnya
+                        elif transaction_data:
+                            # Jika tidak ada current_record, buat record minimal dengan data transaksi saja
+                            print(f"  ⚠️ No current record, creating new one from transaction data")
+                            print(f"    💳 Transaction data: {transaction_data}")
                             minimal_record = {
-                                'jenis_biaya': transaction_data.get('jenis_biaya', ''),
-                                'keterangan': transaction_data.get('keterangan', ''),
-                                'jumlah': transaction_data.get('jumlah', ''),
-                                'nilai': transaction_data.get('nilai', ''),
-                                'sub_total': transaction_data.get('sub_total', '')
+                                field: transaction_data.get(field, '') for field in profile.transaction_fields
                             }
                             extracted_rows.append(minimal_record)
                             print(f"  ✅ Added minimal record: {minimal_record}")
-                
-                # Cek juga untuk baris yang berisi total/subtotal
-                elif self._is_total_row(row_data):
-                    print(f"  💰 Total row detected at row {row_idx}")
-                    if current_record:
-                        # Tambahkan data total dari baris ini
-                        total_data = self._extract_total_data(row_data)
-                        current_record.update(total_data)
-                        
-                        extracted_rows.append(current_record.copy())
-                        print(f"  ✅ Added record with total: {current_record}")
-                        current_record = {}  # Reset untuk record berikutnya
+                    
+                    # Baris total/subtotal
+                    elif row_label & ROW_TOTAL:
+                        print(f"  💰 Total row detected at row {row_idx}")
+                        if current_record:
+                            total_data = totals[position]
+                            print(f"    💳 Total data: {total_data}")
+                            current_record.update(total_data)
+                            
+                            extracted_rows.append(current_record.copy())
+                            print(f"  ✅ Added record with total: {current_record}")
+                            current_record = {}  # Reset untuk record berikutnya
             
             # Tambahkan record terakhir jika ada
             if current_record:
@@ -601,247 +1301,79 @@ class ExcelProcessor:
             traceback.print_exc()
             return []
     
+    def _key_value_cells(self, values, profile):
+        """
+        Pasangan key-value per baris: {posisi baris: [(field, value), ...]} urut sesuai pasangan kolom profile.
+        Contoh: "Nomor Tagihan" | " : IP-00030178" → ('nomor_tagihan', 'IP-00030178').
+        """
+        cells = {}
+        for key_column, value_column in profile.key_value_columns(values):
+            positions = np.flatnonzero(pd.notna(key_column) & pd.notna(value_column))
+            if len(positions) == 0:
+                continue
+            
+            value_text = pd.Series(value_column[positions], dtype=object).map(str).str.strip()
+            # Skip jika value kosong atau hanya ":"
+            keep = ((value_text != '') & (value_text != ':')).to_numpy()
+            positions = positions[keep]
+            value_text = value_text[keep]
+            # Bersihkan value dari ":" di depan
+            value_text = value_text.where(~value_text.str.startswith(':'), value_text.str[1:].str.strip())
+            
+            # Map key ke field yang dikenal (satu scan keyword untuk semua key)
+            key_text = pd.Series(key_column[positions], dtype=object).map(str).str.strip().str.lower()
+            mapped_fields = self.keyword_matcher.first_labels(key_text.tolist(), 'key_field')
+            
+            for position, mapped_field, value in zip(positions.tolist(), mapped_fields, value_text.tolist()):
+                if mapped_field:
+                    cells.setdefault(position, []).append((mapped_field, value))
+        return cells
+    
     def _map_key_to_field(self, key):
         """Map key dari format key-value ke field yang dikenal"""
-        key_lower = key.lower()
-        
-        # Mapping berdasarkan contoh data dari sampledata.xlsx
-        if 'nomor tagihan' in key_lower:
-            return 'nomor_tagihan'
-        elif 'nomor registrasi' in key_lower:
-            return 'nomor_registrasi'
-        elif 'nama pasien' in key_lower:
-            return 'nama_pasien'
-        elif 'nama' in key_lower and 'pasien' in key_lower:
-            return 'nama_pasien'
-        elif 'pasien' in key_lower:
-            return 'nama_pasien'
-        elif 'tanggal registrasi' in key_lower:
-            return 'tanggal_registrasi'
-        elif 'kelas / kamar' in key_lower:
-            return 'kelas_kamar'
-        elif 'penjamin bayar' in key_lower:
-            return 'penjamin_bayar'
-        elif 'tanggal keluar' in key_lower:
-            return 'tanggal_keluar'
-        elif 'kelas dijamin' in key_lower:
-            return 'kelas_dijamin'
-        elif 'keterangan' in key_lower:
-            return 'keterangan'
-        elif 'jumlah' in key_lower:
-            return 'jumlah'
-        elif 'nilai' in key_lower:
-            return 'nilai'
-        elif 'biaya kamar' in key_lower:
-            return 'jenis_biaya'
-        elif 'room charge' in key_lower:
-            return 'jenis_biaya'
-        
-        return None
+        return self.keyword_matcher.first_label(key.lower(), 'key_field')
     
     def _calculate_total_billed(self, data_row):
-        """Hitung total billed dari tarif dikali quantity"""
+        """Hitung total billed (teks terformat) dari tarif dikali quantity satu record; None jika tidak bisa"""
         try:
-            # Ambil nilai tarif dan quantity
-            tarif = data_row.get('nilai', '')
-            quantity = data_row.get('jumlah', '')
-            
-            # Cek apakah kedua nilai tersedia
-            if not tarif or not quantity:
+            totals = self._calculate_total_billed_values([data_row.get('nilai', '')], [data_row.get('jumlah', '')])
+            if np.isnan(totals[0]):
                 return None
-            
-            # Bersihkan nilai tarif dari format currency
-            tarif_clean = self._clean_currency_value(tarif)
-            quantity_clean = self._clean_numeric_value(quantity)
-            
-            if tarif_clean is not None and quantity_clean is not None:
-                # Hitung total
-                total = tarif_clean * quantity_clean
-                return f"{total:,.0f}"
-            
-            return None
-            
+            return self._format_total_billed(totals[0])
         except Exception as e:
             print(f"⚠️ Warning: Error calculating total billed: {e}")
             return None
     
-    def _clean_currency_value(self, value):
-        """Bersihkan nilai currency untuk perhitungan"""
-        try:
-            if pd.isna(value) or value == '':
-                return None
-            
-            # Konversi ke string
-            value_str = str(value).strip()
-            
-            # Hapus karakter currency dan spasi
-            value_str = value_str.replace('Rp', '').replace(' ', '').replace(',', '').replace('-', '').replace('.', '')
-            
-            # Cek apakah ada angka
-            if re.search(r'\d', value_str):
-                # Ekstrak angka saja
-                numbers = re.findall(r'\d+', value_str)
-                if numbers:
-                    return float(numbers[0])
-            
-            return None
-            
-        except Exception as e:
-            print(f"⚠️ Warning: Error cleaning currency value '{value}': {e}")
-            return None
-    
-    def _clean_numeric_value(self, value):
-        """Bersihkan nilai numeric untuk perhitungan"""
-        try:
-            if pd.isna(value) or value == '':
-                return None
-            
-            # Konversi ke string
-            value_str = str(value).strip()
-            
-            # Hapus karakter non-numeric kecuali titik dan minus
-            value_str = re.sub(r'[^\d.-]', '', value_str)
-            
-            # Cek apakah ada angka
-            if re.search(r'\d', value_str):
-                return float(value_str)
-            
-            return None
-            
-        except Exception as e:
-            print(f"⚠️ Warning: Error cleaning numeric value '{value}': {e}")
-            return None
-    
-    def _extract_transaction_data(self, row_data):
-        """Ekstrak data transaksi dari baris yang berisi jumlah dan nilai"""
-        try:
-            transaction_data = {}
-            
-            # Cek kolom 0: Jenis biaya
-            if pd.notna(row_data.iloc[0]):
-                transaction_data['jenis_biaya'] = self._clean_value(row_data.iloc[0])
-            
-            # Cek kolom 1: Keterangan
-            if pd.notna(row_data.iloc[1]):
-                transaction_data['keterangan'] = self._clean_value(row_data.iloc[1])
-            
-            # Cek kolom 4: Jumlah
-            if len(row_data) > 4 and pd.notna(row_data.iloc[4]):
-                transaction_data['jumlah'] = self._clean_value(row_data.iloc[4])
-            
-            # Cek kolom 5: Nilai
-            if len(row_data) > 5 and pd.notna(row_data.iloc[5]):
-                transaction_data['nilai'] = self._clean_value(row_data.iloc[5])
-            
-            # Cek kolom 7: Total (jika ada)
-            if len(row_data) > 7 and pd.notna(row_data.iloc[7]):
-                transaction_data['sub_total'] = self._clean_value(row_data.iloc[7])
-            
-            print(f"    💳 Transaction data: {transaction_data}")
-            return transaction_data
-            
-        except Exception as e:
-            print(f"⚠️ Warning: Error extracting transaction data: {e}")
-            return {}
-    
-    def _is_transaction_row(self, row_data):
-        """Cek apakah baris berisi data transaksi (ada jumlah dan nilai)"""
-        try:
-            # Cek apakah ada kolom jumlah dan nilai yang terisi
-            if len(row_data) > 5:
-                jumlah = row_data.iloc[4]  # Kolom 4: JUMLAH
-                nilai = row_data.iloc[5]   # Kolom 5: NILAI
-                
-                # Hanya deteksi sebagai transaksi jika kedua kolom terisi dan bukan header
-                if pd.notna(jumlah) and pd.notna(nilai):
-                    jumlah_str = str(jumlah).strip()
-                    nilai_str = str(nilai).strip()
-                    
-                    # Skip jika ini header (JUMLAH, NILAI)
-                    if jumlah_str.upper() in ['JUMLAH', 'NILAI'] or nilai_str.upper() in ['JUMLAH', 'NILAI']:
-                        return False
-                    
-                    # Cek apakah ada angka atau format currency
-                    if re.search(r'\d', jumlah_str) and re.search(r'\d', nilai_str):
-                        return True
-            
-            return False
-        except Exception as e:
-            print(f"⚠️ Warning: Error in _is_transaction_row: {e}")
-            return False
-    
-    def _is_total_row(self, row_data):
-        """Cek apakah baris berisi data total/subtotal"""
-        try:
-            if len(row_data) > 0:
-                first_cell = str(row_data.iloc[0]).strip()
-                # Cek apakah ini baris total atau subtotal
-                if 'total' in first_cell.lower() or 'subtotal' in first_cell.lower():
-                    return True
-            return False
-        except Exception as e:
-            print(f"⚠️ Warning: Error in _is_total_row: {e}")
-            return False
+    def _calculate_total_billed_values(self, tarif_values, quantity_values):
+        """
+        Total billed (tarif x quantity) banyak record sekaligus sebagai array float64.
+        
+        Kolom tarif dan quantity di-parse per kolom (numeric_parser) lalu dikalikan sekali; NaN
+        untuk record yang tarif/quantity-nya kosong atau tidak berisi angka.
+        """
+        return parse_numbers(tarif_values) * parse_numbers(quantity_values)
     
-    def _extract_total_data(self, row_data):
-        """Ekstrak data total dari baris total/subtotal"""
-        try:
-            total_data = {}
-            
-            # Cek kolom 0: Jenis biaya (Subtotal, BIAYA VISITE, dll)
-            if pd.notna(row_data.iloc[0]):
-                total_data['jenis_biaya'] = self._clean_value(row_data.iloc[0])
-            
-            # Cek kolom 7: Total nilai
-            if len(row_data) > 7 and pd.notna(row_data.iloc[7]):
-                total_data['sub_total'] = self._clean_value(row_data.iloc[7])
-            
-            print(f"    💳 Total data: {total_data}")
-            return total_data
-            
-        except Exception as e:
-            print(f"⚠️ Warning: Error extracting total data: {e}")
-            return {}
+    def _format_total_billed(self, total):
+        """Format total billed dengan pemisah ribuan, mis. 2,304,000"""
+        return f"{total:,.0f}"
     
-    def _extract_raw_data(self, df, sheet_name):
+    def _extract_raw_data(self, df, sheet_name, profile):
         """Ekstrak data dari DataFrame tanpa header yang jelas"""
+        return self._extract_raw_chunks([df], sheet_name, profile)
+    
+    def _extract_raw_chunks(self, chunks, sheet_name, profile):
+        """Ekstrak data berdasarkan posisi kolom profile dari DataFrame per chunk"""
         try:
             extracted_rows = []
             
-            # Coba ekstrak data berdasarkan posisi kolom
-            for row_idx in range(len(df)):
-                row_data = df.iloc[row_idx]
-                
-                # Skip baris yang kosong
-                if row_data.isna().all():
+            for chunk in chunks:
+                values = chunk.to_numpy(dtype=object)
+                if values.shape[1] < profile.raw_min_columns:
                     continue
                 
-                extracted_row = {}
-                
-                # Coba ekstrak berdasarkan posisi kolom
-                if len(row_data) >= 2:
-                    # Kolom 0: Jenis biaya
-                    if pd.notna(row_data.iloc[0]):
-                        extracted_row['jenis_biaya'] = self._clean_value(row_data.iloc[0])
-                    
-                    # Kolom 1: Keterangan
-                    if pd.notna(row_data.iloc[1]):
-                        extracted_row['keterangan'] = self._clean_value(row_data.iloc[1])
-                    
-                    # Kolom 4: Jumlah
-                    if len(row_data) > 4 and pd.notna(row_data.iloc[4]):
-                        extracted_row['jumlah'] = self._clean_value(row_data.iloc[4])
-                    
-                    # Kolom 5: Nilai
-                    if len(row_data) > 5 and pd.notna(row_data.iloc[5]):
-                        extracted_row['nilai'] = self._clean_value(row_data.iloc[5])
-                    
-                    # Kolom 7: Total
-                    if len(row_data) > 7 and pd.notna(row_data.iloc[7]):
-                        extracted_row['sub_total'] = self._clean_value(row_data.iloc[7])
-                
-                if extracted_row:  # Hanya tambahkan jika ada data
-                    extracted_rows.append(extracted_row)
+                # Baris kosong menghasilkan record kosong dan ikut terbuang
+                records = profile.extract(values, 'raw', np.arange(len(values)), self._clean_column)
+                extracted_rows.extend(record for record in records if record)
             
             print(f"📊 Extracted {len(extracted_rows)} records from raw data")
             return extracted_rows
@@ -850,28 +1382,56 @@ class ExcelProcessor:
             print(f"⚠️ Warning: Error extracting raw data: {e}")
             return []
     
+    def _compile_output_plan(self):
+        """
+        List (kolom output, langkah, field sumber) untuk _transform_to_output_format.
+        
+        Langkah:
+        - 'present': nilai field apa adanya jika field ada di record, selain itu default
+        - 'filled': nilai field jika tidak kosong, selain itu default
+        - 'total_billed': sub_total jika tidak kosong, selain itu tarif x quantity
+        - 'service_description': keterangan jika tidak kosong, selain itu klasifikasi service code
+        - 'service_code': klasifikasi service code
+        - 'default': nilai default kolom
+        """
+        plan = []
+        for output_col in self.output_columns:
+            source_field = self.OUTPUT_FIELD_MAPPING.get(output_col)
+            if output_col in self.OUTPUT_PRESENT_FIELD_COLUMNS:
+                step = 'present'
+            elif output_col == 'TOTAL BILLED':
+                step = 'total_billed'
+            elif output_col == 'SERVICECODE DESCRIPTION':
+                step = 'service_description'
+            elif output_col == 'SERVICECODE':
+                step = 'service_code'
+            elif source_field:
+                step = 'filled'
+            else:
+                step = 'default'
+            plan.append((output_col, step, source_field))
+        return plan
+    
     def _transform_to_output_format(self, extracted_data, analysis):
-        """Transform data yang diekstrak ke format output yang diinginkan"""
+        """Transform data yang diekstrak ke format output (per kolom, mengikuti output_plan)"""
         try:
-            output_rows = []
-            
             print(f"🔄 Transforming {len(extracted_data)} extracted records to output format")
             
-            for idx, data_row in enumerate(extracted_data):
-                output_row = {}
-                
-                # Map field yang diekstrak ke kolom output
-                for output_col in self.output_columns:
-                    mapped_value = self._map_extracted_field_to_output(output_col, data_row, analysis)
-                    output_row[output_col] = mapped_value
-                
-                output_rows.append(output_row)
+            if not extracted_data:
+                output_df = pd.DataFrame([])
+            else:
+                column_cache = {}
+                output_data = {}
+                for output_col, step, source_field in self.output_plan:
+                    output_data[output_col] = self._build_output_column(
+                        output_col, step, source_field, extracted_data, column_cache
+                    )
+                output_df = pd.DataFrame(output_data)
                 
                 # Debug: print first few rows
-                if idx < 3:
-                    print(f"  📋 Row {idx}: {list(output_row.values())[:5]}...")
+                for idx, values in enumerate(output_df.iloc[:3, :5].to_numpy(dtype=object).tolist()):
+                    print(f"  📋 Row {idx}: {values}...")
             
-            output_df = pd.DataFrame(output_rows)
             print(f"✅ Transformed to DataFrame with shape: {output_df.shape}")
             
             # Apply forward fill untuk kolom-kolom yang diminta
@@ -886,154 +1446,102 @@ class ExcelProcessor:
             # Return empty DataFrame as fallback
             return pd.DataFrame(columns=self.output_columns)
     
-    def _map_extracted_field_to_output(self, output_col, data_row, analysis):
-        """Map field yang diekstrak ke kolom output"""
-        try:
-            # Mapping berdasarkan field yang diekstrak
-            field_mapping = {
-                'CLIENT NAME': 'nama_pasien',
-                'CLIENTS INVOICE NUMBER': 'nomor_tagihan',
-                'CLIENTSREGISTER NUMBER': 'nomor_registrasi',
-                'admission': 'tanggal_registrasi',
-                'discharge': 'tanggal_keluar',
-                'KELAS': 'kelas_kamar',
-                'TARIFF': 'nilai',
-                'QUANTITY': 'jumlah',
-                'TOTAL BILLED': 'sub_total',
-                'SERVICECODE DESCRIPTION': 'keterangan',
-                'GIVEN DATE (month, day, year)': 'tanggal'
-            }
-            
-            if output_col in field_mapping:
-                source_field = field_mapping[output_col]
-                if source_field in data_row:
-                    value = data_row[source_field]
-                    if pd.notna(value) and value != '':
-                        return value
-            
-            # Mapping tambahan untuk field yang spesifik
-            if output_col == 'CLIENT NAME' and 'nama_pasien' in data_row:
-                return data_row['nama_pasien']
-            elif output_col == 'CLIENTS INVOICE NUMBER' and 'nomor_tagihan' in data_row:
-                return data_row['nomor_tagihan']
-            elif output_col == 'CLIENTSREGISTER NUMBER' and 'nomor_registrasi' in data_row:
-                return data_row['nomor_registrasi']
-            elif output_col == 'KELAS' and 'kelas_kamar' in data_row:
-                return data_row['kelas_kamar']
-            elif output_col == 'TARIFF' and 'nilai' in data_row:
-                return data_row['nilai']
-            elif output_col == 'QUANTITY' and 'jumlah' in data_row:
-                return data_row['jumlah']
-            elif output_col == 'TOTAL BILLED':
-                # Hitung total billed dari tarif dikali quantity
-                calculated_total = self._calculate_total_billed(data_row)
-                if calculated_total:
-                    return calculated_total
-                # Fallback ke sub_total jika ada
-                elif 'sub_total' in data_row:
-                    return data_row['sub_total']
-            elif output_col == 'SERVICECODE DESCRIPTION':
-                # Apply service code classification logic
-                return self._classify_service_code(data_row)
-            elif output_col == 'TARIFF DESCRIPTION':
-                # Return empty for tariff description
-                return ''
-            elif output_col == 'SERVICECODE':
-                # Apply service code classification logic for service code
-                return self._classify_service_code_value(data_row)
-            
-            # Default values
-            return self._get_default_value(output_col, data_row, None)
-            
-        except Exception as e:
-            print(f"⚠️ Warning: Error mapping field {output_col}: {e}")
-            return self._get_default_value(output_col, data_row, None)
+    def _build_output_column(self, output_col, step, source_field, extracted_data, column_cache):
+        """List nilai satu kolom output untuk semua record; column_cache memo kolom sumber yang dipakai bersama"""
+        default_value = self._get_default_value(output_col, None, None)
+        if step == 'default':
+            return [default_value] * len(extracted_data)
+        if step == 'present':
+            return [data_row.get(source_field, default_value) for data_row in extracted_data]
+        if step == 'service_code':
+            return list(self._service_code_column(extracted_data, column_cache))
+        
+        values, filled = self._field_column(source_field, extracted_data, column_cache)
+        if step == 'filled':
+            return [value if is_filled else default_value for value, is_filled in zip(values, filled)]
+        
+        column = list(values)
+        if step == 'service_description':
+            # Keterangan kosong diisi klasifikasi yang sama dengan kolom SERVICECODE
+            service_codes = self._service_code_column(extracted_data, column_cache)
+            for position in np.flatnonzero(~filled):
+                column[position] = service_codes[position]
+            return column
+        
+        # Record dengan sub_total kosong: tarif x quantity (angka, diformat saat file output ditulis)
+        positions = np.flatnonzero(~filled)
+        totals = (
+            self._numeric_field_column('nilai', extracted_data, column_cache)[positions]
+            * self._numeric_field_column('jumlah', extracted_data, column_cache)[positions]
+        )
+        for position, total in zip(positions.tolist(), totals.tolist()):
+            if total == total:
+                column[position] = total
+            elif source_field not in extracted_data[position]:
+                column[position] = default_value
+        return column
+    
+    def _field_column(self, field, extracted_data, column_cache):
+        """(nilai field per record (None jika tidak ada), mask nilai tidak kosong), dihitung sekali per field"""
+        if field not in column_cache:
+            values = pd.Series([data_row.get(field) for data_row in extracted_data], dtype=object)
+            filled = (values.notna() & (values != '')).to_numpy(dtype=bool)
+            column_cache[field] = (values.tolist(), filled)
+        return column_cache[field]
+    
+    def _numeric_field_column(self, field, extracted_data, column_cache):
+        """Nilai angka field per record (array float64), di-parse sekali per transform dan dipakai bersama"""
+        key = ('numeric', field)
+        if key not in column_cache:
+            values, _ = self._field_column(field, extracted_data, column_cache)
+            column_cache[key] = parse_numbers(values)
+        return column_cache[key]
+    
+    def _service_code_column(self, extracted_data, column_cache):
+        """Label service code per record, diklasifikasi sekali untuk SERVICECODE dan SERVICECODE DESCRIPTION"""
+        key = ('service_code',)
+        if key not in column_cache:
+            try:
+                column_cache[key] = self._classify_service_codes(extracted_data)
+            except Exception as e:
+                print(f"⚠️ Warning: Error in service code classification: {e}")
+                column_cache[key] = [''] * len(extracted_data)
+        return column_cache[key]
     
     def _classify_service_code(self, data_row):
-        """Klasifikasi service code description berdasarkan jenis_biaya"""
+        """Klasifikasi service code satu record berdasarkan jenis_biaya + keterangan"""
         try:
-            # Ambil jenis_biaya dari data row
-            jenis_biaya = data_row.get('jenis_biaya', '')
-            keterangan = data_row.get('keterangan', '')
-            
-            # Gabungkan jenis_biaya dan keterangan untuk analisis
-            combined_text = f"{jenis_biaya} {keterangan}".lower()
-            
-            # Keywords untuk Alkes/Peralatan
-            alkes_keywords = [
-                'peralatan', 'alkes', 'alat', 'equipment', 'medical device',
-                'medical equipment', 'device', 'instrumen', 'instrument',
-                'pump', 'syringe', 'infus', 'oksigen', 'oxygen', 'catheter',
-                'canul', 'tubee', 'extension', 'threeway', 'combopack',
-                'spuit', 'syringe', 'kertas usg', 'pd gel', 'kasa'
-            ]
-            
-            # Keywords untuk Obat
-            obat_keywords = [
-                'obat', 'medicine', 'drug', 'medication', 'farmasi', 'pharmacy',
-                'tablet', 'kapsul', 'sirup', 'injeksi', 'injection', 'tab',
-                'mg', 'ml', 'cc', 'nifedipin', 'candesartan', 'furosemide',
-                'isosorbide', 'betadine', 'alcohol', 'aquabidest', 'new diatabs'
-            ]
-            
-            # Cek apakah mengandung keywords Alkes
-            if any(keyword in combined_text for keyword in alkes_keywords):
-                return 'Alkes'
-            
-            # Cek apakah mengandung keywords Obat
-            elif any(keyword in combined_text for keyword in obat_keywords):
-                return 'Obat'
-            
-            # Jika tidak ada keywords yang cocok, return kosong
-            else:
-                return ''
-                
+            return self._classify_service_codes([data_row])[0]
         except Exception as e:
             print(f"⚠️ Warning: Error in service code classification: {e}")
             return ''
     
-    def _classify_service_code_value(self, data_row):
-        """Klasifikasi service code value berdasarkan jenis_biaya"""
-        try:
-            # Ambil jenis_biaya dari data row
-            jenis_biaya = data_row.get('jenis_biaya', '')
-            keterangan = data_row.get('keterangan', '')
-            
-            # Gabungkan jenis_biaya dan keterangan untuk analisis
-            combined_text = f"{jenis_biaya} {keterangan}".lower()
-            
-            # Keywords untuk Alkes/Peralatan
-            alkes_keywords = [
-                'peralatan', 'alkes', 'alat', 'equipment', 'medical device',
-                'medical equipment', 'device', 'instrumen', 'instrument',
-                'pump', 'syringe', 'infus', 'oksigen', 'oxygen', 'catheter',
-                'canul', 'tubee', 'extension', 'threeway', 'combopack',
-                'spuit', 'syringe', 'kertas usg', 'pd gel', 'kasa'
-            ]
-            
-            # Keywords untuk Obat
-            obat_keywords = [
-                'obat', 'medicine', 'drug', 'medication', 'farmasi', 'pharmacy',
-                'tablet', 'kapsul', 'sirup', 'injeksi', 'injection', 'tab',
-                'mg', 'ml', 'cc', 'nifedipin', 'candesartan', 'furosemide',
-                'isosorbide', 'betadine', 'alcohol', 'aquabidest', 'new diatabs'
-            ]
-            
-            # Cek apakah mengandung keywords Alkes
-            if any(keyword in combined_text for keyword in alkes_keywords):
-                return 'Alkes'
-            
-            # Cek apakah mengandung keywords Obat
-            elif any(keyword in combined_text for keyword in obat_keywords):
-                return 'Obat'
-            
-            # Jika tidak ada keywords yang cocok, return kosong
-            else:
-                return ''
-                
-        except Exception as e:
-            print(f"⚠️ Warning: Error in service code value classification: {e}")
-            return ''
+    def _classify_service_codes(self, data_rows):
+        """
+        Klasifikasi service code banyak record sekaligus (list label, '' jika tidak ada keyword yang cocok).
+        
+        Tagihan mengulang nama item yang sama ribuan kali, jadi hanya teks jenis_biaya + keterangan
+        yang unik yang dicocokkan, dalam satu batch (_service_code_matcher). Keyword yang lebih dulu di aturan menang.
+        """
+        texts = [
+            f"{data_row.get('jenis_biaya', '')} {data_row.get('keterangan', '')}".lower()
+            for data_row in data_rows
+        ]
+        unique_texts = list(dict.fromkeys(texts))
+        matcher = self._service_code_matcher()
+        labels = dict(zip(unique_texts, matcher.first_labels(unique_texts, SERVICE_CODE_GROUP)))
+        return [labels[text] or '' for text in texts]
+    
+    def _service_code_matcher(self):
+        """Matcher service code: file aturan Config.SERVICE_RULES_FILE, selain itu fallback minimal bawaan"""
+        rules_file = Config.SERVICE_RULES_FILE
+        if rules_file:
+            try:
+                # Dikompilasi sekali per versi file dan dipakai bersama, tidak ikut di-pickle ke worker
+                return load_service_matcher(rules_file)
+            except Exception as e:
+                print(f"⚠️ Warning: Service rules {rules_file} tidak bisa dimuat, memakai fallback minimal: {str(e)}")
+        return self.keyword_matcher
     
     def _clean_value(self, value):
         """Membersihkan dan memformat nilai data"""
@@ -1042,7 +1550,7 @@ class ExcelProcessor:
         
         # Handle infinity dan NaN
         if isinstance(value, float):
-            if pd.isinf(value) or pd.isna(value):
+            if np.isinf(value) or pd.isna(value):
                 return ''
             if value.is_integer():
                 return str(int(value))
@@ -1058,12 +1566,11 @@ class ExcelProcessor:
             cleaned = value.strip()
             cleaned = cleaned.replace('\x00', '').replace('\n', ' ').replace('\r', '')
             
-            # Handle format currency
+            # Handle format currency: "Rp 1.250.000,50" → "1.250.000,50" (di-parse saat perhitungan)
             if 'Rp' in cleaned:
-                # Ekstrak angka dari format "Rp 75,000"
-                numbers = re.findall(r'[\d,]+', cleaned)
-                if numbers:
-                    return numbers[0]
+                amount = amount_text(cleaned)
+                if amount:
+                    return amount
             
             return cleaned
         
@@ -1074,6 +1581,44 @@ class ExcelProcessor:
         except:
             return ''
     
+    def _clean_column(self, column):
+        """
+        _clean_value untuk seluruh kolom (list string, hasil identik per cell).
+        
+        Kolom numerik dibersihkan dengan operasi numpy; kolom lain memakai _clean_value
+        dengan memo per (tipe, nilai) sehingga nilai yang berulang cukup dibersihkan sekali.
+        """
+        values = column.to_numpy()
+        if values.dtype.kind in 'iu':
+            return values.astype(str).tolist()
+        if values.dtype.kind == 'b':
+            return np.where(values, 'True', 'False').tolist()
+        if values.dtype.kind == 'f':
+            cleaned = np.full(len(values), '', dtype=object)
+            finite = np.isfinite(values)
+            # Bilangan bulat ditulis tanpa '.0'; batas 2**53 menjaga konversi int64 tetap exact
+            integral = finite.copy()
+            integral[finite] = (np.mod(values[finite], 1) == 0) & (np.abs(values[finite]) < 2 ** 53)
+            cleaned[integral] = values[integral].astype(np.int64).astype(str)
+            other = finite & ~integral
+            cleaned[other] = [str(int(value)) if value.is_integer() else str(value) for value in values[other].tolist()]
+            return cleaned.tolist()
+        
+        cleaned_values = {}
+        cleaned = []
+        # astype(object) pandas: datetime menjadi Timestamp (bukan integer nanodetik)
+        for value in column.astype(object):
+            try:
+                key = (type(value), value)
+                cleaned_value = cleaned_values.get(key)
+                if cleaned_value is None:
+                    cleaned_value = cleaned_values[key] = self._clean_value(value)
+            except TypeError:
+                # Nilai yang tidak hashable
+                cleaned_value = self._clean_value(value)
+            cleaned.append(cleaned_value)
+        return cleaned
+    
     def _apply_forward_fill(self, df):
         """Apply forward fill untuk kolom-kolom yang diminta"""
         try:
@@ -1151,21 +1696,35 @@ class ExcelProcessor:
         else:
             return ''
     
-    def _create_output_file(self, df, input_filepath):
+    def _format_output_values(self, df):
+        """Total billed hasil perhitungan (angka) diformat sebagai teks saat file output ditulis"""
+        if 'TOTAL BILLED' not in df.columns or len(df) == 0:
+            return df
+        column = df['TOTAL BILLED'].astype(object)
+        calculated = column.map(lambda value: isinstance(value, float) and value == value).to_numpy(dtype=bool)
+        if not calculated.any():
+            return df
+        column[calculated] = [self._format_total_billed(total) for total in column[calculated]]
+        df = df.copy()
+        df['TOTAL BILLED'] = column
+        return df
+    
+    def _create_output_file(self, df, input_filepath, output_dir='outputs', output_filename=None):
         """Membuat file Excel output"""
         try:
             # Buat nama file output
-            input_filename = os.path.basename(input_filepath)
-            name_without_ext = os.path.splitext(input_filename)[0]
-            timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-            output_filename = f"processed_{name_without_ext}_{timestamp}.xlsx"
+            if output_filename is None:
+                input_filename = os.path.basename(input_filepath)
+                name_without_ext = os.path.splitext(input_filename)[0]
+                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
+                output_filename = f"processed_{name_without_ext}_{timestamp}.xlsx"
             
             # Buat direktori output jika belum ada
-            output_dir = 'outputs'
             if not os.path.exists(output_dir):
                 os.makedirs(output_dir)
             
             output_filepath = os.path.join(output_dir, output_filename)
+            df = self._format_output_values(df)
             
             # Tulis ke file Excel
             with pd.ExcelWriter(output_filepath, engine='openpyxl') as writer:
@@ -1247,18 +1806,24 @@ class ExcelProcessor:
                 'total_columns': len(df.columns),
                 'column_info': {},
                 'data_patterns': {},
-                'sample_values': {}
+                'sample_values': {},
+                'suggested_mapping': {}
             }
             
             for col in df.columns:
                 col_data = df[col].dropna()
                 
+                # Saran kolom output berdasarkan nama kolom (Config.COLUMN_MAPPING_RULES)
+                suggested_column = self.keyword_matcher.first_label(str(col).lower(), 'output_column')
+                if suggested_column:
+                    analysis['suggested_mapping'][col] = suggested_column
+                
                 # Informasi kolom
                 analysis['column_info'][col] = {
                     'data_type': str(df[col].dtype),
                     'non_null_count': len(col_data),
                     'null_count': df[col].isna().sum(),
-                    'unique_values': col_data.nunique()
+                    'unique_values': self._count_unique_values(col_data)[0]
                 }
                 
                 # Sample values
@@ -0,0 +1,89 @@
+"""
+Serialisasi JSON untuk hasil analisis (numpy scalar, NaN/inf, timestamp)
+"""
+
+import json
+import math
+from datetime import date, datetime, time
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:
+    # orjson opsional; tanpa orjson dipakai encoder C json bawaan
+    orjson = None
+
+
+def to_json_value(value):
+    """
+    Konversi nilai yang tidak dikenal encoder JSON: numpy scalar/array, NaN/inf (→ null),
+    timestamp/tanggal (→ ISO 8601), set/tuple. TypeError untuk tipe lain.
+    """
+    if isinstance(value, np.bool_):
+        return bool(value)
+    if isinstance(value, np.integer):
+        return int(value)
+    if isinstance(value, np.floating):
+        value = float(value)
+        return value if math.isfinite(value) else None
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if value is pd.NaT or value is pd.NA:
+        return None
+    if isinstance(value, (pd.Timestamp, datetime, date, time)):
+        return value.isoformat()
+    if isinstance(value, np.datetime64):
+        return None if np.isnat(value) else pd.Timestamp(value).isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+# Tipe yang di-encode apa adanya dan tidak pernah berisi NaN/inf
+_PLAIN_TYPES = frozenset([str, int, bool, type(None)])
+
+
+def _replace_non_finite(value):
+    """Salinan struktur dengan float NaN/inf (termasuk di numpy array/scalar) diganti None"""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _replace_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple, set, frozenset)):
+        # List panjang berisi int/str (mis. data_rows) tidak perlu disalin per item
+        if isinstance(value, list) and all(type(item) in _PLAIN_TYPES for item in value):
+            return value
+        return [_replace_non_finite(item) for item in value]
+    if isinstance(value, (np.ndarray, np.floating)):
+        return _replace_non_finite(to_json_value(value))
+    return value
+
+
+def _dumps_stdlib(obj, sort_keys):
+    """
+    Encoder C json bawaan dengan to_json_value sebagai default.
+
+    Encoder bawaan menulis NaN/inf apa adanya, jadi dicoba dulu dengan allow_nan=False;
+    hanya jika ada nilai non-finite struktur disalin dengan NaN/inf → None lalu di-encode ulang.
+    """
+    options = {'default': to_json_value, 'sort_keys': sort_keys, 'separators': (',', ':')}
+    try:
+        return json.dumps(obj, allow_nan=False, **options)
+    except ValueError:
+        return json.dumps(_replace_non_finite(obj), **options)
+
+
+def dumps(obj, sort_keys=False):
+    """Serialisasi obj ke string JSON (orjson jika terpasang, selain itu encoder C json bawaan)"""
+    if orjson is not None:
+        options = orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS
+        if sort_keys:
+            options |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(obj, default=to_json_value, option=options).decode('utf-8')
+        except TypeError:
+            # Mis. integer di luar 64-bit; encoder bawaan tetap bisa menanganinya
+            pass
+    return _dumps_stdlib(obj, sort_keys)
@@ -0,0 +1,268 @@
+"""
+Matcher multi-keyword (Aho-Corasick) untuk semua pencarian keyword substring
+"""
+
+from collections import deque
+
+import numpy as np
+
+_NO_MATCH = np.iinfo(np.int32).max
+
+
+class KeywordMatcher:
+    """
+    Automaton Aho-Corasick yang dibangun sekali dari beberapa grup keyword.
+
+    Setiap grup berisi list (label, keyword) dengan urutan prioritas: keyword
+    yang ditambahkan lebih dulu menang. Trie + failure link dikompilasi menjadi
+    satu tabel transisi DFA numpy int32 (state x kelas karakter), sehingga satu scan teks menemukan keyword dari
+    semua grup dengan biaya sebanding panjang teks, bukan jumlah keyword.
+    Banyak teks pendek (cell, baris transaksi) di-scan bersamaan dengan numpy.
+    Keyword dan teks harus sudah lower-case.
+    """
+
+    # Teks lebih panjang dari ini di-scan satu per satu (menghindari matrix padding yang besar)
+    MAX_BATCH_TEXT_LENGTH = 256
+    BATCH_SIZE = 4096
+
+    def __init__(self, groups=None):
+        self._keywords = []  # (group, label); index = prioritas global
+        self._group_names = []
+        self._entries = []  # (group_index, keyword)
+        for group, entries in (groups or {}).items():
+            self._add_entries(group, entries)
+        self._compile()
+
+    def _add_entries(self, group, entries):
+        if group not in self._group_names:
+            self._group_names.append(group)
+        group_index = self._group_names.index(group)
+        for label, keyword in entries:
+            if keyword:
+                self._keywords.append((group, label))
+                self._entries.append((group_index, keyword))
+
+    def _compile(self):
+        """
+        Bangun trie per kedalaman, lalu tabel DFA (numpy int32) dan keyword terbaik per state per grup.
+
+        State diberi nomor urut kedalaman (semua prefix dengan panjang d sebelum d + 1), sehingga
+        failure link dan baris DFA bisa dihitung per level dengan operasi numpy: baris state
+        adalah salinan baris state failure-nya (lebih dangkal, sudah lengkap) ditambah edge trie-nya.
+        """
+        alphabet = sorted({ch for _, keyword in self._entries for ch in keyword})
+        # Kelas 0 = karakter yang tidak ada di keyword mana pun
+        self._char_class = {ch: index + 1 for index, ch in enumerate(alphabet)}
+        class_count = len(alphabet) + 1
+        group_count = len(self._group_names)
+
+        # Trie: state prefix per keyword di setiap kedalaman; keyword terpanjang di depan
+        order = sorted(range(len(self._entries)), key=lambda keyword_id: -len(self._entries[keyword_id][1]))
+        keywords = [self._entries[keyword_id][1] for keyword_id in order]
+        order = np.array(order, dtype=np.int64)
+        group_of = np.array([self._entries[keyword_id][0] for keyword_id in order.tolist()], dtype=np.int64)
+        lengths = np.array([len(keyword) for keyword in keywords], dtype=np.int64)
+
+        level_starts = [0, 1]
+        edges = []  # per kedalaman: (state induk, kelas, state anak)
+        terminals = []  # (state, grup, keyword id)
+        states = np.zeros(len(keywords), dtype=np.int64)
+        state_count = 1
+        for depth in range(int(lengths.max()) if len(lengths) else 0):
+            active = int(np.count_nonzero(lengths > depth))
+            classes = np.array([self._char_class[keyword[depth]] for keyword in keywords[:active]], dtype=np.int64)
+            pairs, inverse = np.unique(states[:active] * class_count + classes, return_inverse=True)
+            children = np.arange(state_count, state_count + len(pairs), dtype=np.int64)
+            edges.append((pairs // class_count, pairs % class_count, children))
+            states = children[inverse]
+            ending = np.flatnonzero(lengths[:active] == depth + 1)
+            terminals.append((states[ending], group_of[ending], order[ending]))
+            state_count += len(pairs)
+            level_starts.append(state_count)
+
+        best = np.full((state_count, group_count), _NO_MATCH, dtype=np.int32)
+        for terminal_states, terminal_groups, keyword_ids in terminals:
+            np.minimum.at(best, (terminal_states, terminal_groups), keyword_ids.astype(np.int32))
+
+        delta = np.zeros((state_count, class_count), dtype=np.int32)
+        fail = np.zeros(state_count, dtype=np.int64)
+        for depth, (parents, classes, children) in enumerate(edges):
+            level = slice(level_starts[depth], level_starts[depth + 1])
+            if depth > 0:
+                # Output state fallback ikut berlaku (keyword yang merupakan suffix)
+                delta[level] = delta[fail[level]]
+                np.minimum(best[level], best[fail[level]], out=best[level])
+            # Failure link anak dari baris DFA failure induk (dihitung sebelum edge root ditulis)
+            fail[children] = delta[fail[parents], classes]
+            delta[parents, classes] = children
+        if edges:
+            # Level terdalam (daun) belum punya edge sendiri
+            level = slice(level_starts[-2], level_starts[-1])
+            delta[level] = delta[fail[level]]
+            np.minimum(best[level], best[fail[level]], out=best[level])
+
+        self._delta = delta
+        self._best = best
+        self._class_count = class_count
+        self._build_views()
+
+        max_code = max((ord(ch) for ch in alphabet), default=0)
+        self._class_lookup = np.zeros(max_code + 2, dtype=np.int32)  # slot terakhir = kelas 0
+        for ch, char_class in self._char_class.items():
+            self._class_lookup[ord(ch)] = char_class
+
+    def _build_views(self):
+        """memoryview atas tabel numpy untuk scan per karakter (indexing lebih cepat dari numpy scalar, tanpa salinan)"""
+        self._delta_flat = memoryview(self._delta.reshape(-1))
+        self._best_by_group = [
+            memoryview(np.ascontiguousarray(self._best[:, group_index])) for group_index in range(self._best.shape[1])
+        ]
+
+    def __getstate__(self):
+        # memoryview tidak bisa di-pickle; dibangun ulang dari tabel numpy
+        state = self.__dict__.copy()
+        del state['_delta_flat'], state['_best_by_group']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._build_views()
+
+    def _group_index(self, group):
+        return self._group_names.index(group)
+
+    def _scan_best(self, text, group_index):
+        """Keyword id terbaik (prioritas tertinggi) dari satu grup untuk satu teks"""
+        return self._advance(text, 0, _NO_MATCH, self._best_by_group[group_index])[1]
+
+    def _advance(self, text, state, found, group_best):
+        """Jalankan DFA atas teks mulai dari state; kembalikan (state akhir, keyword id terbaik)"""
+        delta = self._delta_flat
+        class_count = self._class_count
+        char_class = self._char_class
+        for ch in text:
+            state = delta[state * class_count + char_class.get(ch, 0)]
+            if group_best[state] < found:
+                found = group_best[state]
+        return state, found
+
+    def _scan_best_batch(self, texts, group_indices):
+        """Seperti _scan_best untuk banyak teks pendek sekaligus: semua teks maju satu karakter per langkah"""
+        codes = np.array(texts, dtype=str)
+        width = codes.dtype.itemsize // 4
+        found = np.full((len(texts), len(group_indices)), _NO_MATCH, dtype=np.int32)
+        if width == 0:
+            return found
+
+        codes = codes.view(np.uint32).reshape(len(texts), width)
+        classes = self._class_lookup[np.minimum(codes, len(self._class_lookup) - 1)]
+        group_best = self._best[:, group_indices]
+        states = np.zeros(len(texts), dtype=np.int32)
+        for position in range(width):
+            # Padding (code 0) termasuk kelas 0 dan tidak pernah menghasilkan match
+            states = self._delta[states, classes[:, position]]
+            np.minimum(found, group_best[states], out=found)
+        return found
+
+    def best_matches(self, texts, groups):
+        """
+        Keyword id terbaik per teks untuk setiap grup: dict {group: numpy int array}, -1 jika tidak ada match.
+        """
+        group_indices = [self._group_index(group) for group in groups]
+        found = np.full((len(texts), len(group_indices)), _NO_MATCH, dtype=np.int32)
+
+        lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+        long_positions = np.flatnonzero(lengths > self.MAX_BATCH_TEXT_LENGTH)
+        for position in long_positions:
+            found[position] = [self._scan_best(texts[position], group_index) for group_index in group_indices]
+
+        # Urutkan berdasarkan panjang supaya padding per batch minimal
+        short_positions = np.flatnonzero(lengths <= self.MAX_BATCH_TEXT_LENGTH)
+        short_positions = short_positions[np.argsort(lengths[short_positions], kind='stable')]
+        for start in range(0, len(short_positions), self.BATCH_SIZE):
+            batch = short_positions[start:start + self.BATCH_SIZE]
+            found[batch] = self._scan_best_batch([texts[position] for position in batch], group_indices)
+
+        found[found == _NO_MATCH] = -1
+        return {group: found[:, column] for column, group in enumerate(groups)}
+
+    def first_label(self, text, group):
+        """Label keyword berprioritas tertinggi dari grup yang muncul di teks (None jika tidak ada)"""
+        keyword_id = self._scan_best(text, self._group_index(group))
+        return None if keyword_id == _NO_MATCH else self._keywords[keyword_id][1]
+
+    def first_labels(self, texts, group):
+        """first_label untuk banyak teks sekaligus (list label, None jika tidak ada)"""
+        keyword_ids = self.best_matches(texts, [group])[group]
+        return [None if keyword_id < 0 else self._keywords[keyword_id][1] for keyword_id in keyword_ids]
+
+    def stream(self, group, separator=' '):
+        """
+        Scanner bertahap untuk first_label atas banyak teks yang digabung dengan separator,
+        tanpa pernah membuat string gabungannya (memori tetap kecil untuk kolom besar).
+        """
+        return KeywordStream(self, self._group_index(group), separator)
+
+    def contains_any(self, text, group):
+        """True jika salah satu keyword grup muncul di teks"""
+        return self.first_label(text, group) is not None
+
+    def match_cells(self, cells, groups):
+        """Cek banyak cell sekaligus: dict {group: numpy bool array per cell}"""
+        return {group: keyword_ids >= 0 for group, keyword_ids in self.best_matches(cells, groups).items()}
+
+    def __len__(self):
+        return len(self._keywords)
+
+
+class KeywordStream:
+    """State scan KeywordMatcher.stream(); panggil feed() per teks lalu baca label"""
+
+    MAX_MEMO_ENTRIES = 65536
+
+    def __init__(self, matcher, group_index, separator):
+        self._matcher = matcher
+        self._group_best = matcher._best_by_group[group_index]
+        self._separator = separator
+        self._state = 0
+        self._found = _NO_MATCH
+        self._started = False
+        self._memo = {}
+
+        # Keyword id dengan label prioritas tertinggi grup (prefix berurutan); cukup berhenti di sini
+        group_ids = [keyword_id for keyword_id, (group_name, _) in enumerate(matcher._keywords)
+                     if group_name == matcher._group_names[group_index]]
+        self._top_id = -1
+        for keyword_id in group_ids:
+            if matcher._keywords[keyword_id][1] != matcher._keywords[group_ids[0]][1]:
+                break
+            self._top_id = keyword_id
+
+    @property
+    def done(self):
+        """True jika label prioritas tertinggi sudah ditemukan (teks berikutnya tidak mengubah hasil)"""
+        return self._found <= self._top_id
+
+    @property
+    def label(self):
+        return None if self._found == _NO_MATCH else self._matcher._keywords[self._found][1]
+
+    def feed(self, text, lower=False):
+        """Scan teks berikutnya (lower=True: teks di-lower-case dulu)"""
+        if not self._started:
+            self._started = True
+            text = text.lower() if lower else text
+            self._state, self._found = self._matcher._advance(text, self._state, self._found, self._group_best)
+            return
+
+        # Nilai cell sering berulang: simpan hasil transisi (state awal, teks) → (state akhir, match terbaik)
+        memo_key = (self._state, text)
+        cached = self._memo.get(memo_key)
+        if cached is None:
+            scan_text = self._separator + (text.lower() if lower else text)
+            cached = self._matcher._advance(scan_text, self._state, _NO_MATCH, self._group_best)
+            if len(self._memo) < self.MAX_MEMO_ENTRIES:
+                self._memo[memo_key] = cached
+        self._state = cached[0]
+        if cached[1] < self._found:
+            self._found = cached[1]
@@ -0,0 +1,184 @@
+"""
+Layout profile posisi kolom tagihan (Config.LAYOUT_PROFILES) yang dikompilasi menjadi extractor vektor
+"""
+
+import numpy as np
+import pandas as pd
+
+# Label baris (bitflag int8) hasil LayoutProfile.row_labels(); 0 = baris kosong
+ROW_FILLED = 1  # Ada cell yang terisi
+ROW_KEY_VALUE = 2  # Berisi pasangan key-value yang dikenal
+ROW_HEADER = 4  # Kolom transaksi berisi label (JUMLAH, NILAI), bukan angka
+ROW_TRANSACTION = 8
+ROW_TOTAL = 16
+# Baris yang mengubah state record saat ekstraksi key-value
+ROW_RECORD_FLAGS = ROW_KEY_VALUE | ROW_TRANSACTION | ROW_TOTAL
+
+
+def _text_column(column):
+    """str() setiap cell kolom object sebagai Series (NaN ikut menjadi 'nan', sama seperti str())"""
+    return pd.Series(column, dtype=object).map(str)
+
+
+def _typed_column(cells):
+    """
+    Series dari cell kolom object dengan dtype numpy asli jika semua cell sejenis
+    (int/float/bool), supaya pembersih kolom bisa memakai jalur numerik.
+    Campuran int dan float tetap object: konversi ke float64 bisa mengubah int besar.
+    """
+    column = pd.Series(cells, dtype=object)
+    if pd.api.types.infer_dtype(column, skipna=False) in ('integer', 'floating', 'boolean'):
+        return column.infer_objects()
+    return column
+
+
+def _contains_digit(column):
+    """Mask cell yang terisi dan teksnya mengandung angka"""
+    present = np.asarray(pd.notna(column), dtype=bool)
+    result = np.zeros(len(column), dtype=bool)
+    if present.any():
+        result[present] = _text_column(column[present]).str.contains(r'\d', regex=True).to_numpy(dtype=bool)
+    return result
+
+
+class LayoutProfile:
+    """
+    Posisi kolom (0-based) satu format tagihan, dikompilasi dari spec dict di config.
+
+    Semua operasi bekerja pada ndarray object 2D (DataFrame.to_numpy(dtype=object))
+    per blok baris: kolom yang dideklarasikan di-slice sekaligus, bukan dibaca cell
+    demi cell dari setiap baris.
+    """
+
+    SECTIONS = {
+        'transaction': 'transaction_columns',
+        'total': 'total_columns',
+        'raw': 'raw_columns'
+    }
+
+    def __init__(self, name, spec):
+        self.name = name
+        self.key_value_pairs = [tuple(pair) for pair in spec.get('key_value_columns', [])]
+        self.transaction_required = list(spec.get('transaction_required', []))
+        self.total_label_column = spec.get('total_label_column', 0)
+        self.raw_min_columns = spec.get('raw_min_columns', 1)
+        self.sections = {
+            section: dict(spec.get(key, {})) for section, key in self.SECTIONS.items()
+        }
+        self._validate()
+
+        transaction_columns = self.sections['transaction']
+        self._required_columns = [transaction_columns[field] for field in self.transaction_required]
+
+    def _validate(self):
+        positions = [self.total_label_column, self.raw_min_columns]
+        positions.extend(column for pair in self.key_value_pairs for column in pair)
+        positions.extend(column for columns in self.sections.values() for column in columns.values())
+        if any(not isinstance(position, int) or position < 0 for position in positions):
+            raise Exception(f"Layout profile '{self.name}': posisi kolom harus integer >= 0")
+        if any(len(pair) != 2 for pair in self.key_value_pairs):
+            raise Exception(f"Layout profile '{self.name}': key_value_columns harus berisi pasangan (key, value)")
+        if not self.transaction_required:
+            raise Exception(f"Layout profile '{self.name}': transaction_required tidak boleh kosong")
+        missing = [field for field in self.transaction_required if field not in self.sections['transaction']]
+        if missing:
+            raise Exception(f"Layout profile '{self.name}': field {missing} tidak ada di transaction_columns")
+
+    @property
+    def transaction_fields(self):
+        return list(self.sections['transaction'])
+
+    def key_value_columns(self, values):
+        """(kolom key, kolom value) untuk setiap pasangan yang muat di lebar blok"""
+        width = values.shape[1]
+        return [
+            (values[:, key_column], values[:, value_column])
+            for key_column, value_column in self.key_value_pairs
+            if value_column < width and key_column < width
+        ]
+
+    def row_labels(self, values, key_value_positions=()):
+        """
+        Label bitflag (int8) setiap baris blok, dihitung dengan mask per kolom.
+
+        Mask transaksi, header dan total hanya dihitung untuk baris yang terisi;
+        key_value_positions adalah posisi baris dengan pasangan key-value yang dikenal.
+        """
+        labels = np.zeros(len(values), dtype=np.int8)
+        if len(values) == 0 or values.shape[1] == 0:
+            return labels
+
+        filled_positions = np.flatnonzero(pd.notna(values).any(axis=1))
+        labels[filled_positions] = ROW_FILLED
+        filled_values = values[filled_positions]
+
+        transaction, header = self._transaction_masks(filled_values)
+        total = self.total_mask(filled_values) & ~transaction
+        labels[filled_positions[transaction]] |= ROW_TRANSACTION
+        labels[filled_positions[header]] |= ROW_HEADER
+        labels[filled_positions[total]] |= ROW_TOTAL
+        labels[np.asarray(key_value_positions, dtype=np.int64)] |= ROW_KEY_VALUE
+        return labels
+
+    def _transaction_masks(self, values):
+        """
+        (transaksi, header) per baris. Transaksi: semua kolom required terisi dan mengandung angka.
+        Header: semua kolom required terisi tanpa angka (label seperti JUMLAH, NILAI).
+        """
+        transaction = np.zeros(len(values), dtype=bool)
+        header = np.zeros(len(values), dtype=bool)
+        if len(values) == 0 or max(self._required_columns) >= values.shape[1]:
+            return transaction, header
+
+        transaction[:] = True
+        header[:] = True
+        for column in self._required_columns:
+            cells = values[:, column]
+            has_digit = _contains_digit(cells)
+            transaction &= has_digit
+            header &= np.asarray(pd.notna(cells), dtype=bool) & ~has_digit
+        return transaction, header
+
+    def total_mask(self, values):
+        """Baris total/subtotal: teks kolom label mengandung 'total'"""
+        mask = np.zeros(len(values), dtype=bool)
+        if len(values) == 0 or self.total_label_column >= values.shape[1]:
+            return mask
+        cells = values[:, self.total_label_column]
+        # Cell kosong (str 'nan'/'None') tidak pernah mengandung 'total'
+        present = np.asarray(pd.notna(cells), dtype=bool)
+        if present.any():
+            labels = _text_column(cells[present]).str.lower()
+            mask[present] = labels.str.contains('total', regex=False).to_numpy(dtype=bool)
+        return mask
+
+    def extract(self, values, section, positions, clean_column):
+        """
+        Record dict untuk baris-baris di positions: field section yang cell-nya terisi.
+
+        Kolom section di-slice sekali dari blok lalu cell yang terisi dibersihkan per kolom
+        dengan clean_column (Series → list string). Urutan field mengikuti urutan di profile.
+        """
+        records = [{} for _ in range(len(positions))]
+        if len(positions) == 0:
+            return records
+
+        width = values.shape[1]
+        fields = [(field, column) for field, column in self.sections[section].items() if column < width]
+        if not fields:
+            return records
+        block = values[np.ix_(positions, [column for _, column in fields])]
+        present = np.asarray(pd.notna(block), dtype=bool)
+        for field_position, (field, _) in enumerate(fields):
+            record_positions = np.flatnonzero(present[:, field_position])
+            if len(record_positions) == 0:
+                continue
+            cleaned = clean_column(_typed_column(block[record_positions, field_position]))
+            for record_position, cleaned_value in zip(record_positions.tolist(), cleaned):
+                records[record_position][field] = cleaned_value
+        return records
+
+
+def compile_layout_profiles(specs):
+    """Kompilasi dict {nama: spec} dari config menjadi {nama: LayoutProfile}"""
+    return {name: LayoutProfile(name, spec) for name, spec in specs.items()}
@@ -0,0 +1,155 @@
+"""
+Registry layout template tagihan: fingerprint sheet → layout hasil analysis yang sudah diketahui
+"""
+
+import json
+import os
+import threading
+import time
+
+
+class LayoutRegistry:
+    """
+    Menyimpan layout (format sheet, header row, posisi kolom field) per fingerprint sheet.
+
+    Template tagihan rumah sakit yang sama menghasilkan fingerprint yang sama, sehingga
+    analysis mendalam cukup dilakukan sekali; upload berikutnya langsung memakai layout
+    yang tersimpan. Registry dipersist ke file JSON (path=None: hanya di memori).
+    """
+
+    VERSION = 1
+    # Hit count dan last_used hanya ditulis ke file setiap sekian cache hit, bukan setiap workbook
+    HIT_FLUSH_COUNT = 50
+
+    def __init__(self, path=None, max_entries=500):
+        self.path = path
+        self.max_entries = max_entries
+        self._dirty = False
+        self._pending_hits = 0
+        self._lock = threading.Lock()
+        # _forgotten: fingerprint yang di-forget → waktu forget; ikut dipersist supaya tidak dipulihkan saat merge
+        self._layouts, self._forgotten = self._read_file()
+
+    def _read_file(self):
+        """(layouts, forgotten) dari file registry; dict kosong jika file tidak ada atau tidak valid"""
+        if not self.path or not os.path.exists(self.path):
+            return {}, {}
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != self.VERSION:
+                return {}, {}
+            return data.get('layouts', {}), data.get('forgotten', {})
+        except Exception as e:
+            print(f"⚠️ Warning: Layout registry {self.path} tidak bisa dibaca: {str(e)}")
+            return {}, {}
+
+    @staticmethod
+    def _learned_at(layout):
+        return layout.get('learned_at', layout.get('created_at', 0))
+
+    def get(self, fingerprint):
+        """Layout untuk fingerprint (salinan dict) atau None"""
+        with self._lock:
+            layout = self._layouts.get(fingerprint)
+            if layout is None:
+                return None
+            layout['hits'] = layout.get('hits', 0) + 1
+            layout['last_used'] = time.time()
+            self._pending_hits += 1
+            if self._pending_hits >= self.HIT_FLUSH_COUNT:
+                self._dirty = True
+            return dict(layout)
+
+    def learn(self, fingerprint, sheet_analysis):
+        """Simpan layout dari hasil analysis lengkap satu sheet"""
+        header_rows = sheet_analysis.get('header_rows') or []
+        layout = {
+            'format': sheet_analysis['format'],
+            'total_columns': sheet_analysis.get('total_columns', 0),
+            'detected_fields': dict(sheet_analysis.get('detected_fields', {})),
+            # Hanya posisi dan skor header; isi baris tidak disimpan (bisa berisi data pasien)
+            'header_rows': [
+                {'row_index': int(row['row_index']), 'score': float(row['score'])}
+                for row in header_rows[:1]
+            ],
+            'hits': 0,
+            'created_at': time.time(),
+            'learned_at': time.time(),
+            'last_used': time.time()
+        }
+        with self._lock:
+            # Dipelajari ulang setelah forget: harus lebih baru dari tombstone (resolusi jam bisa kasar)
+            layout['learned_at'] = max(layout['learned_at'], self._forgotten.get(fingerprint, 0) + 1e-6)
+            existing = self._layouts.get(fingerprint)
+            if existing is not None:
+                layout['hits'] = existing.get('hits', 0)
+                layout['created_at'] = existing.get('created_at', layout['created_at'])
+            self._layouts[fingerprint] = layout
+            self._forgotten.pop(fingerprint, None)
+            self._evict()
+            self._dirty = True
+
+    def forget(self, fingerprint):
+        """Hapus layout yang terbukti tidak cocok lagi"""
+        with self._lock:
+            self._layouts.pop(fingerprint, None)
+            self._forgotten[fingerprint] = time.time()
+            self._dirty = True
+
+    def save(self):
+        """Tulis registry ke file (digabung dengan isi file saat ini, ditulis atomik)"""
+        if not self.path:
+            return
+        with self._lock:
+            if not self._dirty:
+                return
+            try:
+                # Proses lain (batch worker, server lain) mungkin sudah menambah atau menghapus layout
+                merged, forgotten = self._read_file()
+                for fingerprint, forgotten_at in self._forgotten.items():
+                    forgotten[fingerprint] = max(forgotten.get(fingerprint, 0), forgotten_at)
+                merged.update(self._layouts)
+                # Layout yang di-forget tidak dipulihkan dari file, kecuali dipelajari ulang sesudahnya
+                for fingerprint, forgotten_at in list(forgotten.items()):
+                    layout = merged.get(fingerprint)
+                    if layout is None:
+                        continue
+                    if self._learned_at(layout) <= forgotten_at:
+                        del merged[fingerprint]
+                    else:
+                        del forgotten[fingerprint]
+                self._layouts = merged
+                self._forgotten = dict(
+                    sorted(forgotten.items(), key=lambda item: item[1])[-self.max_entries:]
+                )
+                self._evict()
+
+                directory = os.path.dirname(os.path.abspath(self.path))
+                if not os.path.exists(directory):
+                    os.makedirs(directory)
+                temp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(temp_path, 'w', encoding='utf-8') as f:
+                    json.dump(
+                        {'version': self.VERSION, 'layouts': self._layouts, 'forgotten': self._forgotten},
+                        f, indent=2, sort_keys=True
+                    )
+                os.replace(temp_path, self.path)
+                self._dirty = False
+                self._pending_hits = 0
+            except Exception as e:
+                print(f"⚠️ Warning: Layout registry gagal disimpan: {str(e)}")
+
+    def __len__(self):
+        return len(self._layouts)
+
+    def __contains__(self, fingerprint):
+        return fingerprint in self._layouts
+
+    def _evict(self):
+        """Buang layout yang paling lama tidak dipakai jika melebihi max_entries"""
+        if len(self._layouts) <= self.max_entries:
+            return
+        by_last_used = sorted(self._layouts, key=lambda key: self._layouts[key].get('last_used', 0))
+        for fingerprint in by_last_used[:len(self._layouts) - self.max_entries]:
+            del self._layouts[fingerprint]
@@ -0,0 +1,138 @@
+"""
+Parser angka/currency format Indonesia untuk seluruh kolom sekaligus (Rp 1.250.000,50 → 1250000.5)
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# Angka pertama di teks: tanda minus/kurung dan prefix Rp/IDR opsional, lalu digit dengan pemisah . dan ,
+# ('130.000,-' → '130.000'; akhiran ',-' berarti tanpa sen, bukan negatif)
+AMOUNT_PATTERN = re.compile(
+    r'(?P<sign>[-(])?(?:\s*(?:rp\.?|idr)\s*)?(?P<inner_sign>-)?(?P<number>\d(?:[\d.,]*\d)?)',
+    re.IGNORECASE
+)
+
+_NUMBER_TYPES = (int, float, np.integer, np.floating)
+_BOOL_TYPES = (bool, np.bool_)
+# Teks angka dianalisis per batch sebagai matrix kode karakter (padding ke teks terpanjang di batch)
+_LAYOUT_BATCH_SIZE = 4096
+
+
+def amount_text(text):
+    """Teks angka pertama tanpa prefix currency ('Rp -1.250.000,50' → '-1.250.000,50'); None jika tidak ada angka"""
+    match = AMOUNT_PATTERN.search(text)
+    if match is None:
+        return None
+    sign = '-' if match.group('sign') or match.group('inner_sign') else ''
+    return sign + match.group('number')
+
+
+def parse_numbers(values):
+    """
+    Nilai angka per cell sebagai array float64 (NaN untuk kosong atau tanpa angka).
+
+    Angka dari Excel dipakai apa adanya; teks di-parse dengan AMOUNT_PATTERN, hanya sekali
+    per teks unik. Pemisah mengikuti format Indonesia: '.' ribuan dan ',' desimal, kecuali
+    jika teksnya jelas berformat lain ('75,000' → 75000, '2.5' → 2.5). Minus di depan angka
+    atau 'Rp' dan angka dalam kurung berarti negatif.
+    """
+    if isinstance(values, (pd.Series, np.ndarray)) and values.dtype.kind in 'iuf':
+        return np.asarray(values, dtype=np.float64)
+
+    values = np.asarray(pd.Series(values, dtype=object))
+    numbers = np.full(len(values), np.nan)
+    is_number = np.array([
+        isinstance(value, _NUMBER_TYPES) and not isinstance(value, _BOOL_TYPES) for value in values
+    ], dtype=bool)
+    if is_number.any():
+        numbers[is_number] = values[is_number].astype(np.float64)
+
+    is_text = np.array([isinstance(value, str) for value in values], dtype=bool)
+    if is_text.any():
+        codes, unique_texts = pd.factorize(values[is_text])
+        numbers[is_text] = _parse_texts(pd.Series(unique_texts, dtype=object))[codes]
+    return numbers
+
+
+def _parse_texts(texts):
+    """float64 per teks unik (Series str)"""
+    parts = texts.str.extract(AMOUNT_PATTERN)
+    found = parts['number'].notna().to_numpy(dtype=bool)
+    result = np.full(len(texts), np.nan)
+    if not found.any():
+        return result
+
+    numbers = parts['number'][found]
+    negative = (parts['sign'][found].notna() | parts['inner_sign'][found].notna()).to_numpy(dtype=bool)
+    result[found] = np.where(negative, -1.0, 1.0) * _to_float(_normalize_separators(numbers))
+    return result
+
+
+def _normalize_separators(numbers):
+    """
+    Teks angka dengan pemisah . dan , menjadi format float() ('1.250.000,50' → '1250000.50').
+
+    Dua jenis pemisah: yang terakhir adalah desimal. Satu jenis yang muncul berulang: ribuan.
+    Satu pemisah saja: ribuan jika diikuti tepat 3 digit setelah 1-3 digit yang tidak diawali 0
+    ('130.000', '75,000'), selain itu desimal ('2,5', '0.125').
+    """
+    dots, commas, last_dot, last_comma, length, leading_zero = _separator_layout(numbers.tolist())
+
+    both = (dots > 0) & (commas > 0)
+    single = (dots + commas) == 1
+    last_separator = np.maximum(last_dot, last_comma)
+    thousands_group = single & (length - last_separator - 1 == 3) & (last_separator <= 3) & ~leading_zero
+    comma_decimal = (both & (last_comma > last_dot)) | (single & (commas == 1) & ~thousands_group)
+    dot_decimal = (both & (last_dot > last_comma)) | (single & (dots == 1) & ~thousands_group)
+
+    normalized = numbers.str.replace('.', '', regex=False).str.replace(',', '', regex=False)
+    if comma_decimal.any():
+        normalized[comma_decimal] = (
+            numbers[comma_decimal].str.replace('.', '', regex=False).str.replace(',', '.', regex=False)
+        )
+    if dot_decimal.any():
+        normalized[dot_decimal] = numbers[dot_decimal].str.replace(',', '', regex=False)
+    return normalized
+
+
+def _separator_layout(numbers):
+    """
+    Per teks: (jumlah '.', jumlah ',', posisi '.' terakhir, posisi ',' terakhir, panjang, diawali '0').
+
+    Dihitung dengan numpy atas matrix kode karakter (str → uint32), bukan per teks.
+    """
+    layout = np.zeros((6, len(numbers)), dtype=np.int64)
+    for start in range(0, len(numbers), _LAYOUT_BATCH_SIZE):
+        batch = np.array(numbers[start:start + _LAYOUT_BATCH_SIZE], dtype=str)
+        width = batch.dtype.itemsize // 4
+        codes = batch.view(np.uint32).reshape(len(batch), width)
+        positions = np.arange(width)
+        dot = codes == ord('.')
+        comma = codes == ord(',')
+        layout[:, start:start + len(batch)] = [
+            dot.sum(axis=1),
+            comma.sum(axis=1),
+            np.where(dot, positions, -1).max(axis=1),
+            np.where(comma, positions, -1).max(axis=1),
+            (codes != 0).sum(axis=1),
+            codes[:, 0] == ord('0')
+        ]
+    dots, commas, last_dot, last_comma, length, leading_zero = layout
+    return dots, commas, last_dot, last_comma, length, leading_zero.astype(bool)
+
+
+def _to_float(texts):
+    """float() setiap teks sekaligus (array float64); NaN untuk teks yang tidak valid (mis. '1.2,3.4')"""
+    candidates = texts.to_numpy(dtype=object)
+    try:
+        return candidates.astype(np.float64)
+    except ValueError:
+        parsed = np.full(len(candidates), np.nan)
+        for position, text in enumerate(candidates):
+            try:
+                parsed[position] = float(text)
+            except ValueError:
+                pass
+        return parsed
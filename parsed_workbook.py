@@ -0,0 +1,68 @@
+"""
+Workbook Excel yang sudah di-parse, dipakai bersama oleh validasi, preview dan ekstraksi
+"""
+
+import pandas as pd
+from pandas.io.parsers import TextParser
+
+
+class ParsedWorkbook:
+    """Membaca semua sheet dari file Excel tepat satu kali"""
+
+    def __init__(self, filepath, sheets=None, content_hash=None, lazy=False, row_counts=None):
+        self.filepath = filepath
+        # Mode lazy: sheet baru di-parse saat dibutuhkan (misalnya oleh worker process)
+        self.lazy = lazy and sheets is None
+        if self.lazy:
+            self.sheets = {}
+            self._sheet_names = self._read_sheet_names(filepath)
+        else:
+            self.sheets = sheets if sheets is not None else self._read_all_sheets(filepath)
+            self._sheet_names = list(self.sheets.keys())
+        # Hash isi file (jika diketahui), dipakai sebagai key WorkbookCache
+        self.content_hash = content_hash
+        # Jumlah baris asli sheet yang hanya dibaca baris awalnya (workbook terbatas untuk preview)
+        self.row_counts = dict(row_counts or {})
+
+    @staticmethod
+    def _read_all_sheets(filepath):
+        """Parse seluruh sheet sekaligus (header=None) dalam satu kali buka file"""
+        try:
+            return pd.read_excel(filepath, sheet_name=None, header=None)
+        except Exception as e:
+            raise Exception(f"File bukan file Excel yang valid: {str(e)}")
+
+    @staticmethod
+    def _read_sheet_names(filepath):
+        try:
+            with pd.ExcelFile(filepath) as excel_file:
+                return list(excel_file.sheet_names)
+        except Exception as e:
+            raise Exception(f"File bukan file Excel yang valid: {str(e)}")
+
+    @property
+    def sheet_names(self):
+        return list(self._sheet_names)
+
+    def is_loaded(self, sheet_name):
+        return sheet_name in self.sheets
+
+    def get_sheet(self, sheet_name):
+        """DataFrame mentah (tanpa header) untuk satu sheet"""
+        if sheet_name not in self.sheets:
+            if not self.lazy:
+                raise KeyError(sheet_name)
+            self.sheets[sheet_name] = pd.read_excel(self.filepath, sheet_name=sheet_name, header=None)
+        return self.sheets[sheet_name]
+
+    def get_sheet_with_header(self, sheet_name, header_idx):
+        """
+        DataFrame dengan baris header_idx sebagai nama kolom.
+
+        Setara dengan pd.read_excel(filepath, sheet_name=..., header=header_idx),
+        tetapi dibangun dari data yang sudah di-parse sehingga file tidak dibaca ulang.
+        """
+        raw_df = self.sheets[sheet_name]
+        # read_excel memberikan '' untuk cell kosong ke TextParser, jadi ikuti hal yang sama
+        rows = raw_df.astype(object).where(raw_df.notna(), '').values.tolist()
+        return TextParser(rows, header=header_idx).read()
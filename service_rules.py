@@ -0,0 +1,69 @@
+"""
+Aturan klasifikasi service code dari file eksternal (formularium obat/alkes, kategori layanan)
+"""
+
+import csv
+import json
+import os
+import threading
+
+from keyword_matcher import KeywordMatcher
+
+SERVICE_CODE_GROUP = 'service_code'
+
+# path → ((mtime_ns, size), KeywordMatcher); dipakai bersama semua ExcelProcessor di process ini
+_compiled_rules = {}
+_lock = threading.Lock()
+
+
+def read_service_rules(path):
+    """
+    List (label, keyword) urut prioritas dari file aturan.
+
+    Format JSON: {"Alkes": ["kateter", ...], "Obat": [...], ...}; urutan kategori lalu
+    urutan keyword menentukan prioritas. Format CSV (ekstensi .csv): kolom label,keyword
+    per baris dengan header, prioritas mengikuti urutan baris. Keyword di-lower-case.
+    """
+    if path.lower().endswith('.csv'):
+        with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+            reader = csv.DictReader(f)
+            if not reader.fieldnames or not {'label', 'keyword'} <= set(reader.fieldnames):
+                raise Exception(f"File aturan {path} harus memiliki kolom label,keyword")
+            entries = [(row['label'], row['keyword']) for row in reader]
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, dict):
+            raise Exception(f"File aturan {path} harus berisi object {{label: [keyword, ...]}}")
+        entries = [(label, keyword) for label, keywords in data.items() for keyword in keywords]
+
+    rules = []
+    for label, keyword in entries:
+        label = (label or '').strip()
+        keyword = (keyword or '').strip().lower()
+        if label and keyword:
+            rules.append((label, keyword))
+    if not rules:
+        raise Exception(f"File aturan {path} tidak berisi keyword")
+    return rules
+
+
+def load_service_matcher(path):
+    """
+    KeywordMatcher (grup 'service_code') untuk file aturan, dikompilasi sekali per versi file.
+
+    Automaton dengan puluhan ribu keyword butuh waktu dan tabel DFA ratusan MB, jadi hasilnya
+    di-cache per path dan baru dikompilasi ulang saat mtime/ukuran file berubah.
+    """
+    stat = os.stat(path)
+    version = (stat.st_mtime_ns, stat.st_size)
+    with _lock:
+        cached = _compiled_rules.get(path)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        rules = read_service_rules(path)
+        matcher = KeywordMatcher({SERVICE_CODE_GROUP: rules})
+        _compiled_rules[path] = (version, matcher)
+        print(f"📚 Service rules {path}: {len(rules)} keyword, {len({label for label, _ in rules})} kategori")
+        return matcher
@@ -0,0 +1,126 @@
+"""
+Reader streaming (openpyxl read_only) untuk sheet Excel yang sangat besar
+"""
+
+import numpy as np
+import pandas as pd
+from pandas.io.parsers import TextParser
+from parsed_workbook import ParsedWorkbook
+
+try:
+    from openpyxl.cell.cell import ERROR_CODES
+except ImportError:
+    ERROR_CODES = ('#NULL!', '#DIV/0!', '#VALUE!', '#REF!', '#NAME?', '#NUM!', '#N/A')
+
+
+class StreamingWorkbookReader:
+    """
+    Membaca baris sheet .xlsx satu per satu lewat iter_rows(values_only=True).
+
+    Baris dikumpulkan menjadi chunk DataFrame kecil dengan konversi yang sama
+    seperti pd.read_excel(header=None), sehingga extractor yang sudah ada bisa
+    dipakai tanpa pernah memuat seluruh sheet ke memori.
+    """
+
+    def __init__(self, filepath, chunk_size=5000):
+        self.filepath = filepath
+        self.chunk_size = chunk_size
+        self._sheet_names = None
+
+    def _open(self):
+        try:
+            import openpyxl
+            return openpyxl.load_workbook(self.filepath, read_only=True, data_only=True)
+        except Exception as e:
+            raise Exception(f"File bukan file Excel yang valid: {str(e)}")
+
+    @property
+    def sheet_names(self):
+        if self._sheet_names is None:
+            workbook = self._open()
+            try:
+                self._sheet_names = list(workbook.sheetnames)
+            finally:
+                workbook.close()
+        return self._sheet_names
+
+    def sheet_row_counts(self):
+        """Jumlah baris per sheet dari dimensi yang disimpan di file (tanpa membaca baris); None jika tidak ada"""
+        workbook = self._open()
+        try:
+            return {
+                sheet_name: getattr(workbook[sheet_name], 'max_row', None)
+                for sheet_name in workbook.sheetnames
+            }
+        finally:
+            workbook.close()
+
+    @staticmethod
+    def _convert_value(value):
+        """Konversi nilai cell seperti reader openpyxl milik pandas"""
+        if value is None:
+            return ''
+        if isinstance(value, float) and value.is_integer():
+            return int(value)
+        if isinstance(value, str) and value in ERROR_CODES:
+            return np.nan
+        return value
+
+    def iter_rows(self, sheet_name):
+        """Generator list nilai per baris (trailing cell kosong dibuang)"""
+        workbook = self._open()
+        try:
+            worksheet = workbook[sheet_name]
+            worksheet.reset_dimensions()
+            for row in worksheet.iter_rows(values_only=True):
+                converted_row = [self._convert_value(value) for value in row]
+                while converted_row and converted_row[-1] == '':
+                    converted_row.pop()
+                yield converted_row
+        finally:
+            workbook.close()
+
+    def iter_chunks(self, sheet_name, chunk_size=None, max_rows=None):
+        """Generator DataFrame (header=None) per chunk; index = posisi baris absolut"""
+        chunk_size = chunk_size or self.chunk_size
+        buffer = []
+        start_row = 0
+        pending_blank = 0
+
+        for row_number, row in enumerate(self.iter_rows(sheet_name)):
+            if max_rows is not None and row_number >= max_rows:
+                break
+            if not row:
+                # Tunda baris kosong supaya baris kosong di akhir sheet ikut terbuang
+                pending_blank += 1
+                continue
+            buffer.extend([[]] * pending_blank)
+            pending_blank = 0
+            buffer.append(row)
+            if len(buffer) >= chunk_size:
+                yield self._build_frame(buffer, start_row)
+                start_row += len(buffer)
+                buffer = []
+
+        if buffer:
+            yield self._build_frame(buffer, start_row)
+
+    @staticmethod
+    def _build_frame(rows, start_row):
+        max_width = max(len(row) for row in rows)
+        rows = [row + [''] * (max_width - len(row)) for row in rows]
+        df = TextParser(rows, header=None).read()
+        df.index = pd.RangeIndex(start_row, start_row + len(df))
+        return df
+
+    def read_head(self, sheet_name, n_rows):
+        """Baca n_rows baris pertama sebagai satu DataFrame"""
+        chunks = list(self.iter_chunks(sheet_name, chunk_size=n_rows, max_rows=n_rows))
+        if not chunks:
+            return pd.DataFrame()
+        return chunks[0]
+
+    def read_head_workbook(self, n_rows, row_counts=None):
+        """ParsedWorkbook yang hanya berisi n_rows baris pertama tiap sheet (untuk analisis)"""
+        sheets = {sheet_name: self.read_head(sheet_name, n_rows) for sheet_name in self.sheet_names}
+        return ParsedWorkbook(self.filepath, sheets=sheets, row_counts=row_counts)
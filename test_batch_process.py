@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi CLI batch processing
+"""
+
+import os
+import sys
+import tempfile
+import pandas as pd
+from batch_process import collect_input_files, build_output_names, run_batch, run_incremental, ProcessingManifest
+
+def _create_bill_file(filepath, invoice_number):
+    """Buat file tagihan format key-value sederhana"""
+    rows = [
+        ['Nomor Tagihan', f' : {invoice_number}'],
+        ['Nama Pasien', ' : Ujang Sunarja'],
+        ['JENIS BIAYA', 'KETERANGAN', 'WAKTU', 'TANGGAL', 'JUMLAH', 'NILAI', None, 'SUB TOTAL']
+    ]
+    for i in range(5):
+        rows.append(['Biaya Obat', f'Obat {i}', '08:00', '25/08/2025', 1, '130.000,-', None, 130000])
+    pd.DataFrame(rows).to_excel(filepath, index=False, header=False)
+
+def test_batch_process():
+    """Test pengumpulan file input dan pemrosesan batch"""
+
+    print("🧪 Testing Batch Processing CLI...")
+    success = True
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_dir = os.path.join(tmp_dir, 'input')
+        os.makedirs(os.path.join(input_dir, 'sub'))
+        _create_bill_file(os.path.join(input_dir, 'tagihan.xlsx'), 'IP-001')
+        _create_bill_file(os.path.join(input_dir, 'sub', 'tagihan.xlsx'), 'IP-002')
+        with open(os.path.join(input_dir, '~$tagihan.xlsx'), 'w') as f:
+            f.write('lock')
+        with open(os.path.join(input_dir, 'rusak.xlsx'), 'w') as f:
+            f.write('bukan excel')
+        with open(os.path.join(input_dir, 'catatan.txt'), 'w') as f:
+            f.write('abaikan')
+
+        # Test 1: direktori rekursif, file lock dan non-Excel dilewati
+        print("\n📊 Test 1: collect_input_files")
+        files = collect_input_files([input_dir, os.path.join(input_dir, '*.xlsx')])
+        names = sorted(os.path.relpath(f, input_dir) for f in files)
+        expected = sorted(['rusak.xlsx', 'tagihan.xlsx', os.path.join('sub', 'tagihan.xlsx')])
+        if names == expected:
+            print(f"  ✅ PASS: {len(files)} file ditemukan")
+        else:
+            print(f"  ❌ FAIL: Expected {expected}, got {names}")
+            success = False
+
+        # Test 2: nama output unik untuk nama file yang sama
+        print("\n📊 Test 2: build_output_names")
+        output_names = sorted(build_output_names(files).values())
+        if len(set(output_names)) == len(files):
+            print(f"  ✅ PASS: {output_names}")
+        else:
+            print(f"  ❌ FAIL: Nama output bentrok {output_names}")
+            success = False
+
+        # Test 3: batch dengan 2 worker, file rusak dilaporkan tanpa menghentikan batch
+        print("\n📊 Test 3: run_batch")
+        output_dir = os.path.join(tmp_dir, 'output')
+        results = run_batch(files, output_dir, workers=2)
+        failed = [r for r in results if r['error']]
+        succeeded = [r for r in results if not r['error']]
+        outputs_exist = all(os.path.exists(r['output']) for r in succeeded)
+        if len(failed) == 1 and len(succeeded) == 2 and outputs_exist and all(r['rows'] == 5 for r in succeeded):
+            print("  ✅ PASS: 2 berhasil, 1 gagal")
+        else:
+            print(f"  ❌ FAIL: {results}")
+            success = False
+
+        # Test 4: incremental, hanya file baru/berubah yang diproses ulang
+        print("\n📊 Test 4: run_incremental dengan manifest")
+        os.remove(os.path.join(input_dir, 'rusak.xlsx'))
+        output_dir = os.path.join(tmp_dir, 'incremental')
+        manifest_path = os.path.join(output_dir, '.batch_manifest.json')
+        first = run_incremental([input_dir], output_dir, 1, False, ProcessingManifest(manifest_path))
+        second = run_incremental([input_dir], output_dir, 1, False, ProcessingManifest(manifest_path))
+        _create_bill_file(os.path.join(input_dir, 'tagihan.xlsx'), 'IP-003')
+        third = run_incremental([input_dir], output_dir, 1, False, ProcessingManifest(manifest_path))
+        first_outputs = {r['input']: r['output'] for r in first}
+        if (len(first) == 2 and len(second) == 0 and len(third) == 1
+                and third[0]['output'] == first_outputs[third[0]['input']]):
+            print("  ✅ PASS: Run kedua dilewati, hanya file berubah yang diproses ulang")
+        else:
+            print(f"  ❌ FAIL: {len(first)}, {len(second)}, {len(third)} file diproses")
+            success = False
+
+    if success:
+        print("\n✅ Batch processing test completed successfully!")
+    else:
+        print("\n❌ Batch processing test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_batch_process()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi perhitungan nilai unik (exact dan HyperLogLog)
+"""
+
+import sys
+import numpy as np
+import pandas as pd
+from cardinality import approximate_distinct_count, distinct_count
+
+def test_cardinality():
+    """Test bahwa estimasi HyperLogLog dekat dengan nunique() dan exact di bawah threshold"""
+
+    print("🧪 Testing Distinct Count...")
+    success = True
+
+    # Test 1: estimasi HyperLogLog untuk berbagai jumlah nilai unik (dengan duplikat)
+    print("\n📊 Test 1: approximate_distinct_count")
+    for unique_count in [100, 5000, 200000]:
+        values = np.array([f'Pasien {i}' for i in range(unique_count)] * 2, dtype=object)
+        estimate = approximate_distinct_count(values)
+        error = abs(estimate - unique_count) / unique_count
+        if error < 0.05:
+            print(f"  ✅ PASS: {unique_count} unik → estimasi {estimate} (error {error:.2%})")
+        else:
+            print(f"  ❌ FAIL: {unique_count} unik → estimasi {estimate} (error {error:.2%})")
+            success = False
+
+    # Test 2: exact di bawah threshold, approximate di atasnya
+    print("\n📊 Test 2: distinct_count threshold")
+    series = pd.Series([i % 700 for i in range(3000)] + [np.nan])
+    exact = distinct_count(series, exact_threshold=5000)
+    approximate = distinct_count(series, exact_threshold=1000)
+    always_exact = distinct_count(series, exact_threshold=None)
+    if exact == (700, False) and always_exact == (700, False) and approximate[1] and abs(approximate[0] - 700) <= 35:
+        print(f"  ✅ PASS: exact {exact}, approximate {approximate}")
+    else:
+        print(f"  ❌ FAIL: exact {exact}, approximate {approximate}, always_exact {always_exact}")
+        success = False
+
+    if success:
+        print("\n✅ Distinct count test completed successfully!")
+    else:
+        print("\n❌ Distinct count test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_cardinality()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi deteksi data rows vektor (_data_row_mask) sama dengan keputusan per baris
+"""
+
+import os
+import re
+import sys
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from excel_processor import ExcelProcessor
+from create_test_excel import create_test_excel
+from create_complex_test_excel import create_complex_test_excel
+
+def _reference_is_data_row(row_data):
+    """Keputusan per baris seperti implementasi sebelum versi vektor (_is_data_row)"""
+    numeric_count = 0
+    date_count = 0
+    for cell_value in row_data:
+        if pd.notna(cell_value):
+            if isinstance(cell_value, ExcelProcessor.NUMERIC_VALUE_TYPES):
+                numeric_count += 1
+            elif isinstance(cell_value, str):
+                if re.search(r'\d', str(cell_value)):
+                    numeric_count += 1
+                if re.search(r'\d{1,2}[/-]\d{1,2}[/-]\d{2,4}', str(cell_value)):
+                    date_count += 1
+    return numeric_count > 0 or date_count > 0
+
+def _mixed_frame():
+    """DataFrame dengan kolom campuran: angka, bool, NaN, tanggal, teks tanpa angka"""
+    return pd.DataFrame({
+        'teks': ['Biaya Obat', None, 'Kasa', '', 'Spuit 3cc', 'Jasa Dokter'],
+        'angka': [1, 2, 3, 4, 5, 6],
+        'desimal': [np.nan, 2.5, np.nan, np.nan, np.inf, np.nan],
+        'campuran': ['abc', 5, None, True, 'x', np.float64('nan')],
+        'tanggal': [datetime(2025, 8, 25), pd.NaT, None, None, None, None],
+        'bool': [True, False, True, False, True, False],
+        'kosong': [None] * 6
+    }).astype({'tanggal': object})
+
+def test_data_row_detection():
+    """Test _data_row_mask dan _detect_data_rows terhadap keputusan per baris"""
+
+    print("🧪 Testing Data Row Detection...")
+    success = True
+    processor = ExcelProcessor()
+    original_dir = os.getcwd()
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        try:
+            os.chdir(tmp_dir)
+            frames = {
+                'test_data': pd.read_excel(create_test_excel(), header=None),
+                'complex_test_data': pd.read_excel(create_complex_test_excel(), header=None)
+            }
+        finally:
+            os.chdir(original_dir)
+        frames['campuran'] = _mixed_frame()
+        frames['campuran_tanpa_bool'] = _mixed_frame().drop(columns=['angka', 'bool'])
+        frames['teks_saja'] = pd.DataFrame({'a': ['Nama', None, 'Pasien 1'], 'b': ['Kelas', 'x', None]})
+
+        for name, df in frames.items():
+            # Test 1: mask vektor = keputusan per baris
+            print(f"\n📊 Test ({name}): _data_row_mask vs per baris")
+            expected = np.array([_reference_is_data_row(df.iloc[row_idx]) for row_idx in range(len(df))], dtype=bool)
+            mask = processor._data_row_mask(df)
+            if np.array_equal(mask, expected):
+                print(f"  ✅ PASS: {int(mask.sum())} dari {len(df)} baris data")
+            else:
+                print(f"  ❌ FAIL: Berbeda di baris {np.flatnonzero(mask != expected).tolist()}")
+                success = False
+
+            # Test 2: data rows (tanpa header row pertama) dan hasil pada DataFrame hasil sampling
+            header_rows = processor._detect_header_rows(df)
+            if header_rows:
+                expected_rows = [
+                    int(row_label) for row_label, is_data in zip(df.index, expected)
+                    if is_data and row_label != header_rows[0]['row_index']
+                ]
+            else:
+                expected_rows = [int(row_label) for row_label in df.index]
+            sampled_df = df.iloc[::2]
+            sampled_expected = [
+                int(row_label) for row_label in sampled_df.index
+                if _reference_is_data_row(sampled_df.loc[row_label])
+            ]
+            if (processor._detect_data_rows(df, header_rows) == expected_rows
+                    and processor._data_row_mask(sampled_df).tolist() == [row in sampled_expected for row in sampled_df.index]):
+                print(f"  ✅ PASS: data_rows {expected_rows[:5]}...")
+            else:
+                print(f"  ❌ FAIL: {processor._detect_data_rows(df, header_rows)[:5]} vs {expected_rows[:5]}")
+                success = False
+
+    if success:
+        print("\n✅ Data row detection test completed successfully!")
+    else:
+        print("\n❌ Data row detection test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_data_row_detection()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi json_encoder (numpy scalar, NaN/inf, timestamp, fallback tanpa orjson)
+"""
+
+import json
+import sys
+import numpy as np
+import pandas as pd
+import json_encoder
+
+def test_json_encoder():
+    """Test serialisasi nilai hasil analisis dengan dan tanpa orjson"""
+
+    print("🧪 Testing JSON Encoder...")
+    success = True
+
+    data = {
+        'total_rows': np.int64(120),
+        'score': np.float64(0.75),
+        'ratio': float('nan'),
+        'limit': np.float64('inf'),
+        'flag': np.bool_(True),
+        'tanggal': pd.Timestamp('2025-08-25 08:00:00'),
+        'kosong': pd.NaT,
+        'values': np.array([1.5, np.nan]),
+        'teks': 'Nifedipin 10 mg'
+    }
+    expected = {
+        'total_rows': 120,
+        'score': 0.75,
+        'ratio': None,
+        'limit': None,
+        'flag': True,
+        'tanggal': '2025-08-25T08:00:00',
+        'kosong': None,
+        'values': [1.5, None],
+        'teks': 'Nifedipin 10 mg'
+    }
+
+    # Test 1 & 2: hasil sama dengan orjson (jika terpasang) dan encoder json bawaan
+    orjson_module = json_encoder.orjson
+    backends = [('orjson', orjson_module), ('json bawaan', None)] if orjson_module else [('json bawaan', None)]
+    for test_number, (backend_name, backend) in enumerate(backends, 1):
+        print(f"\n📊 Test {test_number}: Backend {backend_name}")
+        json_encoder.orjson = backend
+        try:
+            encoded = json_encoder.dumps(data, sort_keys=True)
+            if json.loads(encoded) == expected:
+                print(f"  ✅ PASS: {encoded}")
+            else:
+                print(f"  ❌ FAIL: {encoded}")
+                success = False
+        except Exception as e:
+            print(f"  ❌ FAIL: {e}")
+            success = False
+        finally:
+            json_encoder.orjson = orjson_module
+
+    # Test 3: tipe yang tidak dikenal tetap ditolak
+    print("\n📊 Test 3: Tipe tidak dikenal")
+    try:
+        json_encoder.dumps({'obj': object()})
+        print("  ❌ FAIL: object() ikut terserialisasi")
+        success = False
+    except TypeError as e:
+        print(f"  ✅ PASS: {e}")
+
+    # Test 4: encoder bawaan untuk NaN/inf bertingkat dan data tanpa NaN (satu kali encode C)
+    print("\n📊 Test 4: Encoder json bawaan untuk struktur bertingkat")
+    nested = {
+        'sheets': {'Tagihan': {'scores': [0.5, float('-inf')], 'pair': (1, np.float64('nan')), 'grid': np.array([[1.0, np.inf]])}},
+        'besar': 2 ** 70
+    }
+    nested_expected = {
+        'sheets': {'Tagihan': {'scores': [0.5, None], 'pair': [1, None], 'grid': [[1.0, None]]}},
+        'besar': 2 ** 70
+    }
+    finite = {'b': [1, 2.5, 'Rp 1.000'], 'a': {'nilai': np.int64(3)}}
+    json_encoder.orjson = None
+    try:
+        nested_encoded = json_encoder.dumps(nested)
+        finite_encoded = json_encoder.dumps(finite, sort_keys=True)
+        if (json.loads(nested_encoded) == nested_expected and 'NaN' not in nested_encoded and 'Infinity' not in nested_encoded
+                and finite_encoded == json.dumps({'a': {'nilai': 3}, 'b': [1, 2.5, 'Rp 1.000']}, sort_keys=True, separators=(',', ':'))):
+            print(f"  ✅ PASS: {nested_encoded}")
+        else:
+            print(f"  ❌ FAIL: {nested_encoded} / {finite_encoded}")
+            success = False
+    finally:
+        json_encoder.orjson = orjson_module
+
+    if success:
+        print("\n✅ JSON encoder test completed successfully!")
+    else:
+        print("\n❌ JSON encoder test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_json_encoder()
+    sys.exit(0 if success else 1)
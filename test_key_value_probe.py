@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi probe format key-value (window terbatas + skor keyakinan)
+"""
+
+import sys
+import pandas as pd
+from excel_processor import ExcelProcessor
+
+def test_key_value_probe():
+    """Test skor format key-value dari window di bagian atas sheet"""
+
+    print("🧪 Testing Key-Value Format Probe...")
+    success = True
+    processor = ExcelProcessor()
+
+    # Test 1: tagihan key-value
+    print("\n📊 Test 1: Tagihan key-value")
+    kv_df = pd.DataFrame([
+        ['Nomor Tagihan', ' : IP-00030178', 'Penjamin Bayar', ' : ALLIANZ'],
+        ['Nama Pasien', ' : Ujang Sunarja', None, None],
+        ['Biaya Obat', 'Nifedipin 10 mg', 1, '130.000,-']
+    ])
+    score = processor._key_value_format_score(kv_df)
+    if score == 1.0 and processor._is_key_value_format(kv_df):
+        print(f"  ✅ PASS: Skor {score}")
+    else:
+        print(f"  ❌ FAIL: Skor {score}")
+        success = False
+
+    # Test 2: tabel besar; teks " : " jauh di bawah window tidak dipindai
+    print("\n📊 Test 2: Tabel besar tanpa key-value di bagian atas")
+    table_rows = [['Biaya Obat', f'Item {i}', i % 5 + 1, 1000 * i] for i in range(5000)]
+    table_rows[4000][1] = 'Catatan : kirim ulang'
+    table_df = pd.DataFrame(table_rows)
+    score = processor._key_value_format_score(table_df)
+    if score == 0.0 and not processor._is_key_value_format(table_df):
+        print(f"  ✅ PASS: Skor {score} dari window awal")
+    else:
+        print(f"  ❌ FAIL: Skor {score}")
+        success = False
+
+    # Test 3: bagian atas hampir kosong → ambigu, window diperbesar sampai key-value ditemukan
+    print("\n📊 Test 3: Window diperbesar saat ambigu")
+    sparse_rows = [[None, None, None, None] for _ in range(120)]
+    sparse_rows[0][0] = 'RUMAH SAKIT X'
+    sparse_rows[110] = ['Nomor Tagihan', ' : IP-00030178', None, None]
+    sparse_df = pd.DataFrame(sparse_rows)
+    score = processor._key_value_format_score(sparse_df)
+    if score == 1.0:
+        print(f"  ✅ PASS: Skor {score} setelah window diperbesar")
+    else:
+        print(f"  ❌ FAIL: Skor {score}")
+        success = False
+
+    if success:
+        print("\n✅ Key-value probe test completed successfully!")
+    else:
+        print("\n❌ Key-value probe test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_key_value_probe()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,188 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi KeywordMatcher (Aho-Corasick) sama dengan pencarian substring biasa
+"""
+
+import sys
+import random
+import pickle
+import pandas as pd
+from keyword_matcher import KeywordMatcher
+from excel_processor import ExcelProcessor
+
+def test_keyword_matcher():
+    """Test prioritas label, match overlap/suffix, scan batch dan scan bertahap (stream)"""
+
+    print("🧪 Testing Keyword Matcher...")
+    success = True
+
+    matcher = KeywordMatcher({
+        'service_code': [('Alkes', 'syringe'), ('Alkes', 'alat'), ('Obat', 'tab'), ('Obat', 'mg')],
+        'field': [('nama_pasien', 'nama pasien'), ('nama_pasien', 'pasien'), ('sub_total', 'total')]
+    })
+
+    test_cases = [
+        ('obat 10 mg', 'service_code', 'Obat'),
+        ('tablet syringe', 'service_code', 'Alkes'),  # Alkes menang walau muncul belakangan
+        ('peralatan', 'service_code', 'Alkes'),  # 'alat' sebagai suffix dari 'peralatan'
+        ('subtotal', 'field', 'sub_total'),
+        ('data pasien', 'field', 'nama_pasien'),
+        ('jasa dokter', 'service_code', None),
+        ('', 'field', None)
+    ]
+
+    # Test 1: first_label satu per satu
+    print("\n📊 Test 1: first_label")
+    for text, group, expected in test_cases:
+        result = matcher.first_label(text, group)
+        if result == expected:
+            print(f"  ✅ PASS: '{text}' ({group}) → {result}")
+        else:
+            print(f"  ❌ FAIL: '{text}' ({group}) → Expected {expected}, got {result}")
+            success = False
+
+    # Test 2: scan batch harus sama dengan scan satu per satu
+    print("\n📊 Test 2: first_labels (batch)")
+    texts = [text for text, _, _ in test_cases] + ['x' * 500 + ' mg']
+    for group in ['service_code', 'field']:
+        batch_labels = matcher.first_labels(texts, group)
+        single_labels = [matcher.first_label(text, group) for text in texts]
+        if batch_labels == single_labels:
+            print(f"  ✅ PASS: {group} batch = per teks")
+        else:
+            print(f"  ❌ FAIL: {group} batch {batch_labels} != {single_labels}")
+            success = False
+
+    # Test 3: _map_key_to_field tetap mengikuti urutan prioritas lama
+    print("\n📊 Test 3: ExcelProcessor._map_key_to_field")
+    processor = ExcelProcessor()
+    key_cases = [
+        ('Nomor Tagihan', 'nomor_tagihan'),
+        ('Nama Pasien', 'nama_pasien'),
+        ('Kelas / Kamar', 'kelas_kamar'),
+        ('Tanggal Keluar', 'tanggal_keluar'),
+        ('Biaya Kamar', 'jenis_biaya'),
+        ('Dokter', None)
+    ]
+    for key, expected in key_cases:
+        result = processor._map_key_to_field(key)
+        if result == expected:
+            print(f"  ✅ PASS: '{key}' → {result}")
+        else:
+            print(f"  ❌ FAIL: '{key}' → Expected {expected}, got {result}")
+            success = False
+
+    # Test 4: stream().feed(...) sama dengan first_label atas teks yang digabung separator
+    print("\n📊 Test 4: stream vs first_label(separator.join(texts))")
+    boundary_matcher = KeywordMatcher({'g': [('A', 'ab'), ('B', 'b'), ('C', 'c')]})
+    stream_cases = [
+        # (matcher, group, texts, separator, lower)
+        (boundary_matcher, 'g', ['b'], 'a', False),  # feed pertama tanpa separator
+        (boundary_matcher, 'g', ['a', 'b'], '', False),  # keyword melintasi batas teks
+        (boundary_matcher, 'g', ['a', 'b'], ' ', False),
+        (boundary_matcher, 'g', ['x', 'c', 'c', 'c'], 'a', False),  # memo: teks sama dari state berbeda
+        (matcher, 'field', ['Nama', 'Pasien'], ' ', True),  # lower=True
+        (matcher, 'field', ['NAMA', 'PASIEN'], ' ', False),
+        (matcher, 'field', ['sub', 'total', 'pasien'], ' | ', False),
+        (matcher, 'service_code', [], ' ', False)
+    ]
+    rng = random.Random(7)
+    for _ in range(200):
+        texts = [''.join(rng.choice('abcx ') for _ in range(rng.randint(0, 3))) for _ in range(rng.randint(1, 8))]
+        stream_cases.append((boundary_matcher, 'g', texts, rng.choice(['', ' ', 'a', 'b|']), False))
+    stream_failures = []
+    for case_matcher, group, texts, separator, lower in stream_cases:
+        stream = case_matcher.stream(group, separator)
+        for text in texts:
+            stream.feed(text, lower=lower)
+        joined = separator.join(texts)
+        expected = case_matcher.first_label(joined.lower() if lower else joined, group)
+        if stream.label != expected:
+            stream_failures.append((texts, separator, lower, stream.label, expected))
+    if not stream_failures:
+        print(f"  ✅ PASS: {len(stream_cases)} kasus identik")
+    else:
+        print(f"  ❌ FAIL: {stream_failures[:3]}")
+        success = False
+
+    # Test 5: early exit (done), memo untuk teks berulang, dan batas memo
+    print("\n📊 Test 5: stream done dan memo")
+    stream = matcher.stream('field')
+    fed = 0
+    for text in ['jumlah', 'total', 'nama pasien', 'kelas', 'nomor']:
+        stream.feed(text)
+        fed += 1
+        if stream.done:
+            break
+    if fed == 3 and stream.label == matcher.first_label('jumlah total nama pasien kelas nomor', 'field'):
+        print(f"  ✅ PASS: Berhenti setelah {fed} teks, label {stream.label}")
+    else:
+        print(f"  ❌ FAIL: fed={fed}, label={stream.label}")
+        success = False
+
+    repeated = ['obat', '10', 'mg', 'obat', '10', 'mg'] * 50
+    stream = matcher.stream('service_code')
+    for text in repeated:
+        stream.feed(text)
+    limited = matcher.stream('service_code')
+    limited.MAX_MEMO_ENTRIES = 2
+    for text in repeated:
+        limited.feed(text)
+    expected = matcher.first_label(' '.join(repeated), 'service_code')
+    if (stream.label == expected and limited.label == expected
+            and len(stream._memo) < len(repeated) and len(limited._memo) == 2):
+        print(f"  ✅ PASS: {len(repeated)} teks, {len(stream._memo)} entri memo, label {expected}")
+    else:
+        print(f"  ❌ FAIL: {stream.label}/{limited.label} vs {expected}, memo {len(stream._memo)}/{len(limited._memo)}")
+        success = False
+
+    # Test 6: field terdeteksi _profile_column = first_label atas teks kolom yang digabung
+    print("\n📊 Test 6: ExcelProcessor._profile_column")
+    columns = [
+        pd.Series(['Biaya Obat', 'Jumlah', 'Nomor Tagihan', 'Nama']),  # field prioritas tertinggi → early exit
+        pd.Series(['Kelas 1', 'Kelas 1', 'VIP', 'Kelas 1'] * 100),
+        pd.Series(['Sub', 'Total', 'x']),  # keyword melintasi batas cell
+        pd.Series([1.5, 2.0, 3.25]),
+        pd.Series(['Spuit 3cc', None, 12, 'Kasa']).dropna()
+    ]
+    for col_idx, col_data in enumerate(columns):
+        expected = processor.keyword_matcher.first_label(' '.join(col_data.astype(str)).lower(), 'field')
+        result = processor._profile_column(col_data, col_idx)['detected_field']
+        if result == expected:
+            print(f"  ✅ PASS: Kolom {col_idx} → {result}")
+        else:
+            print(f"  ❌ FAIL: Kolom {col_idx} → Expected {expected}, got {result}")
+            success = False
+
+    # Test 7: automaton dari keyword acak (prefix/suffix bertumpuk) = pencarian substring biasa
+    print("\n📊 Test 7: Keyword acak vs substring biasa")
+    rng = random.Random(11)
+    random_groups = {
+        group: [(f'{group}{label}', ''.join(rng.choice('abc') for _ in range(rng.randint(1, 5))))
+                for label in range(40) for _ in range(2)]
+        for group in ['g1', 'g2']
+    }
+    random_matcher = pickle.loads(pickle.dumps(KeywordMatcher(random_groups)))
+    random_texts = [''.join(rng.choice('abcd') for _ in range(rng.randint(0, 30))) for _ in range(300)]
+    mismatches = 0
+    for group, entries in random_groups.items():
+        expected = [next((label for label, keyword in entries if keyword in text), None) for text in random_texts]
+        single = [random_matcher.first_label(text, group) for text in random_texts]
+        if single != expected or random_matcher.first_labels(random_texts, group) != expected:
+            mismatches += 1
+    if mismatches == 0:
+        print(f"  ✅ PASS: {len(random_texts)} teks, {sum(len(entries) for entries in random_groups.values())} keyword")
+    else:
+        print(f"  ❌ FAIL: {mismatches} grup berbeda")
+        success = False
+
+    if success:
+        print("\n✅ Keyword matcher test completed successfully!")
+    else:
+        print("\n❌ Keyword matcher test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_keyword_matcher()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi layout profile posisi kolom (Config.LAYOUT_PROFILES)
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config import Config
+from excel_processor import ExcelProcessor
+from layout_profiles import (
+    LayoutProfile, ROW_FILLED, ROW_KEY_VALUE, ROW_HEADER, ROW_TRANSACTION, ROW_TOTAL
+)
+
+def _create_bill_file(filepath):
+    """Tagihan key-value dengan posisi kolom berbeda dari format default (tanpa kolom WAKTU/TANGGAL)"""
+    rows = [
+        ['Nomor Tagihan', ' : IP-00030178', 'Penjamin Bayar', ' : ALLIANZ', None, None],
+        ['Nama Pasien', ' : Ujang Sunarja', None, None, None, None],
+        ['JENIS BIAYA', 'KETERANGAN', 'JUMLAH', 'NILAI', None, 'SUB TOTAL'],
+        ['Biaya Obat', 'Nifedipin 10 mg', 2, '130.000,-', None, 260000],
+        ['Nama Pasien', ' : Siti Aminah', None, None, None, None],
+        ['Peralatan', 'Spuit 3cc', 1, '15.000,-', None, 15000]
+    ]
+    pd.DataFrame(rows).to_excel(filepath, index=False, header=False)
+
+def test_layout_profiles():
+    """Test profile baru dari config dipakai untuk ekstraksi key-value"""
+
+    print("🧪 Testing Layout Profiles...")
+    success = True
+
+    Config.LAYOUT_PROFILES['rs_compact'] = {
+        'key_value_columns': [(0, 1), (2, 3)],
+        'transaction_columns': {'jenis_biaya': 0, 'keterangan': 1, 'jumlah': 2, 'nilai': 3, 'sub_total': 5},
+        'transaction_required': ['jumlah', 'nilai'],
+        'total_label_column': 0,
+        'total_columns': {'jenis_biaya': 0, 'sub_total': 5},
+        'raw_columns': {'jenis_biaya': 0, 'keterangan': 1, 'jumlah': 2, 'nilai': 3, 'sub_total': 5},
+        'raw_min_columns': 2
+    }
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp_dir:
+            input_file = os.path.join(tmp_dir, 'tagihan_compact.xlsx')
+            _create_bill_file(input_file)
+
+            # Test 1: profile default tidak menemukan transaksi di posisi kolom lain
+            print("\n📊 Test 1: Profile default pada format berbeda")
+            processor = ExcelProcessor()
+            output_filepath = processor.process_excel(input_file, output_dir=tmp_dir)
+            default_df = pd.read_excel(output_filepath, dtype=str).fillna('')
+            if default_df['QUANTITY'].tolist() != ['2', '1']:
+                print("  ✅ PASS: Jumlah transaksi tidak terbaca dari kolom default")
+            else:
+                print(f"  ❌ FAIL: Profile default ikut membaca jumlah: {default_df['QUANTITY'].tolist()}")
+                success = False
+
+            # Test 2: profile dari config dipilih lewat option
+            print("\n📊 Test 2: Profile 'rs_compact' lewat option layout_profile")
+            processor = ExcelProcessor()
+            output_filepath = processor.process_excel(input_file, {'layout_profile': 'rs_compact'}, output_dir=tmp_dir)
+            output_df = pd.read_excel(output_filepath, dtype=str).fillna('')
+            expected = [('Ujang Sunarja', '2', 'Nifedipin 10 mg'), ('Siti Aminah', '1', 'Spuit 3cc')]
+            actual = list(zip(output_df['CLIENT NAME'], output_df['QUANTITY'], output_df['SERVICECODE DESCRIPTION']))
+            if actual == expected:
+                print(f"  ✅ PASS: {len(actual)} transaksi diekstrak dengan posisi kolom profile")
+            else:
+                print(f"  ❌ FAIL: Expected {expected}, got {actual}")
+                success = False
+
+            # Test 3: profile yang tidak ada ditolak
+            print("\n📊 Test 3: Profile tidak dikenal")
+            try:
+                processor.process_excel(input_file, {'layout_profile': 'tidak_ada'}, output_dir=tmp_dir)
+                print("  ❌ FAIL: Profile tidak dikenal diterima")
+                success = False
+            except Exception as e:
+                print(f"  ✅ PASS: {e}")
+
+            # Test 4: spec tidak valid ditolak saat kompilasi
+            print("\n📊 Test 4: Validasi spec profile")
+            try:
+                LayoutProfile('rusak', {'transaction_columns': {'jumlah': -1}, 'transaction_required': ['jumlah']})
+                print("  ❌ FAIL: Posisi kolom negatif diterima")
+                success = False
+            except Exception as e:
+                print(f"  ✅ PASS: {e}")
+
+            # Test 5: label baris (pre-pass) untuk semua jenis baris
+            print("\n📊 Test 5: Label baris key-value sheet")
+            profile = ExcelProcessor().layout_profiles['default']
+            values = pd.DataFrame([
+                ['Nomor Tagihan', ' : IP-00030178', None, None, None, None, None, None],
+                [None] * 8,
+                ['JENIS BIAYA', 'KETERANGAN', 'WAKTU', 'TANGGAL', 'JUMLAH', 'NILAI', None, 'SUB TOTAL'],
+                ['Biaya Obat', 'Nifedipin 10 mg', '08:00', '25/08/2025', 2, '130.000,-', None, 260000],
+                ['Subtotal', None, None, None, None, None, None, 260000],
+                ['Catatan', 'tanpa angka', None, None, None, None, None, None]
+            ]).to_numpy(dtype=object)
+            labels = profile.row_labels(values, key_value_positions=[0]).tolist()
+            expected_labels = [
+                ROW_FILLED | ROW_KEY_VALUE,
+                0,
+                ROW_FILLED | ROW_HEADER,
+                ROW_FILLED | ROW_TRANSACTION,
+                ROW_FILLED | ROW_TOTAL,
+                ROW_FILLED
+            ]
+            if labels == expected_labels:
+                print(f"  ✅ PASS: Label {labels}")
+            else:
+                print(f"  ❌ FAIL: Expected {expected_labels}, got {labels}")
+                success = False
+
+            # Test 6: extract per kolom (clean_column) sama dengan _clean_value per cell
+            print("\n📊 Test 6: extract dengan _clean_column vs _clean_value per cell")
+            raw_values = pd.DataFrame({
+                0: ['Biaya Obat', None, ' Kasa\n', 'Rp 1.250.000,50', 12, True],
+                1: [1, 2, None, 4, 2 ** 60, 6],
+                2: [1.5, np.nan, 3.0, np.inf, 1e20, -2.0],
+                3: [1, 2.5, None, 2 ** 60, 7, 8.0],
+                4: [True, False, None, True, True, False],
+                5: [datetime(2025, 8, 25), None, 'x', 3, 4.5, '']
+            }, dtype=object).to_numpy(dtype=object)
+            mixed_profile = LayoutProfile('campuran', {
+                'transaction_columns': {'jumlah': 1},
+                'transaction_required': ['jumlah'],
+                'raw_columns': {'a': 0, 'b': 1, 'c': 2, 'd': 3, 'e': 4, 'f': 5, 'luar': 9}
+            })
+            positions = np.array([5, 0, 2, 3, 1])
+            expected_records = [
+                {
+                    field: processor._clean_value(raw_values[position, column])
+                    for field, column in mixed_profile.sections['raw'].items()
+                    if column < raw_values.shape[1] and pd.notna(raw_values[position, column])
+                }
+                for position in positions
+            ]
+            records = mixed_profile.extract(raw_values, 'raw', positions, processor._clean_column)
+            if records == expected_records and [list(record) for record in records] == [list(record) for record in expected_records]:
+                print(f"  ✅ PASS: {sum(len(record) for record in records)} cell identik")
+            else:
+                print(f"  ❌ FAIL: {records} vs {expected_records}")
+                success = False
+    finally:
+        del Config.LAYOUT_PROFILES['rs_compact']
+
+    if success:
+        print("\n✅ Layout profiles test completed successfully!")
+    else:
+        print("\n❌ Layout profiles test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_layout_profiles()
+    sys.exit(0 if success else 1)
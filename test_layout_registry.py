@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi layout registry (template tagihan yang sudah dikenal)
+"""
+
+import os
+import sys
+import tempfile
+import pandas as pd
+from excel_processor import ExcelProcessor
+from layout_registry import LayoutRegistry
+
+def _create_bill_file(filepath, invoice_number, patient_name, items):
+    """Buat file tagihan format key-value dengan template yang sama"""
+    rows = [
+        ['Nomor Tagihan', f' : {invoice_number}', 'Penjamin Bayar', ' : ALLIANZ'],
+        ['Nama Pasien', f' : {patient_name}', 'Kelas / Kamar', ' : KELAS 1/'],
+        ['JENIS BIAYA', 'KETERANGAN', 'WAKTU', 'TANGGAL', 'JUMLAH', 'NILAI', None, 'SUB TOTAL']
+    ]
+    for i, (jenis_biaya, keterangan) in enumerate(items):
+        rows.append([jenis_biaya, keterangan, '08:00', '25/08/2025', i + 1, '130.000,-', None, 130000 * (i + 1)])
+    pd.DataFrame(rows).to_excel(filepath, index=False, header=False)
+
+def _create_raw_and_table_files(raw_filepath, table_filepath):
+    """Sheet raw (tanpa header) dan sheet tabel dengan baris pertama berjenis sama"""
+    raw_rows = [['RS Sehat', 'Periode 2025', 1, 2025, 8], ['Cabang', 'Unit 3', 1, 1, 1]]
+    raw_rows += [['Pasien', f'Unit {i}', i, 2025, i * 2] for i in range(10)]
+    pd.DataFrame(raw_rows).to_excel(raw_filepath, index=False, header=False)
+
+    table_rows = [
+        ['RS Sehat', 'Periode 2025', 1, 2025, 8],
+        ['Cabang', 'Unit 3', 1, 1, 1],
+        ['Jenis Biaya', 'Keterangan', 'Jumlah', 'Nilai', 'Sub Total']
+    ]
+    table_rows += [['Biaya Obat', f'Obat {i} mg', i + 1, 1000, (i + 1) * 1000] for i in range(10)]
+    pd.DataFrame(table_rows).to_excel(table_filepath, index=False, header=False)
+
+def test_layout_registry():
+    """Test bahwa tagihan kedua dari template yang sama memakai layout tersimpan dengan output yang sama"""
+
+    print("🧪 Testing Layout Registry...")
+    success = True
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        first_file = os.path.join(tmp_dir, 'tagihan_1.xlsx')
+        second_file = os.path.join(tmp_dir, 'tagihan_2.xlsx')
+        _create_bill_file(first_file, 'IP-00030178', 'Ujang Sunarja',
+                          [('Biaya Obat', 'Nifedipin 10 mg'), ('Peralatan', 'Spuit 3cc')])
+        _create_bill_file(second_file, 'IP-00030999', 'Siti Aminah',
+                          [('Biaya Kamar', 'Kelas 1'), ('Biaya Obat', 'Candesartan 8 mg'), ('Peralatan', 'Kasa')])
+        registry_path = os.path.join(tmp_dir, 'layout_registry.json')
+
+        # Test 1: tagihan pertama dianalisis lengkap dan layout-nya disimpan
+        print("\n📊 Test 1: Layout dipelajari dari tagihan pertama")
+        processor = ExcelProcessor(layout_registry=LayoutRegistry(registry_path))
+        first_analysis = processor.preview_excel(first_file)
+        first_sheet = list(first_analysis['sheets'].values())[0]
+        if not first_sheet.get('layout_match') and os.path.exists(registry_path):
+            print(f"  ✅ PASS: Layout {first_sheet['layout_fingerprint'][:12]} disimpan ({first_sheet['format']})")
+        else:
+            print("  ❌ FAIL: Layout tidak tersimpan")
+            success = False
+
+        # Test 2: tagihan kedua (nilai berbeda) memakai layout dari file registry
+        print("\n📊 Test 2: Tagihan kedua memakai layout tersimpan")
+        processor = ExcelProcessor(layout_registry=LayoutRegistry(registry_path))
+        second_analysis = processor.preview_excel(second_file)
+        second_sheet = list(second_analysis['sheets'].values())[0]
+        if second_sheet.get('layout_match'):
+            print("  ✅ PASS: Analisis dilewati, layout dari registry")
+        else:
+            print("  ❌ FAIL: Layout tidak dikenali untuk template yang sama")
+            success = False
+
+        # Test 3: output sama dengan tanpa registry
+        print("\n📊 Test 3: Output dengan registry = tanpa registry")
+        outputs = []
+        for registry in [LayoutRegistry(registry_path), None]:
+            output_filepath = ExcelProcessor(layout_registry=registry).process_excel(second_file, output_dir=tmp_dir)
+            outputs.append(pd.read_excel(output_filepath, dtype=str))
+            os.remove(output_filepath)
+        if outputs[0].equals(outputs[1]):
+            print(f"  ✅ PASS: Output identik ({len(outputs[0])} baris)")
+        else:
+            print("  ❌ FAIL: Output berbeda")
+            success = False
+
+        # Test 4: sheet tabel yang baris awalnya mirip sheet raw tersimpan tidak memakai layout raw
+        print("\n📊 Test 4: Layout raw tidak dipakai untuk sheet tabel")
+        raw_file = os.path.join(tmp_dir, 'raw.xlsx')
+        table_file = os.path.join(tmp_dir, 'tabel.xlsx')
+        _create_raw_and_table_files(raw_file, table_file)
+        registry = LayoutRegistry(os.path.join(tmp_dir, 'layout_registry_raw.json'))
+        processor = ExcelProcessor(layout_registry=registry)
+        raw_sheet = list(processor.preview_excel(raw_file)['sheets'].values())[0]
+        table_sheet = list(processor.preview_excel(table_file)['sheets'].values())[0]
+        full_table_sheet = list(ExcelProcessor(layout_registry=None).preview_excel(table_file)['sheets'].values())[0]
+        if (raw_sheet['format'] == 'raw' and not table_sheet.get('layout_match')
+                and raw_sheet['layout_fingerprint'] != table_sheet['layout_fingerprint']
+                and table_sheet['format'] == full_table_sheet['format'] == 'table'):
+            print(f"  ✅ PASS: Sheet tabel dianalisis ulang ({table_sheet['format']}, header baris "
+                  f"{[row['row_index'] for row in table_sheet['header_rows']]})")
+        else:
+            print(f"  ❌ FAIL: {raw_sheet['format']} → {table_sheet['format']}, layout_match={table_sheet.get('layout_match')}")
+            success = False
+
+        # Layout tersimpan dengan header rows berbeda ditolak walau fingerprint cocok
+        table_df = pd.read_excel(table_file, header=None)
+        raw_layout = registry.get(raw_sheet['layout_fingerprint'])
+        table_layout = registry.get(table_sheet['layout_fingerprint'])
+        shifted_layout = dict(table_layout, header_rows=[{'row_index': 0, 'score': 1.0}])
+        from_raw = processor._analysis_from_layout(table_df, 'Sheet1', 'x', raw_layout, len(table_df))
+        from_shifted = processor._analysis_from_layout(table_df, 'Sheet1', 'x', shifted_layout, len(table_df))
+        from_table = processor._analysis_from_layout(table_df, 'Sheet1', 'x', table_layout, len(table_df))
+        if (from_raw is None and from_shifted is None and from_table is not None
+                and from_table['header_rows'] == full_table_sheet['header_rows']):
+            print("  ✅ PASS: Header rows dicek ulang untuk layout raw dan table")
+        else:
+            print(f"  ❌ FAIL: raw={from_raw is None}, shifted={from_shifted is None}, table={from_table is not None}")
+            success = False
+
+        # Test 5: layout yang di-forget tidak kembali setelah save (merge dengan file) dan reload
+        print("\n📊 Test 5: forget → save → reload")
+        forget_path = os.path.join(tmp_dir, 'layout_registry_forget.json')
+        analysis = {'format': 'raw', 'total_columns': 5, 'detected_fields': {}, 'header_rows': []}
+        registry = LayoutRegistry(forget_path)
+        registry.learn('lama', analysis)
+        registry.learn('tetap', analysis)
+        registry.save()
+        other_process = LayoutRegistry(forget_path)
+        registry.forget('lama')
+        registry.learn('baru', analysis)
+        registry.save()
+        # Registry lain yang masih memuat 'lama' di memori tidak memulihkannya saat menyimpan
+        other_process.learn('lain', analysis)
+        other_process.save()
+        reloaded = LayoutRegistry(forget_path)
+        if ('lama' not in registry and 'lama' not in reloaded and 'lama' not in other_process
+                and all(name in reloaded for name in ['tetap', 'baru', 'lain'])):
+            print(f"  ✅ PASS: {sorted(reloaded._layouts)} tersimpan, 'lama' tetap terhapus")
+        else:
+            print(f"  ❌ FAIL: {sorted(reloaded._layouts)}")
+            success = False
+        registry.learn('lama', analysis)
+        registry.save()
+        if 'lama' in LayoutRegistry(forget_path):
+            print("  ✅ PASS: Layout yang dipelajari ulang setelah forget tersimpan lagi")
+        else:
+            print("  ❌ FAIL: Layout yang dipelajari ulang tidak tersimpan")
+            success = False
+
+        # Test 6: cache hit saja tidak menulis ulang file; hit count ditulis per HIT_FLUSH_COUNT hit
+        print("\n📊 Test 6: Hit count ditulis per batch")
+        hits_path = os.path.join(tmp_dir, 'layout_registry_hits.json')
+        registry = LayoutRegistry(hits_path)
+        registry.learn('template', analysis)
+        registry.save()
+        saved_content = open(hits_path, encoding='utf-8').read()
+        for _ in range(LayoutRegistry.HIT_FLUSH_COUNT - 1):
+            registry.get('template')
+            registry.save()
+        unchanged = open(hits_path, encoding='utf-8').read() == saved_content
+        registry.get('template')
+        registry.save()
+        flushed_hits = LayoutRegistry(hits_path)._layouts['template']['hits']
+        if unchanged and flushed_hits == LayoutRegistry.HIT_FLUSH_COUNT:
+            print(f"  ✅ PASS: File tidak ditulis ulang per hit, {flushed_hits} hit ditulis sekaligus")
+        else:
+            print(f"  ❌ FAIL: unchanged={unchanged}, hits={flushed_hits}")
+            success = False
+
+    if success:
+        print("\n✅ Layout registry test completed successfully!")
+    else:
+        print("\n❌ Layout registry test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_layout_registry()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi parser angka/currency format Indonesia (numeric_parser)
+"""
+
+import sys
+import numpy as np
+from excel_processor import ExcelProcessor
+from numeric_parser import amount_text, parse_numbers
+
+def test_numeric_parser():
+    """Test parse seluruh kolom ke array float64"""
+
+    print("🧪 Testing Numeric Parser...")
+    success = True
+
+    # Test 1: format currency dan angka
+    print("\n📊 Test 1: Format currency dan angka")
+    cases = [
+        ('Rp 1.250.000,50', 1250000.5),
+        ('130.000,-', 130000.0),
+        ('Rp 75,000', 75000.0),
+        ('2,304,000', 2304000.0),
+        ('1,250,000.50', 1250000.5),
+        ('2,5', 2.5),
+        ('0.125', 0.125),
+        ('-75.000', -75000.0),
+        ('(75.000)', -75000.0),
+        ('Rp -5.000', -5000.0),
+        ('2 pcs', 2.0),
+        (3, 3.0),
+        (2.5, 2.5)
+    ]
+    parsed = parse_numbers([value for value, _ in cases])
+    for (value, expected), result in zip(cases, parsed):
+        if result == expected:
+            print(f"  ✅ PASS: {value!r} → {result}")
+        else:
+            print(f"  ❌ FAIL: {value!r} → {result}, expected {expected}")
+            success = False
+
+    # Test 2: nilai kosong dan tanpa angka menjadi NaN
+    print("\n📊 Test 2: Nilai kosong")
+    blanks = parse_numbers(['', '  ', None, np.nan, 'abc', True])
+    if np.isnan(blanks).all():
+        print("  ✅ PASS: Semua NaN")
+    else:
+        print(f"  ❌ FAIL: {blanks}")
+        success = False
+
+    # Test 3: _clean_value mempertahankan desimal currency, total billed memakai parser yang sama
+    print("\n📊 Test 3: Clean value dan total billed")
+    processor = ExcelProcessor()
+    cleaned = processor._clean_value('Rp 1.250.000,50')
+    total = processor._calculate_total_billed({'nilai': cleaned, 'jumlah': '2'})
+    if amount_text('Rp. 75,000') == '75,000' and cleaned == '1.250.000,50' and total == '2,500,001':
+        print(f"  ✅ PASS: {cleaned} x 2 = {total}")
+    else:
+        print(f"  ❌ FAIL: {cleaned} x 2 = {total}")
+        success = False
+
+    if success:
+        print("\n✅ Numeric parser test completed successfully!")
+    else:
+        print("\n❌ Numeric parser test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_numeric_parser()
+    sys.exit(0 if success else 1)
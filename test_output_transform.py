@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi transform per kolom (output_plan) ke format output
+"""
+
+import sys
+from datetime import datetime
+from excel_processor import ExcelProcessor
+
+def test_output_transform():
+    """Test aturan pengisian kolom output dari record hasil ekstraksi"""
+
+    print("🧪 Testing Output Transform...")
+    success = True
+    processor = ExcelProcessor()
+    today = datetime.now().strftime('%m/%d/%Y')
+
+    records = [
+        {'nama_pasien': 'Ujang', 'nomor_tagihan': 'IP-1', 'jenis_biaya': 'Biaya Obat', 'keterangan': 'Nifedipin',
+         'jumlah': '2', 'nilai': '1.000', 'sub_total': '', 'tanggal': '08/25/2025'},
+        {'nama_pasien': '', 'jenis_biaya': 'Biaya Obat', 'keterangan': '', 'jumlah': '1', 'nilai': '',
+         'sub_total': '75.000'},
+        {'keterangan': 'Lain-lain'}
+    ]
+    output_df = processor._transform_to_output_format(records, {})
+
+    checks = [
+        ('Kolom output lengkap', list(output_df.columns) == processor.output_columns),
+        ('CLIENT NAME di-forward fill', output_df['CLIENT NAME'].tolist() == ['Ujang', 'Ujang', 'Ujang']),
+        ('TARIFF apa adanya selama field ada', output_df['TARIFF'].tolist() == ['1.000', '', '']),
+        ('TOTAL BILLED: sub_total, lalu tarif x quantity', output_df['TOTAL BILLED'].tolist() == [2000.0, '75.000', '']),
+        ('TOTAL BILLED diformat saat ditulis',
+         processor._format_output_values(output_df)['TOTAL BILLED'].tolist() == ['2,000', '75.000', '']),
+        ('SERVICECODE DESCRIPTION: keterangan, lalu klasifikasi',
+         output_df['SERVICECODE DESCRIPTION'].tolist() == ['Nifedipin', 'Obat', 'Lain-lain']),
+        ('GIVEN DATE default tanggal hari ini', output_df['GIVEN DATE (month, day, year)'].tolist() == ['08/25/2025', today, today]),
+        ('LoS default', output_df['LoS'].tolist() == ['0', '0', '0'])
+    ]
+    for label, passed in checks:
+        if passed:
+            print(f"  ✅ PASS: {label}")
+        else:
+            print(f"  ❌ FAIL: {label}")
+            success = False
+
+    if len(processor._transform_to_output_format([], {})) == 0:
+        print("  ✅ PASS: Tanpa record")
+    else:
+        print("  ❌ FAIL: Tanpa record")
+        success = False
+
+    if success:
+        print("\n✅ Output transform test completed successfully!")
+    else:
+        print("\n❌ Output transform test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_output_transform()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi analisis dan ekstraksi paralel per sheet
+"""
+
+import os
+import sys
+import json
+import tempfile
+import pandas as pd
+from config import Config
+from excel_processor import ExcelProcessor
+
+def _create_multi_sheet_file(directory):
+    """Buat file Excel dengan beberapa sheet (key-value dan tabel)"""
+    filepath = os.path.join(directory, 'multi_sheet.xlsx')
+    with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        for sheet_idx in range(3):
+            rows = [
+                ['Nomor Tagihan', f' : IP-0003017{sheet_idx}'],
+                ['Nama Pasien', f' : Pasien {sheet_idx}'],
+                ['JENIS BIAYA', 'KETERANGAN', 'WAKTU', 'TANGGAL', 'JUMLAH', 'NILAI', None, 'SUB TOTAL']
+            ]
+            for i in range(10):
+                rows.append(['Biaya Obat', f'Obat {i}', '08:00', '25/08/2025', i + 1, '130.000,-', None, 130000 * (i + 1)])
+            pd.DataFrame(rows).to_excel(writer, sheet_name=f'Tagihan {sheet_idx}', index=False, header=False)
+
+        table_rows = [['Nama Pasien', 'Keterangan', 'Jumlah', 'Nilai']]
+        table_rows += [[f'Pasien {i}', 'Spuit 3cc', i, f'Rp {i * 1000:,}'] for i in range(1, 8)]
+        pd.DataFrame(table_rows).to_excel(writer, sheet_name='Tabel', index=False, header=False)
+    return filepath
+
+def test_parallel_processing():
+    """Test bahwa hasil paralel identik dengan hasil serial"""
+
+    print("🧪 Testing Parallel Sheet Processing...")
+    success = True
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = _create_multi_sheet_file(tmp_dir)
+        processor = ExcelProcessor()
+
+        # Test 1: analisis paralel
+        print("\n📊 Test 1: preview_excel serial vs paralel")
+        serial_preview = processor.preview_excel(filepath, {'analysis_workers': 1})
+        parallel_preview = processor.preview_excel(filepath, {'analysis_workers': 2})
+        if json.dumps(serial_preview, sort_keys=True, default=str) == json.dumps(parallel_preview, sort_keys=True, default=str):
+            print(f"  ✅ PASS: Analisis {len(serial_preview['sheets'])} sheet identik")
+        else:
+            print("  ❌ FAIL: Analisis paralel berbeda dengan serial")
+            success = False
+
+        # Test 2: ekstraksi paralel (urutan baris harus sama)
+        print("\n📊 Test 2: process_excel serial vs paralel")
+        outputs = {}
+        for workers in [1, 2]:
+            output_filepath = processor.process_excel(filepath, {'extraction_workers': workers})
+            outputs[workers] = pd.read_excel(output_filepath, dtype=str)
+            os.remove(output_filepath)
+
+        if outputs[1].equals(outputs[2]):
+            print(f"  ✅ PASS: Output identik ({len(outputs[1])} baris)")
+        else:
+            print("  ❌ FAIL: Output ekstraksi paralel berbeda dengan serial")
+            success = False
+
+        # Test 3: jumlah worker dari options request dikonversi dan dibatasi config
+        print("\n📊 Test 3: Option worker dari request")
+        worker_cases = [
+            ({'extraction_workers': '2'}, 2),
+            ({'extraction_workers': 'banyak'}, Config.EXTRACTION_WORKERS),
+            ({'extraction_workers': None}, 1),
+            ({'extraction_workers': 10 ** 6}, min(Config.MAX_SHEET_WORKERS, 4)),
+            ({}, Config.EXTRACTION_WORKERS)
+        ]
+        for options, expected in worker_cases:
+            result = processor._resolve_workers(options, 'extraction_workers', Config.EXTRACTION_WORKERS, 4)
+            if result == expected:
+                print(f"  ✅ PASS: {options} → {result}")
+            else:
+                print(f"  ❌ FAIL: {options} → {result}, expected {expected}")
+                success = False
+        try:
+            processor.preview_excel(filepath, {'analysis_workers': '2'})
+            print("  ✅ PASS: analysis_workers berupa string tidak error")
+        except Exception as e:
+            print(f"  ❌ FAIL: {e}")
+            success = False
+
+    if success:
+        print("\n✅ Parallel processing test completed successfully!")
+    else:
+        print("\n❌ Parallel processing test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_parallel_processing()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi ParsedWorkbook: header dari data yang sudah di-parse sama dengan read_excel(header=...)
+"""
+
+import os
+import sys
+import tempfile
+from datetime import datetime
+import pandas as pd
+from parsed_workbook import ParsedWorkbook
+
+def _create_workbook_file(directory):
+    """Buat file dengan sheet tabel biasa, sheet berjudul (header di tengah) dan sheet campuran"""
+    filepath = os.path.join(directory, 'parsed_workbook_test.xlsx')
+    table = pd.DataFrame({
+        'Jenis Biaya': ['Biaya Obat', 'Biaya Alkes', None, 'Biaya Kamar'],
+        'Keterangan': ['Nifedipin 10 mg', 'Spuit 3cc', 'Kasa', None],
+        'Jumlah': [2, 1, 3, 1],
+        'Nilai': ['Rp 1.000', 'Rp 75,000', '886', 'Rp 700,000'],
+        'Sub Total': [2000.0, 75000.5, None, 700000.0]
+    })
+    titled = [
+        ['RS Sehat', None, None, None],
+        ['Periode 2025', None, 8, None],
+        [None, None, None, None],
+        ['Tanggal', 'Keterangan', 'Jumlah', 'Nilai'],
+        [datetime(2025, 8, 25), 'Nifedipin', 2, '384.000,-'],
+        [datetime(2025, 8, 26, 10, 30), '', 1, 130000],
+        [None, 'Subtotal', None, 514000]
+    ]
+    mixed = [
+        ['Kode', 'Nama', 'Nilai'],
+        ['001', 'Ujang', 1.5],
+        [2, True, 'abc'],
+        [None, None, None],
+        ['0003', 'Sunarja', -4]
+    ]
+    with pd.ExcelWriter(filepath, engine='openpyxl') as writer:
+        table.to_excel(writer, sheet_name='Tabel', index=False)
+        pd.DataFrame(titled).to_excel(writer, sheet_name='Berjudul', index=False, header=False)
+        pd.DataFrame(mixed).to_excel(writer, sheet_name='Campuran', index=False, header=False)
+    return filepath
+
+def test_parsed_workbook():
+    """Test get_sheet_with_header identik dengan pd.read_excel(header=header_idx) per sheet"""
+
+    print("🧪 Testing ParsedWorkbook...")
+    success = True
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        filepath = _create_workbook_file(tmp_dir)
+        workbook = ParsedWorkbook(filepath)
+
+        # Test 1: header dibaca ulang dari data yang sudah di-parse
+        print("\n📊 Test 1: get_sheet_with_header vs read_excel(header=...)")
+        cases = [('Tabel', 0), ('Tabel', 2), ('Berjudul', 3), ('Berjudul', 0), ('Campuran', 0), ('Campuran', 1)]
+        for sheet_name, header_idx in cases:
+            expected = pd.read_excel(filepath, sheet_name=sheet_name, header=header_idx)
+            result = workbook.get_sheet_with_header(sheet_name, header_idx)
+            try:
+                pd.testing.assert_frame_equal(result, expected)
+                print(f"  ✅ PASS: {sheet_name} header={header_idx} {result.shape}")
+            except AssertionError as e:
+                print(f"  ❌ FAIL: {sheet_name} header={header_idx}: {e}")
+                success = False
+
+        # Test 2: sheet mentah sama dengan read_excel(header=None), mode lazy membaca sheet yang sama
+        print("\n📊 Test 2: Sheet mentah (eager dan lazy)")
+        lazy_workbook = ParsedWorkbook(filepath, lazy=True)
+        for sheet_name in workbook.sheet_names:
+            expected = pd.read_excel(filepath, sheet_name=sheet_name, header=None)
+            try:
+                pd.testing.assert_frame_equal(workbook.get_sheet(sheet_name), expected)
+                pd.testing.assert_frame_equal(lazy_workbook.get_sheet(sheet_name), expected)
+                print(f"  ✅ PASS: {sheet_name} {expected.shape}")
+            except AssertionError as e:
+                print(f"  ❌ FAIL: {sheet_name}: {e}")
+                success = False
+
+    if success:
+        print("\n✅ ParsedWorkbook test completed successfully!")
+    else:
+        print("\n❌ ParsedWorkbook test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_parsed_workbook()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi preview ringkas saat upload dan endpoint /preview/rows
+"""
+
+import io
+import json
+import os
+import sys
+import tempfile
+import pandas as pd
+import excel_processor
+from excel_processor import ExcelProcessor
+
+def _create_table_file(filepath, n_rows):
+    """Buat file tabel sederhana dengan n_rows baris data"""
+    df = pd.DataFrame({
+        'Jenis Biaya': [f'Biaya Obat {i}' for i in range(n_rows)],
+        'Keterangan': [f'Item {i}' for i in range(n_rows)],
+        'Jumlah': [i % 5 + 1 for i in range(n_rows)],
+        'Nilai': [f'Rp {(i + 1) * 1000:,}' for i in range(n_rows)]
+    })
+    df.to_excel(filepath, index=False, sheet_name='Tagihan')
+
+def test_preview_rows():
+    """Test ringkasan upload tanpa isi baris dan halaman baris per offset/limit"""
+
+    print("🧪 Testing Preview Rows...")
+    success = True
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        input_file = os.path.join(tmp_dir, 'tagihan.xlsx')
+        _create_table_file(input_file, 120)
+        processor = ExcelProcessor()
+
+        # Test 1: ringkasan tidak berisi isi baris
+        print("\n📊 Test 1: Ringkasan preview tanpa isi baris")
+        analysis = processor.preview_excel(input_file)
+        summary = processor.summarize_preview(analysis)
+        sheet_summary = summary['sheets']['Tagihan']
+        has_contents = 'data_rows' in sheet_summary or any('content' in row for row in sheet_summary['header_rows'])
+        if not has_contents and sheet_summary['data_row_count'] == len(analysis['sheets']['Tagihan']['data_rows']):
+            print(f"  ✅ PASS: {sheet_summary['data_row_count']} data rows diringkas, "
+                  f"{len(json.dumps(summary))} vs {len(json.dumps(analysis))} bytes JSON")
+        else:
+            print("  ❌ FAIL: Ringkasan masih berisi isi baris")
+            success = False
+        if 'data_rows' in analysis['sheets']['Tagihan']:
+            print("  ✅ PASS: Analisis asli tidak diubah")
+        else:
+            print("  ❌ FAIL: Analisis asli ikut diubah")
+            success = False
+
+        # Test 2: halaman baris (workbook biasa dan streaming memberi hasil sama)
+        print("\n📊 Test 2: Halaman baris offset=100 limit=50")
+        page = processor.preview_rows(input_file, 'Tagihan', offset=100, limit=50)
+        row_indices = [row['row_index'] for row in page['rows']]
+        if row_indices == list(range(100, 121)) and not page['has_more'] and page['total_rows'] == 121:
+            print(f"  ✅ PASS: {len(page['rows'])} baris, baris pertama {page['rows'][0]['values']}")
+        else:
+            print(f"  ❌ FAIL: rows {row_indices[:3]}..., has_more={page['has_more']}, total={page['total_rows']}")
+            success = False
+
+        streaming_processor = ExcelProcessor()
+        streaming_processor.should_stream = lambda source, options=None: True
+        streaming_page = streaming_processor.preview_rows(input_file, 'Tagihan', offset=100, limit=50)
+        if streaming_page['rows'] == page['rows'] and not streaming_page['has_more']:
+            print("  ✅ PASS: Reader streaming memberi halaman yang sama")
+        else:
+            print("  ❌ FAIL: Halaman streaming berbeda")
+            success = False
+
+        # Test 3: endpoint Flask
+        print("\n📊 Test 3: Endpoint /upload dan /preview/rows")
+        import app as app_module
+        app_module.layout_registry = None
+        client = app_module.app.test_client()
+        with open(input_file, 'rb') as f:
+            response = client.post('/upload', data={'file': (io.BytesIO(f.read()), 'tagihan.xlsx')},
+                                   content_type='multipart/form-data')
+        upload_sheet = response.get_json()['preview']['sheets']['Tagihan']
+
+        # Hash isi file dari upload dipakai ulang: halaman baris tidak membaca ulang file untuk hashing
+        hash_calls = []
+        original_hash = excel_processor.compute_file_hash
+        excel_processor.compute_file_hash = lambda filepath: hash_calls.append(filepath) or original_hash(filepath)
+        try:
+            response = client.get('/preview/rows?sheet=Tagihan&offset=0&limit=10')
+            client.get('/preview/rows?sheet=Tagihan&offset=10&limit=10')
+        finally:
+            excel_processor.compute_file_hash = original_hash
+        rows_page = response.get_json()
+        missing_sheet = client.get('/preview/rows?sheet=Tidak+Ada')
+        invalid_limit = client.get('/preview/rows?sheet=Tagihan&limit=abc')
+        client.post('/cleanup')
+        if ('data_rows' not in upload_sheet and response.status_code == 200 and len(rows_page['rows']) == 10
+                and rows_page['has_more'] and missing_sheet.status_code == 404 and invalid_limit.status_code == 400):
+            print(f"  ✅ PASS: Upload ringkas, halaman pertama {rows_page['rows'][0]['values']}")
+        else:
+            print(f"  ❌ FAIL: status {response.status_code}, {missing_sheet.status_code}, {invalid_limit.status_code}")
+            success = False
+        if not hash_calls:
+            print("  ✅ PASS: Hash dari upload dipakai ulang oleh /preview/rows")
+        else:
+            print(f"  ❌ FAIL: File di-hash ulang {len(hash_calls)}x")
+            success = False
+
+    if success:
+        print("\n✅ Preview rows test completed successfully!")
+    else:
+        print("\n❌ Preview rows test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_preview_rows()
+    sys.exit(0 if success else 1)
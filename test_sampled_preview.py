@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi preview sampled (head + sampel, flag estimated) dan pembacaan terbatas saat upload
+"""
+
+import os
+import sys
+import tempfile
+import pandas as pd
+from config import Config
+from excel_processor import ExcelProcessor
+from workbook_cache import WorkbookCache, compute_file_hash
+
+def _create_table_file(filepath, n_rows):
+    """Buat file tabel dengan n_rows baris data"""
+    df = pd.DataFrame({
+        'Jenis Biaya': [f'Biaya Obat {i}' for i in range(n_rows)],
+        'Keterangan': [f'Item {i}' for i in range(n_rows)],
+        'Jumlah': [i % 5 + 1 for i in range(n_rows)],
+        'Nilai': [f'Rp {(i + 1) * 1000:,}' for i in range(n_rows)]
+    })
+    df.to_excel(filepath, index=False, sheet_name='Tagihan')
+
+def test_sampled_preview():
+    """Test head + sampel acak, flag estimated, dan workbook terbatas dari load_preview_workbook"""
+
+    print("🧪 Testing Sampled Preview...")
+    success = True
+    window_rows = Config.PREVIEW_HEAD_ROWS + Config.PREVIEW_SAMPLE_ROWS
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        large_file = os.path.join(tmp_dir, 'besar.xlsx')
+        small_file = os.path.join(tmp_dir, 'kecil.xlsx')
+        _create_table_file(large_file, 2000)
+        _create_table_file(small_file, 100)
+        processor = ExcelProcessor()
+
+        # Test 1: head window + sampel acak dengan index asli, sama setiap kali
+        print("\n📊 Test 1: _sample_sheet_rows")
+        df = pd.read_excel(large_file, header=None)
+        sample = processor._sample_sheet_rows(df)
+        head_kept = list(sample.index[:Config.PREVIEW_HEAD_ROWS]) == list(range(Config.PREVIEW_HEAD_ROWS))
+        rest = sample.index[Config.PREVIEW_HEAD_ROWS:]
+        if (len(sample) == window_rows and head_kept and rest.is_monotonic_increasing and rest.min() >= Config.PREVIEW_HEAD_ROWS
+                and list(processor._sample_sheet_rows(df).index) == list(sample.index)):
+            print(f"  ✅ PASS: {len(sample)} dari {len(df)} baris, sampel {list(rest[:3])}...")
+        else:
+            print(f"  ❌ FAIL: {len(sample)} baris, index {list(sample.index[:3])}...")
+            success = False
+        if len(processor._sample_sheet_rows(df.iloc[:window_rows])) == window_rows:
+            print("  ✅ PASS: Sheet kecil tidak disampel")
+        else:
+            print("  ❌ FAIL: Sheet kecil ikut disampel")
+            success = False
+
+        # Test 2: flag estimated per sheet dan gabungan
+        print("\n📊 Test 2: Flag estimated")
+        sampled = processor.preview_excel(large_file, {'preview_mode': 'sampled'})
+        sheet = sampled['sheets']['Tagihan']
+        small_sampled = processor.preview_excel(small_file, {'preview_mode': 'sampled'})
+        full = processor.preview_excel(large_file)
+        checks = [
+            ('Sheet besar ditandai estimasi', sheet['estimated'] and sampled['estimated']),
+            ('Baris yang dianalisis dan total baris', sheet['analyzed_rows'] == window_rows and sheet['total_rows'] == 2001),
+            ('Format dan field tetap terdeteksi', sheet['format'] == full['sheets']['Tagihan']['format']
+             and sheet['detected_fields'] == full['sheets']['Tagihan']['detected_fields']),
+            ('Sheet kecil bukan estimasi', not small_sampled['estimated'] and not small_sampled['sheets']['Tagihan']['estimated']),
+            ('Mode full tanpa flag estimated', 'estimated' not in full and 'estimated' not in full['sheets']['Tagihan'])
+        ]
+        for label, passed in checks:
+            if passed:
+                print(f"  ✅ PASS: {label}")
+            else:
+                print(f"  ❌ FAIL: {label}")
+                success = False
+
+        # Test 3: upload hanya membaca baris awal sheet panjang; file kecil di-parse penuh dan masuk cache
+        print("\n📊 Test 3: load_preview_workbook")
+        cache = WorkbookCache()
+        cached_processor = ExcelProcessor(cache=cache)
+        bounded = cached_processor.load_preview_workbook(large_file)
+        bounded_preview = cached_processor.preview_excel(bounded, {'preview_mode': 'sampled'})
+        bounded_sheet = bounded_preview['sheets']['Tagihan']
+        if (len(bounded.get_sheet('Tagihan')) == window_rows and bounded.row_counts == {'Tagihan': 2001}
+                and bounded_sheet['estimated'] and bounded_sheet['total_rows'] == 2001 and len(cache) == 0):
+            print(f"  ✅ PASS: {window_rows} baris awal dibaca, total {bounded_sheet['total_rows']} dari dimensi sheet")
+        else:
+            print(f"  ❌ FAIL: {len(bounded.get_sheet('Tagihan'))} baris, row_counts {bounded.row_counts}, cache {len(cache)}")
+            success = False
+        if bounded_sheet['detected_fields'] == sheet['detected_fields'] and bounded_sheet['format'] == sheet['format']:
+            print("  ✅ PASS: Analisis dari baris awal sama dengan sampel acak untuk tabel seragam")
+        else:
+            print(f"  ❌ FAIL: {bounded_sheet['detected_fields']} vs {sheet['detected_fields']}")
+            success = False
+
+        small = cached_processor.load_preview_workbook(small_file)
+        if len(small.get_sheet('Tagihan')) == 101 and not small.row_counts and cache.get(compute_file_hash(small_file)) is not None:
+            print("  ✅ PASS: File kecil di-parse penuh dan masuk cache")
+        else:
+            print("  ❌ FAIL: File kecil tidak di-parse penuh")
+            success = False
+
+        # Workbook yang sudah di-cache dipakai untuk sampel acak dari seluruh sheet
+        cached_processor.load_workbook(large_file)
+        if len(cached_processor.load_preview_workbook(large_file).get_sheet('Tagihan')) == 2001:
+            print("  ✅ PASS: Workbook dari cache dipakai penuh")
+        else:
+            print("  ❌ FAIL: Workbook dari cache tidak dipakai")
+            success = False
+
+    if success:
+        print("\n✅ Sampled preview test completed successfully!")
+    else:
+        print("\n❌ Sampled preview test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_sampled_preview()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi klasifikasi service code dari file aturan eksternal
+"""
+
+import json
+import os
+import sys
+import tempfile
+from config import Config
+from excel_processor import ExcelProcessor
+from service_rules import load_service_matcher, read_service_rules
+
+def test_service_rules():
+    """Test file aturan JSON/CSV, kategori tambahan dan cache per versi file"""
+
+    print("🧪 Testing Service Rules...")
+    success = True
+    temp_dir = tempfile.mkdtemp()
+    json_path = os.path.join(temp_dir, 'formularium.json')
+    csv_path = os.path.join(temp_dir, 'formularium.csv')
+
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({
+            'Alkes': ['Kateter', 'spuit'],
+            'Obat': ['paracetamol', 'amoxicillin'],
+            'Laboratorium': ['hematologi', 'darah lengkap']
+        }, f)
+    with open(csv_path, 'w', encoding='utf-8') as f:
+        f.write('label,keyword\nRadiologi,rontgen\nObat,ceftriaxone\n')
+
+    # Test 1: baca aturan (keyword di-lower-case, urutan = prioritas)
+    print("\n📊 Test 1: Baca file aturan")
+    json_rules = read_service_rules(json_path)
+    csv_rules = read_service_rules(csv_path)
+    if json_rules[0] == ('Alkes', 'kateter') and len(json_rules) == 6 and csv_rules == [('Radiologi', 'rontgen'), ('Obat', 'ceftriaxone')]:
+        print(f"  ✅ PASS: JSON {len(json_rules)} dan CSV {len(csv_rules)} keyword")
+    else:
+        print(f"  ❌ FAIL: {json_rules} / {csv_rules}")
+        success = False
+
+    # Test 2: matcher di-cache per versi file, dikompilasi ulang saat file berubah
+    print("\n📊 Test 2: Cache per versi file")
+    first = load_service_matcher(json_path)
+    cached = load_service_matcher(json_path) is first
+    with open(json_path, 'w', encoding='utf-8') as f:
+        json.dump({'Alkes': ['kateter'], 'Obat': ['paracetamol'], 'Laboratorium': ['hematologi', 'urine lengkap']}, f)
+    os.utime(json_path, ns=(os.stat(json_path).st_atime_ns, os.stat(json_path).st_mtime_ns + 10 ** 9))
+    reloaded = load_service_matcher(json_path) is not first
+    if cached and reloaded:
+        print("  ✅ PASS: Dipakai ulang lalu dikompilasi ulang setelah file berubah")
+    else:
+        print(f"  ❌ FAIL: cached={cached}, reloaded={reloaded}")
+        success = False
+
+    # Test 3: ExcelProcessor memakai Config.SERVICE_RULES_FILE
+    print("\n📊 Test 3: Klasifikasi dengan kategori tambahan")
+    original_rules_file = Config.SERVICE_RULES_FILE
+    try:
+        Config.SERVICE_RULES_FILE = json_path
+        processor = ExcelProcessor()
+        data_rows = [
+            {'jenis_biaya': 'Biaya Laboratorium', 'keterangan': 'Urine Lengkap'},
+            {'jenis_biaya': 'Biaya Obat', 'keterangan': 'Paracetamol 500 mg'},
+            {'jenis_biaya': 'Biaya Kamar', 'keterangan': 'Kelas 1'}
+        ]
+        result = processor._classify_service_codes(data_rows)
+        if result == ['Laboratorium', 'Obat', '']:
+            print(f"  ✅ PASS: {result}")
+        else:
+            print(f"  ❌ FAIL: {result}")
+            success = False
+
+        # File yang tidak ada: kembali ke fallback minimal bawaan
+        Config.SERVICE_RULES_FILE = os.path.join(temp_dir, 'tidak_ada.json')
+        result = processor._classify_service_codes([
+            {'jenis_biaya': 'Biaya Obat', 'keterangan': ''},
+            {'jenis_biaya': 'Lain-lain', 'keterangan': 'Spuit 3cc'}
+        ])
+        if result == ['Obat', '']:
+            print("  ✅ PASS: Fallback minimal bawaan")
+        else:
+            print(f"  ❌ FAIL: {result}")
+            success = False
+
+        # Config default: file aturan yang ikut di repo dibaca, bukan keyword di kode
+        Config.SERVICE_RULES_FILE = original_rules_file
+        default_rules = read_service_rules(original_rules_file)
+        result = processor._classify_service_codes([
+            {'jenis_biaya': 'Lain-lain', 'keterangan': 'Spuit 3cc'},
+            {'jenis_biaya': 'Biaya Obat', 'keterangan': 'Nifedipin 10 mg'}
+        ])
+        if (os.path.basename(original_rules_file) == 'service_rules.json' and result == ['Alkes', 'Obat']
+                and load_service_matcher(original_rules_file) is processor._service_code_matcher()
+                and {label for label, _ in default_rules} == {'Alkes', 'Obat'}):
+            print(f"  ✅ PASS: Default {os.path.basename(original_rules_file)} ({len(default_rules)} keyword) → {result}")
+        else:
+            print(f"  ❌ FAIL: {original_rules_file} → {result}")
+            success = False
+    finally:
+        Config.SERVICE_RULES_FILE = original_rules_file
+
+    if success:
+        print("\n✅ Service rules test completed successfully!")
+    else:
+        print("\n❌ Service rules test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_service_rules()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""
+Test script untuk verifikasi WorkbookCache (hash isi file, LRU, TTL)
+"""
+
+import os
+import sys
+import time
+import tempfile
+import pandas as pd
+import excel_processor
+from excel_processor import ExcelProcessor
+from workbook_cache import WorkbookCache, compute_file_hash
+
+def _create_test_file(directory, name, rows):
+    """Buat file Excel kecil untuk testing"""
+    filepath = os.path.join(directory, name)
+    pd.DataFrame(rows).to_excel(filepath, index=False, header=False)
+    return filepath
+
+def test_workbook_cache():
+    """Test bahwa preview kedua untuk isi file yang sama diambil dari cache"""
+
+    print("🧪 Testing WorkbookCache...")
+    success = True
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        rows = [
+            ['Nama Pasien', 'Jumlah', 'Nilai'],
+            ['Ujang Sunarja', 1, 'Rp 700,000'],
+            ['Ujang Sunarja', 2, 'Rp 130,000']
+        ]
+        first_file = _create_test_file(tmp_dir, 'first.xlsx', rows)
+        # Upload ulang file yang sama dengan nama lain
+        second_file = os.path.join(tmp_dir, 'second.xlsx')
+        with open(first_file, 'rb') as src, open(second_file, 'wb') as dst:
+            dst.write(src.read())
+
+        cache = WorkbookCache(max_entries=2, ttl_seconds=60)
+        processor = ExcelProcessor(cache=cache)
+
+        # Test 1: analisis dipakai ulang untuk konten yang sama
+        print("\n📊 Test 1: Analisis dipakai ulang berdasarkan hash isi file")
+        first_preview = processor.preview_excel(first_file)
+        second_preview = processor.preview_excel(second_file)
+        if first_preview is second_preview and len(cache) == 1:
+            print("  ✅ PASS: Analisis kedua diambil dari cache")
+        else:
+            print("  ❌ FAIL: Analisis dihitung ulang untuk file yang sama")
+            success = False
+
+        workbook = processor.load_workbook(second_file)
+        if workbook.filepath == second_file and workbook.content_hash == compute_file_hash(first_file):
+            print("  ✅ PASS: Workbook dari cache memakai path file yang baru")
+        else:
+            print("  ❌ FAIL: Path atau hash workbook dari cache salah")
+            success = False
+
+        # Test 2: LRU eviction
+        print("\n📊 Test 2: LRU eviction")
+        other_files = [
+            _create_test_file(tmp_dir, f'other_{i}.xlsx', rows + [[f'Pasien {i}', i, 'Rp 1,000']])
+            for i in range(2)
+        ]
+        for filepath in other_files:
+            processor.load_workbook(filepath)
+        if len(cache) == 2 and cache.get(compute_file_hash(first_file)) is None:
+            print("  ✅ PASS: Entry paling lama dibuang")
+        else:
+            print(f"  ❌ FAIL: Cache berisi {len(cache)} entry")
+            success = False
+
+        # Test 3: TTL
+        print("\n📊 Test 3: TTL expiry")
+        cache.ttl_seconds = 0.01
+        time.sleep(0.05)
+        if cache.get(compute_file_hash(other_files[-1])) is None:
+            print("  ✅ PASS: Entry kedaluwarsa tidak dipakai")
+        else:
+            print("  ❌ FAIL: Entry kedaluwarsa masih dikembalikan")
+            success = False
+
+        # Test 4: process_excel dengan content_hash dari upload tidak menghitung ulang hash file
+        print("\n📊 Test 4: content_hash dari upload dipakai ulang oleh process_excel")
+        upload_cache = WorkbookCache()
+        upload_processor = ExcelProcessor(cache=upload_cache)
+        content_hash = compute_file_hash(first_file)
+        upload_processor.preview_excel(upload_processor.load_preview_workbook(first_file, content_hash))
+        hash_calls = []
+        original_hash = excel_processor.compute_file_hash
+        excel_processor.compute_file_hash = lambda filepath: hash_calls.append(filepath) or original_hash(filepath)
+        try:
+            output_filepath = upload_processor.process_excel(first_file, output_dir=tmp_dir, content_hash=content_hash)
+        finally:
+            excel_processor.compute_file_hash = original_hash
+        if not hash_calls and os.path.exists(output_filepath) and upload_cache.get(content_hash) is not None:
+            print("  ✅ PASS: Workbook dari cache tanpa hashing ulang")
+        else:
+            print(f"  ❌ FAIL: File di-hash ulang {len(hash_calls)}x")
+            success = False
+
+    if success:
+        print("\n✅ WorkbookCache test completed successfully!")
+    else:
+        print("\n❌ WorkbookCache test failed!")
+
+    return success
+
+if __name__ == "__main__":
+    success = test_workbook_cache()
+    sys.exit(0 if success else 1)
@@ -0,0 +1,106 @@
+"""
+Cache server-side untuk workbook yang sudah di-parse beserta hasil analisisnya
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+
+
+def compute_file_hash(filepath, chunk_size=1024 * 1024):
+    """Hitung SHA-256 dari isi file (dibaca per chunk)"""
+    digest = hashlib.sha256()
+    with open(filepath, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def estimate_sheets_size(sheets):
+    """Perkiraan pemakaian memori (bytes) dari dict {sheet_name: DataFrame}"""
+    total = 0
+    for df in sheets.values():
+        try:
+            total += int(df.memory_usage(index=True, deep=True).sum())
+        except Exception:
+            total += df.size * 64
+    return total
+
+
+class WorkbookCache:
+    """
+    Cache LRU dengan TTL dan batas memori, di-key dengan hash isi file upload.
+
+    Setiap entry menyimpan sheet yang sudah di-parse dan dict analisis gabungan
+    (hasil preview_excel, per mode preview), sehingga /process dan upload ulang file yang sama
+    tidak perlu parse dan analisis dari awal. Nilai yang dikembalikan dipakai
+    bersama, jadi perlakukan sebagai read-only.
+    """
+
+    def __init__(self, max_entries=32, ttl_seconds=1800, max_bytes=512 * 1024 * 1024):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self._total_bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        """Ambil entry (dict dengan 'sheets' dan 'analyses') atau None jika tidak ada/kedaluwarsa"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if self._is_expired(entry):
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put_sheets(self, key, sheets):
+        """Simpan sheet hasil parse untuk key tertentu"""
+        size = estimate_sheets_size(sheets)
+        if size > self.max_bytes:
+            print(f"⚠️ Workbook terlalu besar untuk cache ({size} bytes), dilewati")
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = {
+                'sheets': sheets,
+                'analyses': {},
+                'size': size,
+                'created_at': time.time()
+            }
+            self._total_bytes += size
+            self._evict()
+
+    def put_analysis(self, key, analysis, mode='full'):
+        """Simpan hasil analisis (mode 'full' atau 'sampled') untuk workbook yang sudah ada di cache"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry['analyses'][mode] = analysis
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._total_bytes = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _is_expired(self, entry):
+        return self.ttl_seconds is not None and time.time() - entry['created_at'] > self.ttl_seconds
+
+    def _remove(self, key):
+        entry = self._entries.pop(key)
+        self._total_bytes -= entry['size']
+
+    def _evict(self):
+        """Buang entry kedaluwarsa, lalu entry paling lama tidak dipakai sampai batas terpenuhi"""
+        for key in [k for k, entry in self._entries.items() if self._is_expired(entry)]:
+            self._remove(key)
+        while self._entries and (len(self._entries) > self.max_entries or self._total_bytes > self.max_bytes):
+            self._remove(next(iter(self._entries)))